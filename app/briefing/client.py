@@ -1,82 +1,82 @@
 import logging
-from typing import List, Optional, Tuple
-
-import requests
+from typing import List, Optional
 
 from app.briefing.exception import BriefingErrorCode, BriefingException
+from app.comment_store import CommentStore, StoredComment
+from app.enum import InvokeMode
 
 
 class BriefingClient:
-    def __init__(self, api_key: str, timeout: float = 20.0, max_comments: int = 200):
+    def __init__(
+        self,
+        comment_store: CommentStore,
+        max_comments: int = 200,
+        invoke_mode: str = InvokeMode.THREAD,
+    ):
         self.logger = logging.getLogger(__name__)
-        self.api_key = api_key
-        self.timeout = timeout
+        self.comment_store = comment_store
         self.max_comments = max(20, max_comments)
+        # thread: requests 세션 + asyncio.to_thread / async: httpx 네이티브 호출 (get_video_comments_async)
+        self.invoke_mode = InvokeMode(invoke_mode)
 
-    def __fetch_page(
-        self,
-        session: requests.Session,
-        video_id: str,
-        page_token: Optional[str],
-        remaining: int,
-    ) -> Tuple[List[dict], Optional[str]]:
+    def get_video_comments(self, video_id: str, limit: Optional[int] = None) -> List[StoredComment]:
         try:
-            base_url = "https://www.googleapis.com/youtube/v3/commentThreads"
-            
-            request_count = min(100, max(1, remaining))
+            max_limit = limit or self.max_comments
+            self.logger.info(f"'{video_id}' 영상의 댓글 수집을 시작합니다. (최대 {max_limit}개, 최신순)")
+
+            snapshot = self.comment_store.get(video_id, max_limit)
+            comments = snapshot.comments[:max_limit]
 
-            params = {
-                "part": "snippet",
-                "videoId": video_id,
-                "key": self.api_key,
-                "order": "time",  # 최신순
-                "maxResults": request_count,
-            }
-            if page_token:
-                params["pageToken"] = page_token
+            self.logger.info(f"수집 완료: 총 {len(comments)}개의 댓글을 가져왔습니다.")
+            return comments
 
-            resp = session.get(base_url, params=params, timeout=self.timeout)
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("items", []), data.get("nextPageToken")
         except Exception as e:
-            self.logger.exception(f"댓글 페이지 조회 중 오류가 발생했습니다: {e}")
-            raise
+            self.logger.error(f"댓글 조회 중 오류가 발생했습니다: {e}")
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
 
-    def get_video_comments(self, video_id: str) -> List[str]:
+    async def get_video_comments_async(self, video_id: str, limit: Optional[int] = None) -> List[StoredComment]:
         try:
-            comments: List[str] = []
-            token = None
-            max_limit = self.max_comments
-            
-            self.logger.info(f"'{video_id}' 영상의 댓글 수집을 시작합니다. (최대 {max_limit}개, 최신순)")
-
-            with requests.Session() as session:
-                while len(comments) < max_limit:
-                    remaining = max_limit - len(comments)
-                    items, token = self.__fetch_page(session, video_id, token, remaining)
-
-                    if not items:
-                        break
-
-                    for it in items:
-                        try:
-                            top = it["snippet"]["topLevelComment"]
-                            text = top["snippet"]["textDisplay"]
-                            comments.append(text)
-                        except KeyError:
-                            self.logger.warning(f"댓글 데이터 파싱 실패: {it}")
-                            continue
+            max_limit = limit or self.max_comments
+            self.logger.info(f"'{video_id}' 영상의 댓글 수집을 시작합니다. (최대 {max_limit}개, 최신순, async)")
 
-                        if len(comments) >= max_limit:
-                            break
+            snapshot = await self.comment_store.get_async(video_id, max_limit)
+            comments = snapshot.comments[:max_limit]
 
-                    if not token or len(comments) >= max_limit:
-                        break
-            
             self.logger.info(f"수집 완료: 총 {len(comments)}개의 댓글을 가져왔습니다.")
             return comments
 
         except Exception as e:
             self.logger.error(f"댓글 조회 중 오류가 발생했습니다: {e}")
             raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    def peek_video_comments(self, video_id: str, limit: Optional[int] = None) -> List[StoredComment]:
+        """수집이 중단된 경우에도 지금까지 저장소에 쌓인 댓글을 반환합니다."""
+        snapshot = self.comment_store.peek(video_id)
+        if snapshot is None:
+            return []
+        return snapshot.comments[:limit or self.max_comments]
+
+    def get_comments_since(
+        self,
+        video_id: str,
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> Optional[List[StoredComment]]:
+        """워터마크 이후의 새 댓글 (최신순). 몇 페이지 안에 워터마크에 닿지 않으면 None."""
+        try:
+            return self.comment_store.since(video_id, watermark_id, watermark_published_at)
+        except Exception as e:
+            self.logger.error(f"새 댓글 조회 중 오류가 발생했습니다: {e}")
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    async def get_comments_since_async(
+        self,
+        video_id: str,
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> Optional[List[StoredComment]]:
+        try:
+            return await self.comment_store.since_async(video_id, watermark_id, watermark_published_at)
+        except Exception as e:
+            self.logger.error(f"새 댓글 조회 중 오류가 발생했습니다: {e}")
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
@@ -0,0 +1,153 @@
+import hashlib
+import html
+import logging
+import random
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+BRIEFING_COMMENT_FILTER = Counter(
+    "briefing_comment_filter_total",
+    "브리핑 생성 전 로컬 댓글 필터 결과 (kept, low_info, duplicate)",
+    ["outcome"],
+)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_URL_RE = re.compile(r"(https?://\S+|www\.\S+)", re.IGNORECASE)
+_TIMESTAMP_RE = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\b")
+# 문자/숫자(한글 포함)만 남긴 "내용 글자"
+_CONTENT_CHAR_RE = re.compile(r"[^\w]|_", re.UNICODE)
+# 선착순/인사성 댓글 ("first!", "1등", "1빠" 등)
+_FILLER_RE = re.compile(
+    r"^(first|1st|second|2nd|1등|일등|2등|1빠|일빠|선착순|알림 ?보고 ?왔어요|좋아요|구독|ㅋ+|ㅎ+|ㅠ+|ㅜ+|wow|omg|lol)+$",
+    re.IGNORECASE,
+)
+
+
+class CommentFilter:
+    """브리핑 생성 전에 댓글을 로컬(CPU)에서 정리합니다.
+
+    - HTML 태그/엔티티와 공백을 정규화합니다.
+    - 내용 글자가 거의 없는 댓글(이모지/선착순/링크/타임스탬프만 있는 댓글)을 제거합니다.
+    - 글자 단위 shingle의 MinHash + LSH 밴딩으로 거의 같은 댓글을 하나로 합치고, 더 긴 쪽을 대표로 남깁니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        min_content_chars: int = 4,
+        shingle_size: int = 3,
+        num_perm: int = 64,
+        bands: int = 16,
+        similarity_threshold: float = 0.6,
+        seed: int = 7,
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.min_content_chars = min_content_chars
+        self.shingle_size = shingle_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.similarity_threshold = similarity_threshold
+
+        # 해시 함수 군: 64비트 해시에 서로 다른 마스크를 XOR (순열마다 곱셈/나머지를 하지 않아 빠름)
+        rng = random.Random(seed)
+        self._masks: List[int] = [rng.getrandbits(64) for _ in range(num_perm)]
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # textDisplay는 HTML이므로 엔티티를 먼저 풀고 태그(<br>, <a> 등)를 제거
+        text = _TAG_RE.sub(" ", html.unescape(text or ""))
+        return _WS_RE.sub(" ", text).strip()
+
+    def _content(self, text: str) -> str:
+        """링크/타임스탬프/기호를 제외하고 비교에 쓰는 소문자 내용 글자열"""
+        text = _TIMESTAMP_RE.sub(" ", _URL_RE.sub(" ", text))
+        return _CONTENT_CHAR_RE.sub("", text).lower()
+
+    def _is_low_info(self, content: str) -> bool:
+        return len(content) < self.min_content_chars or bool(_FILLER_RE.match(content))
+
+    def _signature(self, content: str) -> List[int]:
+        k = self.shingle_size
+        if len(content) <= k:
+            shingles = {content}
+        else:
+            shingles = {content[i:i + k] for i in range(len(content) - k + 1)}
+        hashed = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles]
+        return [min([h ^ mask for h in hashed]) for mask in self._masks]
+
+    @staticmethod
+    def _similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def filter(self, comments: List[str]) -> List[str]:
+        """정규화/저정보 제거/근사 중복 제거를 거친 댓글을 원래 순서대로 반환합니다."""
+        return [text for _, text in self.filter_indexed(comments)]
+
+    def filter_indexed(self, comments: List[str]) -> List[Tuple[int, str]]:
+        """filter()와 같지만 각 대표 댓글의 입력 인덱스를 함께 반환합니다 (좋아요 수 등 부가 정보 연결용)."""
+        cleaned = [(i, self.normalize(c)) for i, c in enumerate(comments) if isinstance(c, str)]
+        if not self.enabled:
+            return [(i, c) for i, c in cleaned if c]
+
+        kept: List[Tuple[int, str]] = []
+        signatures: List[List[int]] = []
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        exact: Dict[str, int] = {}
+        low_info = duplicates = 0
+
+        for source, text in cleaned:
+            content = self._content(text)
+            if self._is_low_info(content):
+                low_info += 1
+                continue
+
+            # 내용 글자가 완전히 같으면 MinHash 없이 바로 중복 처리
+            match: Optional[int] = exact.get(content)
+            if match is not None:
+                duplicates += 1
+                if len(text) > len(kept[match][1]):
+                    kept[match] = (source, text)
+                continue
+
+            sig = self._signature(content)
+            bands = [(b, tuple(sig[b * self.rows:(b + 1) * self.rows])) for b in range(self.bands)]
+
+            for band in bands:
+                for idx in buckets.get(band, ()):
+                    if self._similarity(sig, signatures[idx]) >= self.similarity_threshold:
+                        match = idx
+                        break
+                if match is not None:
+                    break
+
+            if match is not None:
+                duplicates += 1
+                exact[content] = match
+                # 같은 내용이면 정보가 더 많은(긴) 댓글을 대표로 유지
+                if len(text) > len(kept[match][1]):
+                    kept[match] = (source, text)
+                continue
+
+            idx = len(kept)
+            exact[content] = idx
+            kept.append((source, text))
+            signatures.append(sig)
+            for band in bands:
+                buckets[band].append(idx)
+
+        BRIEFING_COMMENT_FILTER.labels(outcome="kept").inc(len(kept))
+        BRIEFING_COMMENT_FILTER.labels(outcome="low_info").inc(low_info)
+        BRIEFING_COMMENT_FILTER.labels(outcome="duplicate").inc(duplicates)
+        self.logger.info(
+            f"댓글 필터 완료: 입력={len(cleaned)} 유지={len(kept)} 저정보={low_info} 중복={duplicates}"
+        )
+        return kept
@@ -0,0 +1,156 @@
+import json
+import logging
+import math
+import re
+from typing import List, Sequence, Tuple
+
+from prometheus_client import Counter, Histogram
+
+from app.token_estimate import estimate_text_tokens
+
+BRIEFING_COMMENT_RANK = Counter(
+    "briefing_comment_rank_total",
+    "브리핑 입력 댓글 선별 결과 (selected, dropped)",
+    ["outcome"],
+)
+BRIEFING_PROMPT_COMMENT_TOKENS = Histogram(
+    "briefing_prompt_comment_tokens",
+    "브리핑 프롬프트에 들어간 댓글 토큰 추정치",
+    buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000),
+)
+
+# 레시피에 유용한 정보 신호 (한국어/영어)
+_SUBSTITUTION_RE = re.compile(
+    r"대신|대체|없으면|없어서|바꿔|바꾸|빼고|생략|instead|substitut|replace|swap|skip|without",
+    re.IGNORECASE,
+)
+_AMOUNT_RE = re.compile(
+    r"\d+(?:[.,/]\d+)?\s*(?:g|kg|ml|l|리터|그램|스푼|숟가락|큰술|작은술|컵|개|장|줌|꼬집|tbsp|tsp|cups?|oz|lb)\b|반\s*(?:스푼|컵|큰술)",
+    re.IGNORECASE,
+)
+_TIMING_RE = re.compile(
+    r"\d+\s*(?:분|초|시간|mins?|minutes?|secs?|seconds?|hours?|hrs?)\b|약불|중불|강불|low heat|medium heat|high heat|\d+\s*도|\d+\s*°",
+    re.IGNORECASE,
+)
+_TIP_RE = re.compile(
+    r"팁|꿀팁|더 맛있|추천|주의|넣으면|했더니|해봤|만들어 ?봤|따라 ?해|실패|성공|비법|tip|trick|recommend|better|tried|made (?:this|it)|turned out",
+    re.IGNORECASE,
+)
+_QUESTION_RE = re.compile(r"\?|나요|까요|어떻게|얼마나|how (?:much|long|many)", re.IGNORECASE)
+
+# 신호별 가중치 (features()의 열 순서와 같음)
+_FEATURES = ("substitution", "amount", "timing", "tip", "question", "likes", "replies", "length")
+_WEIGHTS = (3.0, 2.0, 2.0, 2.0, 0.5, 1.2, 0.8, 1.0)
+
+
+class CommentRanker:
+    """댓글을 레시피 유용성으로 점수화해 토큰 예산 안에서 상위 댓글을 고릅니다.
+
+    점수는 어휘 신호(대체 재료/분량/조리 시간·불 세기/팁·후기/질문), 좋아요·답글 수(log 스케일),
+    길이(포화)를 열 단위로 계산한 특징 행렬과 가중치 벡터의 내적입니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        token_budget: int = 3000,
+        max_comments: int = 120,
+        length_saturation_chars: int = 200,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.token_budget = token_budget
+        self.max_comments = max_comments
+        self.length_saturation_chars = length_saturation_chars
+
+    def features(self, texts: Sequence[str], likes: Sequence[int], replies: Sequence[int]) -> List[List[float]]:
+        """특징 행렬을 열(특징) 단위로 계산합니다. 반환값은 _FEATURES 순서의 열 리스트입니다."""
+        sat = float(self.length_saturation_chars)
+        return [
+            [1.0 if _SUBSTITUTION_RE.search(t) else 0.0 for t in texts],
+            [min(len(_AMOUNT_RE.findall(t)), 3) / 3.0 for t in texts],
+            [min(len(_TIMING_RE.findall(t)), 2) / 2.0 for t in texts],
+            [1.0 if _TIP_RE.search(t) else 0.0 for t in texts],
+            [1.0 if _QUESTION_RE.search(t) else 0.0 for t in texts],
+            [math.log1p(max(0, n)) / math.log1p(1000) for n in likes],
+            [math.log1p(max(0, n)) / math.log1p(100) for n in replies],
+            [min(len(t), sat) / sat for t in texts],
+        ]
+
+    def scores(self, texts: Sequence[str], likes: Sequence[int], replies: Sequence[int]) -> List[float]:
+        columns = self.features(texts, likes, replies)
+        totals = [0.0] * len(texts)
+        for weight, column in zip(_WEIGHTS, columns):
+            totals = [acc + weight * value for acc, value in zip(totals, column)]
+        return totals
+
+    @staticmethod
+    def _comment_tokens(text: str) -> int:
+        # 프롬프트에는 JSON 배열 원소로 들어가므로 이스케이프/구분자를 포함해 추정
+        return estimate_text_tokens(json.dumps(text, ensure_ascii=False)) + 1
+
+    def _order(self, texts: Sequence[str], likes: Sequence[int], replies: Sequence[int]) -> List[int]:
+        """점수 내림차순 인덱스 (비활성화 시 입력 순서)"""
+        if not self.enabled:
+            return list(range(len(texts)))
+        scores = self.scores(texts, likes, replies)
+        ranked: List[Tuple[float, int]] = sorted((-score, i) for i, score in enumerate(scores))
+        return [i for _, i in ranked]
+
+    def _pack(self, texts: Sequence[str], order: List[int]) -> Tuple[List[int], List[int], int]:
+        """order 순서대로 토큰 예산/최대 개수 안에 담고 (선택, 남은 후보, 사용 토큰)을 반환합니다."""
+        selected: List[int] = []
+        rest: List[int] = []
+        used = 0
+        for i in order:
+            if len(selected) >= self.max_comments:
+                rest.append(i)
+                continue
+            cost = self._comment_tokens(texts[i])
+            if used + cost > self.token_budget:
+                # 긴 댓글 하나 때문에 멈추지 않도록 더 짧은 후보는 계속 확인
+                rest.append(i)
+                continue
+            selected.append(i)
+            used += cost
+        return selected, rest, used
+
+    def select(self, texts: Sequence[str], likes: Sequence[int], replies: Sequence[int]) -> List[int]:
+        """점수가 높은 순으로 토큰 예산/최대 개수 안에 드는 댓글의 인덱스를 반환합니다."""
+        if not texts:
+            return []
+        if not self.enabled:
+            return list(range(min(len(texts), self.max_comments)))
+
+        selected, _, used = self._pack(texts, self._order(texts, likes, replies))
+
+        BRIEFING_COMMENT_RANK.labels(outcome="selected").inc(len(selected))
+        BRIEFING_COMMENT_RANK.labels(outcome="dropped").inc(len(texts) - len(selected))
+        BRIEFING_PROMPT_COMMENT_TOKENS.observe(used)
+        self.logger.info(f"댓글 선별 완료: 후보={len(texts)} 선택={len(selected)} 토큰≈{used}/{self.token_budget}")
+        return selected
+
+    def shard(
+        self,
+        texts: Sequence[str],
+        likes: Sequence[int],
+        replies: Sequence[int],
+        *,
+        max_shards: int,
+    ) -> List[List[int]]:
+        """map-reduce용: 점수 순으로 토큰 예산 크기의 샤드를 최대 max_shards개 만듭니다. 첫 샤드가 가장 유용한 댓글입니다."""
+        shards: List[List[int]] = []
+        remaining = self._order(texts, likes, replies)
+        while remaining and len(shards) < max_shards:
+            picked, remaining, used = self._pack(texts, remaining)
+            if not picked:
+                break
+            shards.append(picked)
+            BRIEFING_PROMPT_COMMENT_TOKENS.observe(used)
+
+        selected = sum(len(shard) for shard in shards)
+        BRIEFING_COMMENT_RANK.labels(outcome="selected").inc(selected)
+        BRIEFING_COMMENT_RANK.labels(outcome="dropped").inc(len(texts) - selected)
+        self.logger.info(f"댓글 샤드 구성 완료: 후보={len(texts)} 샤드={len(shards)} 선택={selected}")
+        return shards
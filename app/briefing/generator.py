@@ -2,14 +2,14 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types
 
 from app.briefing.exception import BriefingErrorCode, BriefingException
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.gemini_invoker import GeminiInvoker, ModelRoute
 
 
 class IBriefingGenerator(ABC):
@@ -28,19 +28,26 @@ class BriefingGenerator(IBriefingGenerator):
     def __init__(
         self,
         *,
-        client: genai.Client,
+        invoker: GeminiInvoker,
         model: str,
         fallback_model: str = "gemini-3.0-flash",
         generate_user_prompt_path: Path,
         generate_tool_path: Path,
+        invoke_mode: str = InvokeMode.THREAD,
+        update_user_prompt_path: Optional[Path] = None,
+        batch_user_prompt_path: Optional[Path] = None,
+        batch_tool_path: Optional[Path] = None,
     ):
         self.logger = logging.getLogger(__name__)
-        self.client = client
+        self.invoker = invoker
+        self.invoke_mode = InvokeMode(invoke_mode)
         self.model = model
         self.fallback_model = fallback_model
 
         self.briefing_prompt = generate_user_prompt_path.read_text(encoding="utf-8")
         self.briefing_tool_spec = json.loads(generate_tool_path.read_text(encoding="utf-8"))
+        # 이전 브리핑 + 새 댓글만으로 갱신하는 프롬프트 (증분 갱신용)
+        self.update_prompt = update_user_prompt_path.read_text(encoding="utf-8") if update_user_prompt_path else None
 
         self.system_instruction = (
             "You are a specialized AI assistant for summarizing cooking review. "
@@ -89,83 +96,89 @@ class BriefingGenerator(IBriefingGenerator):
                 )
             ),
         )
+        self.briefing_routes = [
+            ModelRoute(self.model, self.briefing_conf),
+            ModelRoute(self.fallback_model, self.briefing_conf),
+        ]
+
+        # 여러 영상을 한 번의 호출로 처리하는 배치 도구 (선택)
+        self.batch_prompt: Optional[str] = None
+        self.batch_tool_name: Optional[str] = None
+        self.batch_routes: List[ModelRoute] = []
+        if batch_user_prompt_path is not None and batch_tool_path is not None:
+            self.batch_prompt = batch_user_prompt_path.read_text(encoding="utf-8")
+            batch_tool_spec = json.loads(batch_tool_path.read_text(encoding="utf-8"))
+            self.batch_tool_name = _get_function_name(batch_tool_spec)
+            batch_conf = types.GenerateContentConfig(
+                system_instruction=self.system_instruction.replace("emit_briefing", self.batch_tool_name or ""),
+                temperature=0.0,
+                tools=[_build_tool_from_spec(batch_tool_spec)],
+                tool_config=types.ToolConfig(
+                    function_calling_config=types.FunctionCallingConfig(
+                        mode="ANY",
+                        allowed_function_names=[self.batch_tool_name] if self.batch_tool_name else None,
+                    )
+                ),
+            )
+            self.batch_routes = [
+                ModelRoute(self.model, batch_conf),
+                ModelRoute(self.fallback_model, batch_conf),
+            ]
+
+    @property
+    def supports_batch(self) -> bool:
+        return bool(self.batch_routes)
 
     @staticmethod
-    def _is_rate_limit_error(err: Exception) -> bool:
-        status_code = getattr(err, "status_code", None)
-        if status_code == 429:
-            return True
+    def _function_calls(response) -> list:
+        calls = getattr(response, "function_calls", None) or []
+        if not calls and getattr(response, "candidates", None):
+            calls = []
+            for cand in response.candidates:
+                content = getattr(cand, "content", None)
+                if not content:
+                    continue
+                for part in content.parts:
+                    fc = getattr(part, "function_call", None)
+                    if fc:
+                        calls.append(fc)
+        return calls
+
+    def _parse_briefing_response(self, response) -> List[str]:
+        calls = self._function_calls(response)
+        if not calls:
+            self.logger.error("No function call returned from Gemini (emit_briefing)")
+            return []
 
-        code = getattr(err, "code", None)
-        if code == 429:
-            return True
+        briefing_args = None
+        for call in calls:
+            if call.name == self.tool_name:
+                briefing_args = call.args or {}
+                break
 
-        message = str(err).lower()
-        return (
-            "429" in message
-            or "too many requests" in message
-            or "rate limit" in message
-            or "resource_exhausted" in message
-        )
+        if not briefing_args:
+            self.logger.error("emit_briefing not found in function calls")
+            return []
 
-    @staticmethod
-    def _is_server_error(err: Exception) -> bool:
-        code = getattr(err, "code", None)
-        return code is not None and 500 <= code < 600
-
-    def _generate_with_model(self, user_prompt: str, model: str):
-        return self.client.models.generate_content(
-            model=model,
-            contents=user_prompt,
-            config=self.briefing_conf,
-        )
+        items = briefing_args.get("items") or []
+        return [str(item) for item in items if isinstance(item, str)]
 
     def __converse_briefing(self, user_prompt: str) -> List[str]:
         try:
-            try:
-                response = self._generate_with_model(user_prompt, self.model)
-            except (genai_errors.ClientError, genai_errors.ServerError) as e:
-                should_fallback = (
-                    self.fallback_model
-                    and self.fallback_model != self.model
-                    and (self._is_rate_limit_error(e) or self._is_server_error(e))
-                )
-                if not should_fallback:
-                    raise
+            response = self.invoker.invoke(self.briefing_routes, user_prompt)
+            return self._parse_briefing_response(response)
 
-                self.logger.warning(
-                    f"Primary Gemini model unavailable. fallback model={self.fallback_model}"
-                )
-                response = self._generate_with_model(user_prompt, self.fallback_model)
-
-            calls = getattr(response, "function_calls", None) or []
-            if not calls and getattr(response, "candidates", None):
-                calls = []
-                for cand in response.candidates:
-                    content = getattr(cand, "content", None)
-                    if not content:
-                        continue
-                    for part in content.parts:
-                        fc = getattr(part, "function_call", None)
-                        if fc:
-                            calls.append(fc)
-
-            if not calls:
-                self.logger.error("No function call returned from Gemini (emit_briefing)")
-                return []
-
-            briefing_args = None
-            for call in calls:
-                if call.name == self.tool_name:
-                    briefing_args = call.args or {}
-                    break
-
-            if not briefing_args:
-                self.logger.error("emit_briefing not found in function calls")
-                return []
-
-            items = briefing_args.get("items") or []
-            return [str(item) for item in items if isinstance(item, str)]
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
+            self.logger.error(f"Gemini API failed (emit_briefing): {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"Unexpected converse response (emit_briefing): {e}")
+            return []
+
+    async def __converse_briefing_async(self, user_prompt: str) -> List[str]:
+        try:
+            response = await self.invoker.invoke_async(self.briefing_routes, user_prompt)
+            return self._parse_briefing_response(response)
 
         except (genai_errors.ClientError, genai_errors.ServerError) as e:
             self.logger.error(f"Gemini API failed (emit_briefing): {e}")
@@ -174,28 +187,127 @@ class BriefingGenerator(IBriefingGenerator):
             self.logger.error(f"Unexpected converse response (emit_briefing): {e}")
             return []
 
+    def _build_prompt(self, comments: List[str], language: LanguageType) -> str:
+        comments_json = json.dumps(
+            [comment for comment in comments if isinstance(comment, str) and comment.strip()],
+            ensure_ascii=False
+        )
+        return (
+            self.briefing_prompt
+            .replace("{{ comments_json }}", comments_json)
+            .replace("{{ language }}", language)
+        )
+
+    def _build_update_prompt(self, previous: List[str], comments: List[str], language: LanguageType) -> str:
+        comments_json = json.dumps(
+            [comment for comment in comments if isinstance(comment, str) and comment.strip()],
+            ensure_ascii=False
+        )
+        return (
+            self.update_prompt
+            .replace("{{ previous_json }}", json.dumps(previous, ensure_ascii=False))
+            .replace("{{ comments_json }}", comments_json)
+            .replace("{{ language }}", language)
+        )
+
+    @staticmethod
+    def _trim_result(result: List[str]) -> List[str]:
+        if len(result) > 4:
+            result = result[:4]
+
+        if len(result) < 2:
+            return []
+
+        return result
 
     def generate(self, comments: List[str], language: LanguageType) -> List[str]:
         try:
-            comments_json = json.dumps(
-                [comment for comment in comments if isinstance(comment, str) and comment.strip()],
-                ensure_ascii=False
-            )
-            prompt = (
-                self.briefing_prompt
-                .replace("{{ comments_json }}", comments_json)
-                .replace("{{ language }}", language)
-            )
+            prompt = self._build_prompt(comments, language)
             result = self.__converse_briefing(prompt)
+            return self._trim_result(result)
 
-            if len(result) > 4:
-                result = result[:4]
-
-            if len(result) < 2:
-                return []
+        except Exception as e:
+            self.logger.error(f'브리핑 생성 중 오류가 발생했습니다: {e}')
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
 
-            return result
+    async def generate_async(self, comments: List[str], language: LanguageType) -> List[str]:
+        """generate의 asyncio 네이티브 버전 (client.aio 사용, 타임아웃 시 실제로 취소됨)"""
+        try:
+            prompt = self._build_prompt(comments, language)
+            result = await self.__converse_briefing_async(prompt)
+            return self._trim_result(result)
 
         except Exception as e:
             self.logger.error(f'브리핑 생성 중 오류가 발생했습니다: {e}')
             raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    def update(self, previous: List[str], comments: List[str], language: LanguageType) -> List[str]:
+        """이전 브리핑에 새 댓글(delta)만 반영해 갱신합니다. 갱신 프롬프트가 없으면 새 댓글만으로 생성합니다."""
+        if self.update_prompt is None:
+            return self.generate(comments, language)
+        try:
+            prompt = self._build_update_prompt(previous, comments, language)
+            result = self.__converse_briefing(prompt)
+            return self._trim_result(result)
+
+        except Exception as e:
+            self.logger.error(f'브리핑 갱신 중 오류가 발생했습니다: {e}')
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    async def update_async(self, previous: List[str], comments: List[str], language: LanguageType) -> List[str]:
+        if self.update_prompt is None:
+            return await self.generate_async(comments, language)
+        try:
+            prompt = self._build_update_prompt(previous, comments, language)
+            result = await self.__converse_briefing_async(prompt)
+            return self._trim_result(result)
+
+        except Exception as e:
+            self.logger.error(f'브리핑 갱신 중 오류가 발생했습니다: {e}')
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    def _build_batch_prompt(self, videos: Dict[str, List[str]], language: LanguageType) -> str:
+        videos_json = json.dumps(
+            [
+                {"video_id": video_id, "comments": [c for c in comments if isinstance(c, str) and c.strip()]}
+                for video_id, comments in videos.items()
+            ],
+            ensure_ascii=False,
+        )
+        return self.batch_prompt.replace("{{ videos_json }}", videos_json).replace("{{ language }}", language)
+
+    def _parse_batch_response(self, response, video_ids: List[str]) -> Dict[str, List[str]]:
+        """요청한 video_id에 대한 결과만 반환합니다. 누락된 영상은 호출자가 단건으로 처리합니다."""
+        results: Dict[str, List[str]] = {}
+        for call in self._function_calls(response):
+            if call.name != self.batch_tool_name:
+                continue
+            for entry in (call.args or {}).get("briefings") or []:
+                if not isinstance(entry, dict):
+                    continue
+                video_id = entry.get("video_id")
+                if video_id in video_ids and video_id not in results:
+                    items = [str(item) for item in entry.get("items") or [] if isinstance(item, str)]
+                    results[video_id] = self._trim_result(items)
+        return results
+
+    def generate_batch(self, videos: Dict[str, List[str]], language: LanguageType) -> Dict[str, List[str]]:
+        """여러 영상의 댓글을 한 번의 호출로 요약합니다 (video_id → 브리핑)."""
+        try:
+            prompt = self._build_batch_prompt(videos, language)
+            response = self.invoker.invoke(self.batch_routes, prompt)
+            return self._parse_batch_response(response, list(videos))
+
+        except Exception as e:
+            self.logger.error(f'배치 브리핑 생성 중 오류가 발생했습니다: {e}')
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+
+    async def generate_batch_async(self, videos: Dict[str, List[str]], language: LanguageType) -> Dict[str, List[str]]:
+        try:
+            prompt = self._build_batch_prompt(videos, language)
+            response = await self.invoker.invoke_async(self.batch_routes, prompt)
+            return self._parse_batch_response(response, list(videos))
+
+        except Exception as e:
+            self.logger.error(f'배치 브리핑 생성 중 오류가 발생했습니다: {e}')
+            raise BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
@@ -1,9 +1,11 @@
+import json
 from typing import Annotated
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
 
-from app.briefing.schema import BriefingRequest, BriefingResponse
+from app.briefing.schema import BriefingBatchRequest, BriefingRequest, BriefingResponse
 from app.briefing.service import BriefingService
 from app.container import Container
 from app.enum import LanguageType
@@ -20,4 +22,24 @@ async def get_briefing(
     country = (x_country_code or "").strip().upper()
     language = LanguageType.KR if country == "KR" else LanguageType.EN
 
-    return BriefingResponse(briefings=await briefing_service.get(request.video_id, language))
\ No newline at end of file
+    return BriefingResponse(briefings=await briefing_service.get(request.video_id, language))
+
+
+@router.post("/briefings/batch")
+@inject
+async def get_briefings_batch(
+    request: BriefingBatchRequest,
+    x_country_code: Annotated[str | None, Header(alias="X-Country-Code")] = None,
+    briefing_service: BriefingService = Depends(Provide[Container.briefing_service])
+):
+    """여러 영상의 브리핑을 완료되는 순서대로 NDJSON(한 줄에 영상 하나)으로 스트리밍합니다."""
+    country = (x_country_code or "").strip().upper()
+    language = LanguageType.KR if country == "KR" else LanguageType.EN
+
+    events = briefing_service.stream_batch(request.video_ids, language)
+
+    async def body():
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
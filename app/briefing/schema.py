@@ -10,4 +10,8 @@ class BriefingRequest(BaseModel):
 
 
 class BriefingResponse(BaseModel):
-    briefings: List[str] = Field(..., description="브리핑 내용")
\ No newline at end of file
+    briefings: List[str] = Field(..., description="브리핑 내용")
+
+
+class BriefingBatchRequest(BaseModel):
+    video_ids: List[str] = Field(..., min_length=1, max_length=1000, description="영상 ID 목록")
\ No newline at end of file
@@ -1,45 +1,481 @@
 import asyncio
+import json
 import logging
-from typing import List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Histogram
 
 from app.briefing.client import BriefingClient
+from app.briefing.comment_filter import CommentFilter
+from app.briefing.comment_ranker import CommentRanker
+from app.briefing.exception import BriefingErrorCode, BriefingException
 from app.briefing.generator import BriefingGenerator
-from app.enum import LanguageType
+from app.briefing.store import BriefingStore, StoredBriefing
+from app.comment_store import StoredComment
+from app.enum import InvokeMode, LanguageType
+from app.exception import BusinessException
+from app.singleflight import SingleFlight
+from app.token_estimate import estimate_text_tokens
+
+BRIEFING_MAP_REDUCE = Counter(
+    "briefing_map_reduce_total",
+    "map-reduce 브리핑 결과 (single, reduced, partial_reduce, map_only, empty)",
+    ["outcome"],
+)
+BRIEFING_REFRESH = Counter(
+    "briefing_refresh_total",
+    "저장된 브리핑의 백그라운드 갱신 결과 (unchanged, delta, full, skipped, failed)",
+    ["outcome"],
+)
+
+BRIEFING_BATCH_VIDEOS = Counter(
+    "briefing_batch_videos_total",
+    "배치 브리핑 영상별 처리 결과 (cache, packed, single, empty, error)",
+    ["outcome"],
+)
+BRIEFING_BATCH_PACK_SIZE = Histogram(
+    "briefing_batch_pack_size",
+    "배치 브리핑에서 한 번의 생성 호출에 묶인 영상 수",
+    buckets=(1, 2, 3, 4, 6, 8, 12),
+)
+
+# 응답 이후에도 진행되는 백그라운드 갱신 태스크 (GC로 중단되지 않도록 참조 유지)
+_background_refreshes: Set[asyncio.Task] = set()
 
 
 class BriefingService:
     FETCH_TIMEOUT_SECONDS = 45
     GENERATE_TIMEOUT_SECONDS = 45
     MAX_COMMENTS_FOR_GENERATION = 120
+    # map-reduce 모드에서 reduce 호출을 위해 생성 마감 전에 남겨두는 시간
+    REDUCE_RESERVE_SECONDS = 12
+    # 배치 엔드포인트: 댓글 수집/생성 동시성과 한 번의 생성 호출에 묶는 영상 수/토큰 예산
+    BATCH_FETCH_CONCURRENCY = 8
+    BATCH_GENERATE_CONCURRENCY = 4
+    BATCH_PACK_MAX_VIDEOS = 6
+    BATCH_PACK_TOKEN_BUDGET = 9000
 
-    def __init__(self, client: BriefingClient, generator: BriefingGenerator):
+    def __init__(
+        self,
+        client: BriefingClient,
+        generator: BriefingGenerator,
+        singleflight: Optional[SingleFlight] = None,
+        comment_filter: Optional[CommentFilter] = None,
+        comment_ranker: Optional[CommentRanker] = None,
+        map_reduce_enabled: bool = False,
+        map_reduce_max_comments: int = 2000,
+        map_max_shards: int = 8,
+        map_concurrency: int = 4,
+        briefing_store: Optional[BriefingStore] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         self.client = client
         self.generator = generator
+        self.singleflight = singleflight
+        self.comment_filter = comment_filter
+        self.comment_ranker = comment_ranker
+        # 댓글이 많은 영상은 더 많이 수집해 토큰 예산 크기 샤드별로 요약(map)한 뒤 합침(reduce)
+        self.map_reduce_enabled = map_reduce_enabled and comment_ranker is not None
+        self.map_reduce_max_comments = map_reduce_max_comments
+        self.map_max_shards = map_max_shards
+        self.map_concurrency = max(1, map_concurrency)
+        # 저장된 브리핑은 즉시 반환하고 오래되었으면 새 댓글만으로 백그라운드 갱신 (stale-while-revalidate)
+        self.briefing_store = briefing_store if briefing_store is not None and briefing_store.enabled else None
 
     async def get(self, video_id: str, language: LanguageType) -> List[str]:
+        if self.singleflight is None:
+            return await self._get(video_id, language)
+        return await self.singleflight.do(
+            "briefing",
+            f"{video_id}:{language.value}",
+            lambda: self._get(video_id, language),
+        )
+
+    def _candidates(self, comments: List[StoredComment]) -> Tuple[List[str], List[int], List[int]]:
+        """저정보/근사 중복을 제거한 (텍스트, 좋아요 수, 답글 수)"""
+        if self.comment_filter is not None:
+            indexed = self.comment_filter.filter_indexed([c.text for c in comments])
+        else:
+            indexed = [(i, c.text) for i, c in enumerate(comments) if c.text and c.text.strip()]
+        return (
+            [text for _, text in indexed],
+            [comments[i].like_count for i, _ in indexed],
+            [comments[i].reply_count for i, _ in indexed],
+        )
+
+    def _select_comments(self, comments: List[StoredComment]) -> List[str]:
+        """생성 입력 댓글 선별: 저정보/근사 중복 제거 → 유용성 점수 상위를 토큰 예산 안에서 선택"""
+        texts, likes, replies = self._candidates(comments)
+        if self.comment_ranker is None:
+            return texts[:self.MAX_COMMENTS_FOR_GENERATION]
+        return [texts[i] for i in self.comment_ranker.select(texts, likes, replies)]
+
+    def _shard_comments(self, comments: List[StoredComment]) -> List[List[str]]:
+        texts, likes, replies = self._candidates(comments)
+        shards = self.comment_ranker.shard(texts, likes, replies, max_shards=self.map_max_shards)
+        return [[texts[i] for i in shard] for shard in shards]
+
+    def _generate_call(self, comments: List[str], language: LanguageType) -> Awaitable[List[str]]:
+        if self.generator.invoke_mode == InvokeMode.ASYNC:
+            return self.generator.generate_async(comments, language)
+        return asyncio.to_thread(self.generator.generate, comments, language)
+
+    async def _fetch_comments(self, video_id: str) -> List[StoredComment]:
+        limit = self.map_reduce_max_comments if self.map_reduce_enabled else None
+        if self.client.invoke_mode == InvokeMode.ASYNC:
+            # 타임아웃 시 진행 중인 HTTP 요청까지 취소됨
+            fetch_call = self.client.get_video_comments_async(video_id, limit)
+        else:
+            fetch_call = asyncio.to_thread(self.client.get_video_comments, video_id, limit)
+
         try:
-            raw_comments = await asyncio.wait_for(
-                asyncio.to_thread(self.client.get_video_comments, video_id),
-                timeout=self.FETCH_TIMEOUT_SECONDS,
-            )
+            return await asyncio.wait_for(fetch_call, timeout=self.FETCH_TIMEOUT_SECONDS)
         except TimeoutError:
-            self.logger.warning(f"댓글 수집 타임아웃으로 브리핑 생성을 건너뜁니다. video_id={video_id}")
-            return []
+            if not self.map_reduce_enabled:
+                self.logger.warning(f"댓글 수집 타임아웃으로 브리핑 생성을 건너뜁니다. video_id={video_id}")
+                return []
+            # 많이 수집하는 모드에서는 마감까지 받은 페이지로 진행
+            partial = self.client.peek_video_comments(video_id, limit)
+            self.logger.warning(f"댓글 수집 타임아웃, 수집된 {len(partial)}개로 진행합니다. video_id={video_id}")
+            return partial
+
+    async def _get(self, video_id: str, language: LanguageType) -> List[str]:
+        if self.briefing_store is None:
+            return await self._generate_from(video_id, await self._fetch_comments(video_id), language)
+
+        cached = await asyncio.to_thread(self.briefing_store.get, video_id, language.value)
+        if cached is not None:
+            if not self.briefing_store.is_fresh(cached):
+                self._schedule_refresh(video_id, language, cached)
+            return list(cached.items)
 
+        raw_comments = await self._fetch_comments(video_id)
+        items = await self._generate_from(video_id, raw_comments, language)
+        if items:
+            await asyncio.to_thread(self._save, video_id, language, items, raw_comments)
+        return items
+
+    def _save(self, video_id: str, language: LanguageType, items: List[str], comments: List[StoredComment]) -> None:
+        newest = comments[0]
+        self.briefing_store.put(
+            video_id,
+            language.value,
+            items=items,
+            watermark_id=newest.id,
+            watermark_published_at=newest.published_at,
+        )
+
+    async def _fetch_since(self, video_id: str, cached: StoredBriefing) -> Optional[List[StoredComment]]:
+        """워터마크 이후의 새 댓글만 최신순으로 읽습니다. 워터마크에 닿지 않으면 None."""
+        if self.client.invoke_mode == InvokeMode.ASYNC:
+            fetch_call = self.client.get_comments_since_async(
+                video_id, cached.watermark_id, cached.watermark_published_at
+            )
+        else:
+            fetch_call = asyncio.to_thread(
+                self.client.get_comments_since, video_id, cached.watermark_id, cached.watermark_published_at
+            )
+        return await asyncio.wait_for(fetch_call, timeout=self.FETCH_TIMEOUT_SECONDS)
+
+    def _schedule_refresh(
+        self,
+        video_id: str,
+        language: LanguageType,
+        cached: StoredBriefing,
+        limit: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """limit이 주어지면 같은 세마포어를 공유하는 갱신끼리 동시 실행 수를 제한합니다 (배치 요청용)."""
+        if limit is None:
+            task = asyncio.create_task(self._refresh(video_id, language, cached))
+        else:
+            task = asyncio.create_task(self._refresh_limited(limit, video_id, language, cached))
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
+
+    async def _refresh_limited(
+        self,
+        limit: asyncio.Semaphore,
+        video_id: str,
+        language: LanguageType,
+        cached: StoredBriefing,
+    ) -> None:
+        async with limit:
+            await self._refresh(video_id, language, cached)
+
+    async def _refresh(self, video_id: str, language: LanguageType, cached: StoredBriefing) -> None:
+        store = self.briefing_store
+        if not await asyncio.to_thread(store.claim_refresh, video_id, language.value):
+            BRIEFING_REFRESH.labels(outcome="skipped").inc()
+            return
+        try:
+            # 최신 페이지부터 워터마크까지만 읽음
+            comments = await self._fetch_since(video_id, cached)
+            if comments is None:
+                # 새 댓글이 몇 페이지를 넘으면 처음부터 다시 수집/생성
+                outcome = "full"
+                comments = await self._fetch_comments(video_id)
+                if not comments:
+                    BRIEFING_REFRESH.labels(outcome="failed").inc()
+                    return
+                items = await self._generate_from(video_id, comments, language)
+            elif not comments:
+                BRIEFING_REFRESH.labels(outcome="unchanged").inc()
+                await asyncio.to_thread(store.touch, video_id, language.value)
+                return
+            else:
+                new_comments = self._select_comments(comments)
+                if new_comments:
+                    outcome = "delta"
+                    items = await asyncio.wait_for(
+                        self._update_call(cached.items, new_comments, language),
+                        timeout=self.GENERATE_TIMEOUT_SECONDS,
+                    )
+                else:
+                    # 쓸 만한 새 댓글이 없으면 브리핑은 그대로 두고 워터마크만 전진
+                    outcome = "unchanged"
+                    items = list(cached.items)
+
+            if not items:
+                BRIEFING_REFRESH.labels(outcome="failed").inc()
+                return
+            await asyncio.to_thread(self._save, video_id, language, items, comments)
+            BRIEFING_REFRESH.labels(outcome=outcome).inc()
+            self.logger.info(f"브리핑 백그라운드 갱신 완료 video_id={video_id} mode={outcome}")
+        except Exception as e:
+            BRIEFING_REFRESH.labels(outcome="failed").inc()
+            self.logger.warning(f"브리핑 백그라운드 갱신 실패 video_id={video_id}: {e!r}")
+        finally:
+            await asyncio.to_thread(store.release_refresh, video_id, language.value)
+
+    def _update_call(self, previous: List[str], comments: List[str], language: LanguageType) -> Awaitable[List[str]]:
+        if self.generator.invoke_mode == InvokeMode.ASYNC:
+            return self.generator.update_async(previous, comments, language)
+        return asyncio.to_thread(self.generator.update, previous, comments, language)
+
+    async def _generate_from(self, video_id: str, raw_comments: List[StoredComment], language: LanguageType) -> List[str]:
         if not raw_comments:
             return []
 
-        generation_comments = [text for text in raw_comments if isinstance(text, str) and text.strip()]
-        generation_comments = generation_comments[:self.MAX_COMMENTS_FOR_GENERATION]
+        if self.map_reduce_enabled:
+            shards = self._shard_comments(raw_comments)
+            if len(shards) > 1:
+                return await self._map_reduce(video_id, shards, language)
+            BRIEFING_MAP_REDUCE.labels(outcome="single").inc()
+            generation_comments = shards[0] if shards else []
+        else:
+            generation_comments = self._select_comments(raw_comments)
         if not generation_comments:
             return []
 
         try:
             return await asyncio.wait_for(
-                asyncio.to_thread(self.generator.generate, generation_comments, language),
+                self._generate_call(generation_comments, language),
                 timeout=self.GENERATE_TIMEOUT_SECONDS,
             )
         except TimeoutError:
             self.logger.warning(f"브리핑 생성 타임아웃으로 빈 응답을 반환합니다. video_id={video_id}")
             return []
+
+    async def _map_reduce(self, video_id: str, shards: List[List[str]], language: LanguageType) -> List[str]:
+        """샤드별 브리핑(map)을 제한된 동시성으로 만들고 하나로 합칩니다(reduce).
+
+        GENERATE_TIMEOUT_SECONDS 안에서 reduce 시간을 남기고 map을 마감하며,
+        reduce가 마감을 넘기거나 실패하면 가장 유용한 샤드의 결과를 반환합니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.GENERATE_TIMEOUT_SECONDS
+        map_deadline = deadline - min(self.REDUCE_RESERVE_SECONDS, self.GENERATE_TIMEOUT_SECONDS / 3)
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+
+        async def run_shard(comments: List[str]) -> List[str]:
+            async with semaphore:
+                return await self._generate_call(comments, language)
+
+        tasks = [asyncio.create_task(run_shard(shard)) for shard in shards]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=max(0.0, map_deadline - loop.time()))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        # 샤드 순서(유용성 순)를 유지한 채 성공한 결과만 사용
+        partials: List[List[str]] = []
+        for index, task in enumerate(tasks):
+            if task in pending or task.cancelled():
+                continue
+            error = task.exception()
+            if error is not None:
+                self.logger.warning(f"샤드 브리핑 실패 video_id={video_id} shard={index}: {error}")
+                continue
+            if task.result():
+                partials.append(task.result())
+
+        self.logger.info(
+            f"map 단계 완료 video_id={video_id} shards={len(shards)} 성공={len(partials)} 마감초과={len(pending)}"
+        )
+        if not partials:
+            BRIEFING_MAP_REDUCE.labels(outcome="empty").inc()
+            return []
+        if len(partials) == 1:
+            BRIEFING_MAP_REDUCE.labels(outcome="map_only").inc()
+            return partials[0]
+
+        merged = [item for partial in partials for item in partial]
+        try:
+            reduced = await asyncio.wait_for(
+                self._generate_call(merged, language),
+                timeout=max(0.1, deadline - loop.time()),
+            )
+            if reduced:
+                BRIEFING_MAP_REDUCE.labels(outcome="partial_reduce" if pending else "reduced").inc()
+                return reduced
+        except (TimeoutError, BriefingException) as e:
+            self.logger.warning(f"reduce 실패, 최상위 샤드 결과를 반환합니다. video_id={video_id}: {e!r}")
+
+        BRIEFING_MAP_REDUCE.labels(outcome="map_only").inc()
+        return partials[0]
+
+    async def stream_batch(self, video_ids: List[str], language: LanguageType) -> AsyncIterator[Dict[str, Any]]:
+        """영상별 브리핑을 완료되는 순서대로 내보내고, 마지막에 done 이벤트를 내보냅니다.
+
+        한 영상의 실패는 해당 영상의 error 이벤트로만 전달되며 나머지 영상에는 영향을 주지 않습니다.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        unique_ids = list(dict.fromkeys(v.strip() for v in video_ids if v and v.strip()))
+
+        async def produce() -> None:
+            try:
+                await self._run_batch(unique_ids, language, queue.put_nowait)
+                queue.put_nowait({"event": "done", "count": len(unique_ids)})
+            except Exception as e:
+                self.logger.error(f"배치 브리핑 실행 실패: {e}")
+                queue.put_nowait({"event": "error", **BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED).to_dict()})
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # 클라이언트 연결이 끊기면 남은 수집/생성을 취소
+            if not task.done():
+                task.cancel()
+
+    def _batch_error(self, video_id: str, error: Exception) -> Dict[str, Any]:
+        BRIEFING_BATCH_VIDEOS.labels(outcome="error").inc()
+        self.logger.warning(f"배치 브리핑 실패 video_id={video_id}: {error!r}")
+        if not isinstance(error, BusinessException):
+            error = BriefingException(BriefingErrorCode.BRIEFING_GENERATE_FAILED)
+        return {"event": "error", "video_id": video_id, **error.to_dict()}
+
+    def _batch_call(self, videos: Dict[str, List[str]], language: LanguageType) -> Awaitable[Dict[str, List[str]]]:
+        if self.generator.invoke_mode == InvokeMode.ASYNC:
+            return self.generator.generate_batch_async(videos, language)
+        return asyncio.to_thread(self.generator.generate_batch, videos, language)
+
+    async def _run_batch(
+        self,
+        video_ids: List[str],
+        language: LanguageType,
+        emit: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        fetch_semaphore = asyncio.Semaphore(self.BATCH_FETCH_CONCURRENCY)
+        generate_semaphore = asyncio.Semaphore(self.BATCH_GENERATE_CONCURRENCY)
+        # 오래된 캐시의 백그라운드 갱신도 배치 단위로 동시 실행 수를 제한 (응답 이후에도 이어짐)
+        refresh_semaphore = asyncio.Semaphore(self.BATCH_GENERATE_CONCURRENCY)
+        pack: List[Tuple[str, List[str], List[StoredComment]]] = []
+        pack_tokens = 0
+        generate_tasks: List[asyncio.Task] = []
+
+        def emit_result(video_id: str, items: List[str], source: str) -> None:
+            BRIEFING_BATCH_VIDEOS.labels(outcome=source).inc()
+            emit({"event": "briefing", "video_id": video_id, "briefings": items, "source": source})
+
+        async def generate_pack(videos: List[Tuple[str, List[str], List[StoredComment]]]) -> None:
+            pending = [video_id for video_id, _, _ in videos]
+            try:
+                await generate_videos(videos, pending)
+            except Exception as e:
+                # 영상별 처리 밖에서 실패해도 남은 영상마다 오류 줄을 보냄
+                for video_id in pending:
+                    emit(self._batch_error(video_id, e))
+
+        async def generate_videos(videos: List[Tuple[str, List[str], List[StoredComment]]], pending: List[str]) -> None:
+            async with generate_semaphore:
+                packed: Dict[str, List[str]] = {}
+                if len(videos) > 1 and self.generator.supports_batch:
+                    BRIEFING_BATCH_PACK_SIZE.observe(len(videos))
+                    try:
+                        packed = await asyncio.wait_for(
+                            self._batch_call({video_id: texts for video_id, texts, _ in videos}, language),
+                            timeout=self.GENERATE_TIMEOUT_SECONDS,
+                        )
+                    except Exception as e:
+                        self.logger.warning(f"배치 생성 실패, 영상별 생성으로 대체합니다: {e!r}")
+
+                for video_id, texts, comments in videos:
+                    pending.remove(video_id)
+                    try:
+                        items = packed.get(video_id)
+                        source = "packed"
+                        if not items:
+                            # 묶음 응답에서 빠졌거나 부족한 영상은 단건으로 생성
+                            source = "single"
+                            items = await asyncio.wait_for(
+                                self._generate_call(texts, language),
+                                timeout=self.GENERATE_TIMEOUT_SECONDS,
+                            )
+                        if items and self.briefing_store is not None:
+                            await asyncio.to_thread(self._save, video_id, language, items, comments)
+                        emit_result(video_id, items, source if items else "empty")
+                    except Exception as e:
+                        emit(self._batch_error(video_id, e))
+
+        def flush() -> None:
+            nonlocal pack, pack_tokens
+            if pack:
+                generate_tasks.append(asyncio.create_task(generate_pack(pack)))
+                pack, pack_tokens = [], 0
+
+        async def prepare(video_id: str) -> None:
+            nonlocal pack_tokens
+            try:
+                async with fetch_semaphore:
+                    if self.briefing_store is not None:
+                        cached = await asyncio.to_thread(self.briefing_store.get, video_id, language.value)
+                        if cached is not None:
+                            if not self.briefing_store.is_fresh(cached):
+                                self._schedule_refresh(video_id, language, cached, refresh_semaphore)
+                            emit_result(video_id, list(cached.items), "cache")
+                            return
+                    comments = await self._fetch_comments(video_id)
+
+                texts = self._select_comments(comments) if comments else []
+                if not texts:
+                    emit_result(video_id, [], "empty")
+                    return
+
+                cost = estimate_text_tokens(json.dumps(texts, ensure_ascii=False))
+                if pack and pack_tokens + cost > self.BATCH_PACK_TOKEN_BUDGET:
+                    flush()
+                pack.append((video_id, texts, comments))
+                pack_tokens += cost
+                if len(pack) >= self.BATCH_PACK_MAX_VIDEOS:
+                    flush()
+            except Exception as e:
+                emit(self._batch_error(video_id, e))
+
+        prepare_tasks = [asyncio.create_task(prepare(video_id)) for video_id in video_ids]
+        try:
+            await asyncio.gather(*prepare_tasks)
+            flush()
+            await asyncio.gather(*generate_tasks)
+        finally:
+            for task in prepare_tasks + generate_tasks:
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from prometheus_client import Counter
+
+from app.local_store import connect_sqlite
+
+BRIEFING_CACHE = Counter(
+    "briefing_cache_total",
+    "저장된 브리핑 조회 결과 (fresh, stale, miss)",
+    ["outcome"],
+)
+
+
+@dataclass(frozen=True)
+class StoredBriefing:
+    items: List[str]
+    # 브리핑에 반영된 가장 최신 댓글 (증분 갱신 기준점)
+    watermark_id: str
+    watermark_published_at: str
+    updated_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.updated_at
+
+
+class BriefingStore:
+    """(video_id, language)별 마지막 브리핑과 댓글 워터마크를 로컬 SQLite에 저장합니다 (워커 간 공유).
+
+    - fresh_seconds 이내의 브리핑은 그대로 반환하고, 그 이후에는 반환과 동시에 백그라운드 갱신 대상이 됩니다.
+    - max_age_seconds가 지난 브리핑은 없는 것으로 취급합니다.
+    - 갱신 리스(refresh_lease_until)로 여러 워커가 같은 브리핑을 동시에 갱신하지 않도록 합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        enabled: bool = True,
+        fresh_seconds: float = 600.0,
+        max_age_seconds: float = 7 * 24 * 3600.0,
+        refresh_lease_seconds: float = 120.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.refresh_lease_seconds = refresh_lease_seconds
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS briefings (
+                video_id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                items_json TEXT NOT NULL,
+                watermark_id TEXT NOT NULL,
+                watermark_published_at TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                refresh_lease_until REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (video_id, language)
+            )
+            """
+        )
+
+    def get(self, video_id: str, language: str) -> Optional[StoredBriefing]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items_json, watermark_id, watermark_published_at, updated_at "
+                "FROM briefings WHERE video_id = ? AND language = ?",
+                (video_id, language),
+            ).fetchone()
+
+        if row is None or time.time() - row[3] > self.max_age_seconds:
+            BRIEFING_CACHE.labels(outcome="miss").inc()
+            return None
+        entry = StoredBriefing(json.loads(row[0]), row[1], row[2], row[3])
+        BRIEFING_CACHE.labels(outcome="fresh" if self.is_fresh(entry) else "stale").inc()
+        return entry
+
+    def is_fresh(self, entry: StoredBriefing) -> bool:
+        return entry.age_seconds < self.fresh_seconds
+
+    def put(
+        self,
+        video_id: str,
+        language: str,
+        *,
+        items: List[str],
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO briefings "
+                "(video_id, language, items_json, watermark_id, watermark_published_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (video_id, language) DO UPDATE SET "
+                "items_json = excluded.items_json, watermark_id = excluded.watermark_id, "
+                "watermark_published_at = excluded.watermark_published_at, updated_at = excluded.updated_at",
+                (video_id, language, json.dumps(items, ensure_ascii=False), watermark_id, watermark_published_at, time.time()),
+            )
+
+    def touch(self, video_id: str, language: str) -> None:
+        """새 댓글이 없을 때 브리핑은 그대로 두고 갱신 시각만 올립니다."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE briefings SET updated_at = ? WHERE video_id = ? AND language = ?",
+                (time.time(), video_id, language),
+            )
+
+    def claim_refresh(self, video_id: str, language: str) -> bool:
+        """갱신 리스를 얻으면 True. 다른 워커가 갱신 중이면 False."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE briefings SET refresh_lease_until = ? "
+                "WHERE video_id = ? AND language = ? AND refresh_lease_until <= ?",
+                (now + self.refresh_lease_seconds, video_id, language, now),
+            )
+        return cursor.rowcount == 1
+
+    def release_refresh(self, video_id: str, language: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE briefings SET refresh_lease_until = 0 WHERE video_id = ? AND language = ?",
+                (video_id, language),
+            )
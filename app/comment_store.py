@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter
+
+from app.youtube import YouTubeClient
+
+COMMENT_STORE_REQUESTS = Counter(
+    "comment_store_requests_total",
+    "영상별 댓글 저장소 조회 결과 (hit, top_up, fetch)",
+    ["outcome"],
+)
+COMMENT_STORE_PAGES = Counter(
+    "comment_store_pages_fetched_total",
+    "댓글 저장소가 YouTube에서 가져온 commentThreads 페이지 수 (kind=initial, older, top_up, since)",
+    ["kind"],
+)
+
+
+@dataclass(frozen=True)
+class StoredComment:
+    id: str
+    text: str
+    text_original: str
+    author_channel_id: Optional[str]
+    published_at: str
+    like_count: int = 0
+    reply_count: int = 0
+
+
+@dataclass
+class CommentSnapshot:
+    comments: List[StoredComment]
+    # 더 가져올 페이지가 없어 영상의 모든 최상위 댓글을 가진 상태인지 여부
+    exhausted: bool
+
+
+@dataclass
+class _VideoComments:
+    created_at: float
+    refreshed_at: float
+    comments: List[StoredComment] = field(default_factory=list)
+    ids: Set[str] = field(default_factory=set)
+    cursor: Optional[str] = None
+    started: bool = False
+    exhausted: bool = False
+
+
+class CommentStore:
+    """video_id별 최상위 댓글(최신순) 저장소. 브리핑과 메타 추출이 같은 페이지를 공유합니다.
+
+    - 처음 요청 시 필요한 개수만큼 최신순으로 페이지를 가져오고, 이후 요청은 더 오래된 페이지만 이어서 가져옵니다.
+    - refresh_seconds가 지난 뒤에는 이미 가진 댓글 id가 나올 때까지 최신 페이지만 다시 읽어 앞에 붙입니다 (top-up).
+    - ttl_seconds가 지나면 항목을 버리고 처음부터 다시 수집합니다.
+    """
+
+    PAGE_SIZE = 100
+    MAX_TOP_UP_PAGES = 3
+    MAX_SINCE_PAGES = 3
+
+    def __init__(
+        self,
+        *,
+        youtube: YouTubeClient,
+        ttl_seconds: float = 1800.0,
+        refresh_seconds: float = 60.0,
+        max_videos: int = 512,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.youtube = youtube
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self.max_videos = max_videos
+        self._lock = threading.Lock()
+        self._video_locks: Dict[str, threading.Lock] = {}
+        self._async_video_locks: Dict[str, asyncio.Lock] = {}
+        self._entries: "OrderedDict[str, _VideoComments]" = OrderedDict()
+
+    @staticmethod
+    def _parse_items(items: List[dict]) -> List[StoredComment]:
+        parsed: List[StoredComment] = []
+        for item in items:
+            try:
+                thread = item["snippet"]
+                top = thread["topLevelComment"]
+                sn = top["snippet"]
+            except KeyError:
+                continue
+            parsed.append(
+                StoredComment(
+                    id=top.get("id") or "",
+                    text=sn.get("textDisplay") or "",
+                    text_original=sn.get("textOriginal") or "",
+                    author_channel_id=(sn.get("authorChannelId") or {}).get("value"),
+                    published_at=sn.get("publishedAt") or "",
+                    like_count=int(sn.get("likeCount") or 0),
+                    reply_count=int(thread.get("totalReplyCount") or 0),
+                )
+            )
+        return parsed
+
+    def _page_kwargs(self, page_token: Optional[str], kind: str) -> dict:
+        COMMENT_STORE_PAGES.labels(kind=kind).inc()
+        return dict(
+            order="time",
+            max_results=self.PAGE_SIZE,
+            page_token=page_token,
+            # top-up/since는 새 댓글을 찾는 조회이므로 캐시된 응답도 ETag로 재검증
+            ttl_seconds=0 if kind in ("top_up", "since") else None,
+        )
+
+    def _fetch_page(self, video_id: str, page_token: Optional[str], kind: str) -> dict:
+        return self.youtube.get_comment_threads_page(video_id, **self._page_kwargs(page_token, kind))
+
+    async def _fetch_page_async(self, video_id: str, page_token: Optional[str], kind: str) -> dict:
+        return await self.youtube.get_comment_threads_page_async(video_id, **self._page_kwargs(page_token, kind))
+
+    @staticmethod
+    def _extend_kind(entry: _VideoComments) -> str:
+        return "older" if entry.started else "initial"
+
+    def _absorb_older(self, entry: _VideoComments, data: dict) -> None:
+        entry.started = True
+        for comment in self._parse_items(data.get("items", [])):
+            if comment.id and comment.id not in entry.ids:
+                entry.ids.add(comment.id)
+                entry.comments.append(comment)
+        entry.cursor = data.get("nextPageToken")
+        if not entry.cursor:
+            entry.exhausted = True
+
+    def _absorb_top_up(self, entry: _VideoComments, fresh: List[StoredComment], data: dict) -> bool:
+        """top-up 페이지를 반영합니다. 이미 가진 댓글에 도달했거나 마지막 페이지면 True를 반환합니다."""
+        for comment in self._parse_items(data.get("items", [])):
+            if comment.id in entry.ids:
+                entry.comments[:0] = [c for c in fresh if c.id not in entry.ids]
+                entry.ids.update(c.id for c in fresh)
+                return True
+            fresh.append(comment)
+        if not data.get("nextPageToken"):
+            # 처음부터 끝까지 읽었으므로 새로 읽은 내용으로 교체
+            entry.comments = list(fresh)
+            entry.ids = {c.id for c in fresh}
+            entry.cursor = None
+            entry.exhausted = True
+            return True
+        return False
+
+    @staticmethod
+    def _absorb_since(
+        newer: List[StoredComment],
+        data: dict,
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> bool:
+        """워터마크 이후 댓글을 newer에 모읍니다. 워터마크(또는 그보다 오래된 댓글)에 도달하면 True를 반환합니다."""
+        for comment in CommentStore._parse_items(data.get("items", [])):
+            # 워터마크 댓글이 삭제된 경우 게시 시각으로 판단
+            if comment.id == watermark_id or (
+                comment.published_at and comment.published_at <= watermark_published_at
+            ):
+                return True
+            newer.append(comment)
+        return not data.get("nextPageToken")
+
+    def since(
+        self,
+        video_id: str,
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> Optional[List[StoredComment]]:
+        """워터마크 이후의 최상위 댓글만 최신순으로 읽습니다 (저장소 항목은 바꾸지 않음).
+
+        MAX_SINCE_PAGES 안에 워터마크에 닿지 않으면 None을 반환하므로 호출자가 전체 수집으로 대체합니다.
+        """
+        newer: List[StoredComment] = []
+        page_token = None
+        for _ in range(self.MAX_SINCE_PAGES):
+            data = self._fetch_page(video_id, page_token, "since")
+            if self._absorb_since(newer, data, watermark_id, watermark_published_at):
+                return newer
+            page_token = data.get("nextPageToken")
+        return None
+
+    async def since_async(
+        self,
+        video_id: str,
+        watermark_id: str,
+        watermark_published_at: str,
+    ) -> Optional[List[StoredComment]]:
+        """since()의 asyncio 버전"""
+        newer: List[StoredComment] = []
+        page_token = None
+        for _ in range(self.MAX_SINCE_PAGES):
+            data = await self._fetch_page_async(video_id, page_token, "since")
+            if self._absorb_since(newer, data, watermark_id, watermark_published_at):
+                return newer
+            page_token = data.get("nextPageToken")
+        return None
+
+    def _video_lock(self, video_id: str) -> threading.Lock:
+        with self._lock:
+            return self._video_locks.setdefault(video_id, threading.Lock())
+
+    def _video_lock_async(self, video_id: str) -> asyncio.Lock:
+        with self._lock:
+            return self._async_video_locks.setdefault(video_id, asyncio.Lock())
+
+    def _begin(self, video_id: str) -> Tuple[_VideoComments, str]:
+        """저장된 항목과 이번 조회에서 해야 할 일(hit, top_up, fetch)을 결정합니다."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is not None:
+                self._entries.move_to_end(video_id)
+
+        if entry is None or now - entry.created_at > self.ttl_seconds:
+            entry = _VideoComments(created_at=now, refreshed_at=now)
+            # 수집 도중 타임아웃/취소되어도 이미 받은 페이지는 peek()으로 사용할 수 있도록 바로 등록
+            with self._lock:
+                self._entries[video_id] = entry
+            return entry, "fetch"
+        if entry.started and now - entry.refreshed_at > self.refresh_seconds:
+            return entry, "top_up"
+        return entry, "hit"
+
+    def _finish(self, video_id: str, entry: _VideoComments, outcome: str) -> CommentSnapshot:
+        COMMENT_STORE_REQUESTS.labels(outcome=outcome).inc()
+        with self._lock:
+            self._entries[video_id] = entry
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self.max_videos:
+                evicted, _ = self._entries.popitem(last=False)
+                self._video_locks.pop(evicted, None)
+                self._async_video_locks.pop(evicted, None)
+        return CommentSnapshot(comments=list(entry.comments), exhausted=entry.exhausted)
+
+    def peek(self, video_id: str) -> Optional[CommentSnapshot]:
+        """네트워크 호출 없이 지금까지 수집된 댓글을 반환합니다 (수집 중인 항목 포함, 만료된 항목 제외)."""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None or time.monotonic() - entry.created_at > self.ttl_seconds:
+                return None
+            return CommentSnapshot(comments=list(entry.comments), exhausted=entry.exhausted)
+
+    def get(self, video_id: str, min_count: int) -> CommentSnapshot:
+        """최신순 최상위 댓글을 최소 min_count개(영상에 그만큼 있으면) 반환합니다. 호출 스레드에서 동기로 동작합니다."""
+        with self._video_lock(video_id):
+            entry, outcome = self._begin(video_id)
+            if outcome == "top_up":
+                fresh: List[StoredComment] = []
+                page_token = None
+                for _ in range(self.MAX_TOP_UP_PAGES):
+                    data = self._fetch_page(video_id, page_token, "top_up")
+                    if self._absorb_top_up(entry, fresh, data):
+                        break
+                    page_token = data.get("nextPageToken")
+                else:
+                    # 새 댓글이 너무 많으면 처음부터 다시 수집
+                    entry, outcome = _VideoComments(created_at=time.monotonic(), refreshed_at=0.0), "fetch"
+                entry.refreshed_at = time.monotonic()
+
+            before = len(entry.comments)
+            while len(entry.comments) < min_count and not entry.exhausted:
+                self._absorb_older(entry, self._fetch_page(video_id, entry.cursor, self._extend_kind(entry)))
+            if outcome == "hit" and len(entry.comments) > before:
+                outcome = "fetch"
+            return self._finish(video_id, entry, outcome)
+
+    async def get_async(self, video_id: str, min_count: int) -> CommentSnapshot:
+        """get()의 asyncio 버전. 스레드를 쓰지 않으며 취소 시 진행 중인 페이지 요청도 중단됩니다."""
+        async with self._video_lock_async(video_id):
+            entry, outcome = self._begin(video_id)
+            if outcome == "top_up":
+                fresh: List[StoredComment] = []
+                page_token = None
+                for _ in range(self.MAX_TOP_UP_PAGES):
+                    data = await self._fetch_page_async(video_id, page_token, "top_up")
+                    if self._absorb_top_up(entry, fresh, data):
+                        break
+                    page_token = data.get("nextPageToken")
+                else:
+                    entry, outcome = _VideoComments(created_at=time.monotonic(), refreshed_at=0.0), "fetch"
+                entry.refreshed_at = time.monotonic()
+
+            before = len(entry.comments)
+            while len(entry.comments) < min_count and not entry.exhausted:
+                data = await self._fetch_page_async(video_id, entry.cursor, self._extend_kind(entry))
+                self._absorb_older(entry, data)
+            if outcome == "hit" and len(entry.comments) > before:
+                outcome = "fetch"
+            return self._finish(video_id, entry, outcome)
@@ -9,23 +9,44 @@ from pathlib import Path
 from dependency_injector import containers, providers
 
 from app.briefing.client import BriefingClient
+from app.briefing.comment_filter import CommentFilter
+from app.briefing.comment_ranker import CommentRanker
 from app.briefing.generator import BriefingGenerator
 from app.briefing.service import BriefingService
+from app.briefing.store import BriefingStore
+from app.comment_store import CommentStore
+from app.gemini_invoker import GeminiInvoker, HedgePolicy, ModelHealthRegistry
+from app.gemini_rate_limiter import GeminiRateLimiter, parse_model_budgets
 from app.meta.client import MetaClient
+from app.result_cache import ResultCache
+from app.singleflight import SingleFlight
 from app.meta.extractor import MetaExtractor
 from app.meta.service import MetaService
 from app.step.generator import StepGenerator
 from app.step.service import StepService
 from app.scene.generator import SceneGenerator
 from app.scene.service import SceneService
+from app.recipe.service import RecipeService
 from app.verify.service import VerifyService
+from app.video_session import VideoSessionManager
+from app.youtube import YouTubeClient
 from app.verify.client import VerifyClient
+from app.verify.file_janitor import GeminiFileJanitor
+from app.verify.file_poller import FileActivationPoller
+from app.verify.file_registry import UploadedFileRegistry
 from app.verify.generator import VerifyGenerator
+from app.verify.precheck import MetadataPrecheck
 
 def _resolve_caption_upload_urls(raw_urls: str):
     return [url.strip() for url in (raw_urls or "").split(",") if url.strip()]
 
 
+def _parse_bool(raw) -> bool:
+    if isinstance(raw, bool):
+        return raw
+    return str(raw or "").strip().lower() in ("1", "true", "yes", "on")
+
+
 class Container(containers.DeclarativeContainer):
     """의존성 주입 컨테이너"""
 
@@ -37,6 +58,7 @@ class Container(containers.DeclarativeContainer):
             "app.briefing",
             "app.scene",
             "app.verify",
+            "app.recipe",
         ]
     )
     config = providers.Configuration()
@@ -49,6 +71,73 @@ class Container(containers.DeclarativeContainer):
         "GEMINI_FALLBACK_MODEL_ID",
         default="gemini-3-flash-preview",
     )
+    # thread: asyncio.to_thread + 동기 클라이언트 / async: client.aio 네이티브 호출
+    config.google.gemini.invoke_mode.from_env(
+        "GEMINI_INVOKE_MODE",
+        default="thread",
+    )
+    config.google.gemini.circuit_failure_threshold.from_env(
+        "GEMINI_CIRCUIT_FAILURE_THRESHOLD",
+        as_=int,
+        default=3,
+    )
+    config.google.gemini.circuit_cooldown_seconds.from_env(
+        "GEMINI_CIRCUIT_COOLDOWN_SECONDS",
+        as_=float,
+        default=30.0,
+    )
+    # 클라이언트 측 모델별 RPM/TPM 예산 (예: "gemini-2.5-pro=150:2000000,gemini-3-flash-preview=1000:4000000")
+    config.google.gemini.rate_limits.from_env("GEMINI_RATE_LIMITS", default="")
+    config.google.gemini.rate_limit_max_queue_seconds.from_env(
+        "GEMINI_RATE_LIMIT_MAX_QUEUE_SECONDS",
+        as_=float,
+        default=3.0,
+    )
+    # uvicorn 워커 간 공유 상태용 로컬 SQLite 파일
+    config.local_store.path.from_env(
+        "LOCAL_STORE_PATH",
+        default="/tmp/ai-recipe-summary/state.sqlite3",
+    )
+    # 생성 결과 캐시 (steps/meta/scenes, file_uri + 프롬프트 버전 기준)
+    config.result_cache.max_bytes.from_env("RESULT_CACHE_MAX_BYTES", as_=int, default=64 * 1024 * 1024)
+    config.result_cache.ttl_seconds.from_env("RESULT_CACHE_TTL_SECONDS", as_=float, default=3600.0)
+    # Hedging - primary 지연이 분위수를 넘으면 fallback 모델로 동시 요청 (generator별 opt-in)
+    config.hedge.step.enabled.from_env("STEP_HEDGE_ENABLED", as_=_parse_bool, default="false")
+    config.hedge.step.percentile.from_env("STEP_HEDGE_PERCENTILE", as_=float, default=0.95)
+    config.hedge.meta.enabled.from_env("META_HEDGE_ENABLED", as_=_parse_bool, default="false")
+    config.hedge.meta.percentile.from_env("META_HEDGE_PERCENTILE", as_=float, default=0.95)
+    # 영상 세션 - 같은 file_uri/모델의 후속 호출(meta/steps)이 Gemini cached content를 공유
+    config.video_session.enabled.from_env("VIDEO_SESSION_ENABLED", as_=_parse_bool, default="false")
+    config.video_session.ttl_seconds.from_env("VIDEO_SESSION_TTL_SECONDS", as_=int, default=900)
+    # Gemini 업로드 파일 정리 - 정리 요청이 오지 않은 파일을 주기적으로 회수
+    config.gemini_files.max_age_seconds.from_env("GEMINI_FILE_MAX_AGE_SECONDS", as_=float, default=6 * 3600)
+    config.gemini_files.sweep_interval_seconds.from_env("GEMINI_FILE_SWEEP_INTERVAL_SECONDS", as_=float, default=600.0)
+    # 업로드 전 메타데이터(제목/설명/태그/카테고리) 키워드 사전 검증
+    config.verify.precheck_enabled.from_env("VERIFY_PRECHECK_ENABLED", as_=_parse_bool, default="true")
+    # 구간 검증 - 앞부분 + 샘플 구간만 먼저 검증하고 신뢰도가 낮을 때만 전체 영상으로 재검증
+    config.verify.clip_enabled.from_env("VERIFY_CLIP_ENABLED", as_=_parse_bool, default="false")
+    config.verify.clip_head_seconds.from_env("VERIFY_CLIP_HEAD_SECONDS", as_=int, default=60)
+    config.verify.clip_escalation_confidence.from_env("VERIFY_CLIP_ESCALATION_CONFIDENCE", as_=float, default=0.8)
+    # 검증 모델 캐스케이드 - 경량 모델 답의 신뢰도가 낮거나 모순되면 상위 모델로 재검증 (빈 값이면 비활성)
+    config.verify.cascade_model.from_env("VERIFY_CASCADE_MODEL", default="gemini-3-flash-preview")
+    config.verify.cascade_confidence.from_env("VERIFY_CASCADE_CONFIDENCE", as_=float, default=0.7)
+    # YouTube 응답 캐시 TTL
+    config.youtube.snippet_ttl_seconds.from_env("YOUTUBE_SNIPPET_TTL_SECONDS", as_=float, default=600.0)
+    config.youtube.comments_ttl_seconds.from_env("YOUTUBE_COMMENTS_TTL_SECONDS", as_=float, default=120.0)
+    # thread: requests 세션 + asyncio.to_thread / async: httpx.AsyncClient 네이티브 호출 (타임아웃 시 요청 취소)
+    config.youtube.invoke_mode.from_env("YOUTUBE_INVOKE_MODE", default="async")
+    config.briefing.comment_filter_enabled.from_env(
+        "BRIEFING_COMMENT_FILTER_ENABLED", as_=_parse_bool, default="true"
+    )
+    config.briefing.rank_enabled.from_env("BRIEFING_RANK_ENABLED", as_=_parse_bool, default="true")
+    config.briefing.comment_token_budget.from_env("BRIEFING_COMMENT_TOKEN_BUDGET", as_=int, default=3000)
+    config.briefing.map_reduce_enabled.from_env("BRIEFING_MAP_REDUCE_ENABLED", as_=_parse_bool, default="false")
+    config.briefing.map_reduce_max_comments.from_env("BRIEFING_MAP_REDUCE_MAX_COMMENTS", as_=int, default=2000)
+    config.briefing.map_concurrency.from_env("BRIEFING_MAP_CONCURRENCY", as_=int, default=4)
+    config.briefing.cache_enabled.from_env("BRIEFING_CACHE_ENABLED", as_=_parse_bool, default="true")
+    config.briefing.fresh_seconds.from_env("BRIEFING_FRESH_SECONDS", as_=float, default=600.0)
+    config.comment_store.ttl_seconds.from_env("COMMENT_STORE_TTL_SECONDS", as_=float, default=1800.0)
+    config.comment_store.refresh_seconds.from_env("COMMENT_STORE_REFRESH_SECONDS", as_=float, default=60.0)
     config.cloud_run.caption_urls.from_env(
         "CLOUD_RUN_CAPTION_URLS",
         default="",
@@ -61,15 +150,74 @@ class Container(containers.DeclarativeContainer):
         api_key=config.google.ai_api_key,
     )
 
+    # Gemini - 모델 상태(서킷 브레이커) 및 공용 호출기 (프로세스 단위 공유)
+    gemini_model_health = providers.Singleton(
+        ModelHealthRegistry,
+        failure_threshold=config.google.gemini.circuit_failure_threshold,
+        cooldown_seconds=config.google.gemini.circuit_cooldown_seconds,
+    )
+    gemini_rate_limiter = providers.Singleton(
+        GeminiRateLimiter,
+        path=config.local_store.path,
+        budgets=providers.Callable(parse_model_budgets, config.google.gemini.rate_limits),
+    )
+    gemini_invoker = providers.Singleton(
+        GeminiInvoker,
+        client=genai_client,
+        health=gemini_model_health,
+        limiter=gemini_rate_limiter,
+        max_queue_seconds=config.google.gemini.rate_limit_max_queue_seconds,
+    )
+
+    result_cache = providers.Singleton(
+        ResultCache,
+        max_bytes=config.result_cache.max_bytes,
+        ttl_seconds=config.result_cache.ttl_seconds,
+    )
+
+    # 동일 요청 병합 (워커 프로세스 단위, 진행 중인 요청만 공유)
+    singleflight = providers.Singleton(SingleFlight)
+
+    video_session = providers.Singleton(
+        VideoSessionManager,
+        client=genai_client,
+        path=config.local_store.path,
+        enabled=config.video_session.enabled,
+        ttl_seconds=config.video_session.ttl_seconds,
+    )
+
+    # YouTube Data API 공용 클라이언트 (연결 풀, 응답 캐시, ETag 재검증)
+    youtube_client = providers.Singleton(
+        YouTubeClient,
+        api_key=config.google.api_key,
+        timeout=20.0,
+        snippet_ttl_seconds=config.youtube.snippet_ttl_seconds,
+        comments_ttl_seconds=config.youtube.comments_ttl_seconds,
+    )
+    # 브리핑/메타가 공유하는 영상별 댓글 저장소 (증분 top-up)
+    comment_store = providers.Singleton(
+        CommentStore,
+        youtube=youtube_client,
+        ttl_seconds=config.comment_store.ttl_seconds,
+        refresh_seconds=config.comment_store.refresh_seconds,
+    )
+
     # Meta
+    meta_hedge_policy = providers.Singleton(
+        HedgePolicy,
+        name="meta_video",
+        enabled=config.hedge.meta.enabled,
+        percentile=config.hedge.meta.percentile,
+    )
     meta_client = providers.Singleton(
         MetaClient,
-        api_key=config.google.api_key,
-        timeout=20.0,
+        youtube=youtube_client,
+        comment_store=comment_store,
+        invoke_mode=config.youtube.invoke_mode,
     )
     meta_extractor = providers.Singleton(
         MetaExtractor,
-        client=genai_client,
+        invoker=gemini_invoker,
         model="gemini-2.5-pro",
         fallback_model="gemini-3.1-pro-preview",
         secondary_fallback_model="gemini-3-flash-preview",
@@ -79,60 +227,107 @@ class Container(containers.DeclarativeContainer):
 
         video_extract_prompt_path=Path("app/meta/prompt/user/video_extract.md"),
         video_extract_tool_path=Path("app/meta/prompt/tool/video_meta.json"),
+        invoke_mode=config.google.gemini.invoke_mode,
+        hedge_policy=meta_hedge_policy,
+        result_cache=result_cache,
+        video_session=video_session,
     )
     meta_service = providers.Factory(
         MetaService,
         extractor=meta_extractor,
         client=meta_client,
+        singleflight=singleflight,
     )
 
     # Summary
+    step_hedge_policy = providers.Singleton(
+        HedgePolicy,
+        name="step_video",
+        enabled=config.hedge.step.enabled,
+        percentile=config.hedge.step.percentile,
+    )
     step_generator = providers.Singleton(
         StepGenerator,
-        client=genai_client,
+        invoker=gemini_invoker,
         model="gemini-2.5-pro",
         fallback_model="gemini-3.1-pro-preview",
         secondary_fallback_model="gemini-3-flash-preview",
         video_step_tool_path=Path("app/step/prompt/tool/video_step.json"),
         video_summarize_user_prompt_path=Path("app/step/prompt/user/video_summarize.md"),
+        invoke_mode=config.google.gemini.invoke_mode,
+        hedge_policy=step_hedge_policy,
+        result_cache=result_cache,
+        video_session=video_session,
     )
     step_service = providers.Factory(
         StepService,
         generator=step_generator,
+        singleflight=singleflight,
     )
 
     # Briefing
     briefing_client = providers.Singleton(
         BriefingClient,
-        api_key=config.google.api_key,
-        timeout=20.0,
+        comment_store=comment_store,
+        invoke_mode=config.youtube.invoke_mode,
     )
     briefing_generator = providers.Singleton(
         BriefingGenerator,
-        client=genai_client,
+        invoker=gemini_invoker,
         model="gemini-3.1-flash-lite-preview",
         fallback_model="gemini-2.5-flash-lite",
         generate_user_prompt_path=Path("app/briefing/prompt/generator/user_prompt.md"),
         generate_tool_path=Path("app/briefing/prompt/generator/emit_briefing.json"),
+        update_user_prompt_path=Path("app/briefing/prompt/generator/update_prompt.md"),
+        batch_user_prompt_path=Path("app/briefing/prompt/generator/batch_prompt.md"),
+        batch_tool_path=Path("app/briefing/prompt/generator/emit_briefings_batch.json"),
+        invoke_mode=config.google.gemini.invoke_mode,
+    )
+    briefing_comment_filter = providers.Singleton(
+        CommentFilter,
+        enabled=config.briefing.comment_filter_enabled,
+    )
+    briefing_comment_ranker = providers.Singleton(
+        CommentRanker,
+        enabled=config.briefing.rank_enabled,
+        token_budget=config.briefing.comment_token_budget,
+        max_comments=BriefingService.MAX_COMMENTS_FOR_GENERATION,
+    )
+    briefing_store = providers.Singleton(
+        BriefingStore,
+        path=config.local_store.path,
+        enabled=config.briefing.cache_enabled,
+        fresh_seconds=config.briefing.fresh_seconds,
     )
     briefing_service = providers.Factory(
         BriefingService,
         client=briefing_client,
         generator=briefing_generator,
+        singleflight=singleflight,
+        comment_filter=briefing_comment_filter,
+        comment_ranker=briefing_comment_ranker,
+        map_reduce_enabled=config.briefing.map_reduce_enabled,
+        map_reduce_max_comments=config.briefing.map_reduce_max_comments,
+        map_concurrency=config.briefing.map_concurrency,
+        briefing_store=briefing_store,
     )
 
     # Scene
     scene_generator = providers.Singleton(
         SceneGenerator,
-        client=genai_client,
+        invoker=gemini_invoker,
         model="gemini-3-flash-preview",
         fallback_model="gemini-2.5-flash-lite",
         video_scene_tool_path=Path("app/scene/prompt/tool/video_scene.json"),
         video_scene_user_prompt_path=Path("app/scene/prompt/user/video_scene.md"),
+        invoke_mode=config.google.gemini.invoke_mode,
+        result_cache=result_cache,
+        video_session=video_session,
     )
     scene_service = providers.Factory(
         SceneService,
         generator=scene_generator,
+        singleflight=singleflight,
     )
 
     # Verify
@@ -147,11 +342,45 @@ class Container(containers.DeclarativeContainer):
 
     verify_generator = providers.Singleton(
         VerifyGenerator,
-        client=genai_client,
+        invoker=gemini_invoker,
         model="gemini-3.1-flash-lite-preview",
         fallback_model="gemini-2.5-flash-lite",
         verify_user_prompt_path=Path("app/verify/prompt/user/verify.md"),
         verify_tool_path=Path("app/verify/prompt/tool/verify.json"),
+        invoke_mode=config.google.gemini.invoke_mode,
+        clip_enabled=config.verify.clip_enabled,
+        clip_head_seconds=config.verify.clip_head_seconds,
+        clip_escalation_confidence=config.verify.clip_escalation_confidence,
+        cascade_model=config.verify.cascade_model,
+        cascade_confidence=config.verify.cascade_confidence,
+    )
+
+    # 업로드 파일 ACTIVE 대기 (프로세스 공용 폴러)
+    verify_file_poller = providers.Singleton(
+        FileActivationPoller,
+        client=genai_client,
+    )
+
+    # 검증된 video_id → 업로드 파일 매핑 (워커 간 공유)
+    verify_file_registry = providers.Singleton(
+        UploadedFileRegistry,
+        path=config.local_store.path,
+    )
+
+    # 백그라운드 파일 삭제 큐 + 오래된 파일 스윕
+    gemini_file_janitor = providers.Singleton(
+        GeminiFileJanitor,
+        client=genai_client,
+        file_registry=verify_file_registry,
+        path=config.local_store.path,
+        video_session=video_session,
+        max_age_seconds=config.gemini_files.max_age_seconds,
+        sweep_interval_seconds=config.gemini_files.sweep_interval_seconds,
+    )
+
+    verify_precheck = providers.Singleton(
+        MetadataPrecheck,
+        enabled=config.verify.precheck_enabled,
     )
 
     verify_service = providers.Factory(
@@ -159,6 +388,22 @@ class Container(containers.DeclarativeContainer):
         client=verify_client,
         generator=verify_generator,
         genai_client=genai_client, # genai_client 주입 추가
+        file_poller=verify_file_poller,
+        file_registry=verify_file_registry,
+        file_janitor=gemini_file_janitor,
+        metadata_client=meta_client,
+        precheck=verify_precheck,
+        video_session=video_session,
+        singleflight=singleflight,
+    )
+
+    # Recipe (verify → meta ‖ steps → scenes → cleanup 파이프라인)
+    recipe_service = providers.Factory(
+        RecipeService,
+        verify_service=verify_service,
+        meta_service=meta_service,
+        step_service=step_service,
+        scene_service=scene_service,
     )
 
 
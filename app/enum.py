@@ -4,3 +4,8 @@ from enum import Enum
 class LanguageType(str, Enum):
     KR = "Korean"
     EN = "English"
+
+
+class InvokeMode(str, Enum):
+    THREAD = "thread"
+    ASYNC = "async"
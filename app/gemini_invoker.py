@@ -0,0 +1,615 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+from prometheus_client import Counter, Gauge
+
+from app.gemini_rate_limiter import GeminiRateLimiter
+from app.token_estimate import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+GEMINI_CIRCUIT_STATE = Gauge(
+    "gemini_model_circuit_state",
+    "Gemini 모델별 서킷 상태 (0=closed, 1=half_open, 2=open)",
+    ["model"],
+)
+GEMINI_CIRCUIT_TRIPS = Counter(
+    "gemini_model_circuit_trips_total",
+    "Gemini 모델별 서킷 차단 횟수",
+    ["model"],
+)
+GEMINI_MODEL_CALLS = Counter(
+    "gemini_model_calls_total",
+    "Gemini 모델별 호출 결과 (success, rate_limited, server_error, client_error, skipped)",
+    ["model", "outcome"],
+)
+GEMINI_HEDGE_FIRED = Counter(
+    "gemini_hedge_fired_total",
+    "헤지 요청(fallback 모델 동시 호출) 발사 횟수",
+    ["name", "model"],
+)
+GEMINI_HEDGE_WON = Counter(
+    "gemini_hedge_won_total",
+    "헤지 요청이 진행 중인 primary보다 먼저 유효한 응답을 반환한 횟수",
+    ["name", "model"],
+)
+GEMINI_HEDGE_RESCUED = Counter(
+    "gemini_hedge_rescued_total",
+    "primary가 실패한 뒤 헤지 요청의 응답으로 대체한 횟수",
+    ["name", "model"],
+)
+
+
+def is_rate_limit_error(err: Exception) -> bool:
+    status_code = getattr(err, "status_code", None)
+    if status_code == 429:
+        return True
+
+    code = getattr(err, "code", None)
+    if code == 429:
+        return True
+
+    message = str(err).lower()
+    return (
+        "429" in message
+        or "too many requests" in message
+        or "rate limit" in message
+        or "resource_exhausted" in message
+    )
+
+
+def is_server_error(err: Exception) -> bool:
+    code = getattr(err, "code", None)
+    return isinstance(code, int) and 500 <= code < 600
+
+
+def is_retryable_error(err: Exception) -> bool:
+    return isinstance(err, (genai_errors.ClientError, genai_errors.ServerError)) and (
+        is_rate_limit_error(err) or is_server_error(err)
+    )
+
+
+_RETRY_DELAY_PATTERN = re.compile(r"retry(?:Delay|[ _-]?in)\W*(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+
+def parse_retry_after(err: Exception) -> Optional[float]:
+    """Retry-After 헤더 또는 google.rpc.RetryInfo(retryDelay)에서 대기 시간(초)을 추출합니다."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        try:
+            raw = headers.get("retry-after") or headers.get("Retry-After")
+            if raw is not None:
+                return max(0.0, float(raw))
+        except (TypeError, ValueError):
+            pass
+
+    for source in (getattr(err, "details", None), str(err)):
+        if not source:
+            continue
+        match = _RETRY_DELAY_PATTERN.search(str(source))
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+_STATE_GAUGE_VALUE = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+
+@dataclass
+class _ModelHealth:
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    consecutive_trips: int = 0
+    open_until: float = 0.0
+    probe_in_flight: bool = False
+    last_error: Optional[str] = None
+
+
+class ModelHealthRegistry:
+    """프로세스 전역 Gemini 모델 상태(서킷 브레이커)를 관리합니다.
+
+    - 429는 즉시, 5xx는 연속 failure_threshold회 실패 시 서킷을 엽니다.
+    - OPEN 동안은 해당 모델을 건너뛰고, 쿨다운(Retry-After 우선) 이후 한 건만 half-open 프로브를 허용합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        max_cooldown_seconds: float = 300.0,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._lock = threading.Lock()
+        self._models: Dict[str, _ModelHealth] = {}
+
+    def _get(self, model: str) -> _ModelHealth:
+        health = self._models.get(model)
+        if health is None:
+            health = self._models[model] = _ModelHealth()
+            GEMINI_CIRCUIT_STATE.labels(model=model).set(_STATE_GAUGE_VALUE[health.state])
+        return health
+
+    @staticmethod
+    def _set_state(model: str, health: _ModelHealth, state: CircuitState) -> None:
+        health.state = state
+        GEMINI_CIRCUIT_STATE.labels(model=model).set(_STATE_GAUGE_VALUE[state])
+
+    def allow(self, model: str) -> bool:
+        with self._lock:
+            health = self._get(model)
+            if health.state == CircuitState.CLOSED:
+                return True
+            if health.state == CircuitState.OPEN:
+                if time.monotonic() < health.open_until:
+                    return False
+                self._set_state(model, health, CircuitState.HALF_OPEN)
+            if health.probe_in_flight:
+                return False
+            health.probe_in_flight = True
+            return True
+
+    def seconds_until_available(self, model: str) -> float:
+        with self._lock:
+            health = self._get(model)
+            if health.state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, health.open_until - time.monotonic())
+
+    def record_success(self, model: str) -> None:
+        with self._lock:
+            health = self._get(model)
+            if health.state != CircuitState.CLOSED:
+                logger.info(f"[GeminiInvoker] ▶ 모델 서킷 복구 | model={model}")
+            health.consecutive_failures = 0
+            health.consecutive_trips = 0
+            health.probe_in_flight = False
+            self._set_state(model, health, CircuitState.CLOSED)
+
+    def record_failure(self, model: str, *, rate_limited: bool, retry_after: Optional[float] = None, error: str = "") -> None:
+        with self._lock:
+            health = self._get(model)
+            health.consecutive_failures += 1
+            health.last_error = error[:200]
+            was_probe = health.state == CircuitState.HALF_OPEN
+            health.probe_in_flight = False
+            if not (rate_limited or was_probe or health.consecutive_failures >= self.failure_threshold):
+                return
+
+            health.consecutive_trips += 1
+            if retry_after is not None:
+                cooldown = retry_after
+            else:
+                cooldown = self.cooldown_seconds * (2 ** min(health.consecutive_trips - 1, 10))
+            cooldown = min(self.max_cooldown_seconds, cooldown)
+            health.open_until = time.monotonic() + cooldown
+            self._set_state(model, health, CircuitState.OPEN)
+            GEMINI_CIRCUIT_TRIPS.labels(model=model).inc()
+            logger.warning(
+                f"[GeminiInvoker] ▶ 모델 서킷 OPEN | model={model} | cooldown={cooldown:.1f}s | error={health.last_error}"
+            )
+
+    def release_probe(self, model: str) -> None:
+        """half-open 프로브가 성공/실패 판정 없이 끝났을 때(비재시도 오류 등) 다음 프로브를 허용합니다."""
+        with self._lock:
+            self._get(model).probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                model: {
+                    "state": health.state.value,
+                    "consecutive_failures": health.consecutive_failures,
+                    "cooldown_remaining_seconds": max(0.0, health.open_until - now)
+                    if health.state == CircuitState.OPEN
+                    else 0.0,
+                    "last_error": health.last_error,
+                }
+                for model, health in self._models.items()
+            }
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    model: str
+    config: types.GenerateContentConfig
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """primary가 지연 분위수(percentile) 안에 응답하지 않으면 fallback 모델로 같은 요청을 한 번 더 보냅니다."""
+
+    name: str = ""
+    enabled: bool = False
+    percentile: float = 0.95
+    min_samples: int = 20
+    initial_delay_seconds: float = 90.0
+    min_delay_seconds: float = 5.0
+
+
+class LatencyTracker:
+    """이름별 최근 응답 지연 시간 윈도우를 유지하고 분위수를 계산합니다."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, q: float, *, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key) or ())
+        if len(samples) < max(1, min_samples):
+            return None
+        idx = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[idx]
+
+
+class _RoutePlan:
+    """한 번의 invoke 호출에서 시도할 route 후보와 진행 상태"""
+
+    def __init__(self, candidates: List[ModelRoute], estimated_tokens: int):
+        self.candidates = candidates
+        self.estimated_tokens = estimated_tokens
+        self.index = 0
+        self.attempted = False
+        self.queued_seconds = 0.0
+
+
+class GeminiInvoker:
+    """모든 Generator가 공유하는 Gemini 호출기 (429/5xx fallback 체인 + 모델 상태 추적 + 클라이언트 측 rate limit)"""
+
+    def __init__(
+        self,
+        *,
+        client: genai.Client,
+        health: ModelHealthRegistry,
+        limiter: Optional[GeminiRateLimiter] = None,
+        max_queue_seconds: float = 3.0,
+        hedge_max_workers: int = 16,
+    ):
+        self.client = client
+        self.health = health
+        self.limiter = limiter
+        self.max_queue_seconds = max_queue_seconds
+        self.latency = LatencyTracker()
+        self._hedge_executor = futures.ThreadPoolExecutor(
+            max_workers=hedge_max_workers,
+            thread_name_prefix="gemini-hedge",
+        )
+
+    @staticmethod
+    def _dedupe_routes(routes: Sequence[ModelRoute]) -> List[ModelRoute]:
+        out: List[ModelRoute] = []
+        seen: set[str] = set()
+        for route in routes:
+            if not route.model or route.model in seen:
+                continue
+            seen.add(route.model)
+            out.append(route)
+        return out
+
+    def _plan(self, routes: Sequence[ModelRoute], contents: Any) -> _RoutePlan:
+        candidates = self._dedupe_routes(routes)
+        if not candidates:
+            raise ValueError("Gemini model route is empty")
+        return _RoutePlan(candidates, estimate_tokens(contents) if self.limiter else 0)
+
+    def _next_route(self, plan: _RoutePlan) -> Tuple[Optional[ModelRoute], float]:
+        """다음에 시도할 route를 고릅니다.
+
+        - 서킷이 열렸거나 로컬 예산(RPM/TPM)이 없는 모델은 건너뛰고 여유가 있는 다음 모델로 보냅니다.
+        - 모든 후보가 예산 부족이면 (None, 대기초)를 반환해 max_queue_seconds 안에서 잠시 대기하게 합니다.
+        - 한 번도 시도하지 못했다면 마지막 수단으로 한 모델은 반드시 시도합니다.
+        - 더 시도할 route가 없으면 (None, 0)을 반환합니다.
+
+        allow()가 half-open 프로브 슬롯을 점유하므로 실제로 시도할 직전에만 평가합니다.
+        """
+        min_wait: Optional[float] = None
+        throttled: Optional[ModelRoute] = None
+        for offset, route in enumerate(plan.candidates[plan.index:]):
+            if not self.health.allow(route.model):
+                GEMINI_MODEL_CALLS.labels(model=route.model, outcome="skipped").inc()
+                continue
+
+            wait = self.limiter.try_acquire(route.model, plan.estimated_tokens) if self.limiter else 0.0
+            if wait > 0:
+                self.health.release_probe(route.model)
+                throttled = throttled or route
+                min_wait = wait if min_wait is None else min(min_wait, wait)
+                continue
+
+            primary = plan.candidates[0].model
+            if plan.attempted:
+                logger.warning(f"Gemini model unavailable. fallback model={route.model}")
+            elif route.model != primary:
+                logger.warning(f"[GeminiInvoker] ▶ 서킷 OPEN/예산 부족 모델 우회 | primary={primary} | route={route.model}")
+            plan.index += offset + 1
+            plan.attempted = True
+            return route, 0.0
+
+        if min_wait is not None and plan.queued_seconds + min_wait <= self.max_queue_seconds:
+            plan.queued_seconds += min_wait
+            return None, min_wait
+
+        if plan.attempted:
+            return None, 0.0
+
+        plan.attempted = True
+        plan.index = len(plan.candidates)
+        if throttled is not None:
+            logger.warning(f"[GeminiInvoker] ▶ 로컬 예산 대기 한도 초과, 강제 시도 | model={throttled.model}")
+            return throttled, 0.0
+        forced = min(plan.candidates, key=lambda r: self.health.seconds_until_available(r.model))
+        logger.warning(f"[GeminiInvoker] ▶ 모든 모델 서킷 OPEN, 강제 시도 | model={forced.model}")
+        return forced, 0.0
+
+    async def _next_route_async(self, plan: _RoutePlan) -> Tuple[Optional[ModelRoute], float]:
+        """_next_route의 asyncio 버전. 로컬 예산 확인은 SQLite 트랜잭션(busy 대기 포함)이므로 이벤트 루프 밖에서 실행합니다."""
+        if self.limiter is None:
+            return self._next_route(plan)
+
+        pending = asyncio.ensure_future(asyncio.to_thread(self._next_route, plan))
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # 취소되어도 스레드의 선택은 끝까지 진행되므로 점유한 half-open 프로브 슬롯을 반납
+            def _release(done: "asyncio.Future[Tuple[Optional[ModelRoute], float]]") -> None:
+                if not done.cancelled() and done.exception() is None:
+                    route, _ = done.result()
+                    if route is not None:
+                        self.health.release_probe(route.model)
+
+            pending.add_done_callback(_release)
+            raise
+
+    def _on_success(self, route: ModelRoute, plan: _RoutePlan, response: Any) -> None:
+        self.health.record_success(route.model)
+        GEMINI_MODEL_CALLS.labels(model=route.model, outcome="success").inc()
+        if self.limiter:
+            usage = getattr(response, "usage_metadata", None)
+            self.limiter.settle(route.model, plan.estimated_tokens, getattr(usage, "total_token_count", None))
+
+    def _on_error(self, route: ModelRoute, err: Exception) -> bool:
+        """오류를 기록하고 다음 모델로 넘어갈 수 있으면 True를 반환합니다."""
+        if not is_retryable_error(err):
+            self.health.release_probe(route.model)
+            GEMINI_MODEL_CALLS.labels(model=route.model, outcome="client_error").inc()
+            return False
+
+        rate_limited = is_rate_limit_error(err)
+        self.health.record_failure(
+            route.model,
+            rate_limited=rate_limited,
+            retry_after=parse_retry_after(err),
+            error=str(err),
+        )
+        GEMINI_MODEL_CALLS.labels(
+            model=route.model,
+            outcome="rate_limited" if rate_limited else "server_error",
+        ).inc()
+        return True
+
+    def invoke(self, routes: Sequence[ModelRoute], contents: Any):
+        plan = self._plan(routes, contents)
+        last_error: Optional[Exception] = None
+        while True:
+            route, wait = self._next_route(plan)
+            if route is None:
+                if wait > 0:
+                    time.sleep(wait)
+                    continue
+                break
+            try:
+                response = self.client.models.generate_content(
+                    model=route.model,
+                    contents=contents,
+                    config=route.config,
+                )
+            except Exception as e:
+                if not self._on_error(route, e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                self.health.release_probe(route.model)
+                raise
+            self._on_success(route, plan, response)
+            return response
+
+        raise last_error
+
+    async def invoke_async(self, routes: Sequence[ModelRoute], contents: Any):
+        plan = self._plan(routes, contents)
+        last_error: Optional[Exception] = None
+        while True:
+            route, wait = await self._next_route_async(plan)
+            if route is None:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                break
+            try:
+                response = await self.client.aio.models.generate_content(
+                    model=route.model,
+                    contents=contents,
+                    config=route.config,
+                )
+            except Exception as e:
+                if not self._on_error(route, e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                # 취소(CancelledError) 시 half-open 프로브 슬롯을 반납
+                self.health.release_probe(route.model)
+                raise
+            if self.limiter is not None:
+                # 토큰 사용량 보정도 SQLite 쓰기이므로 이벤트 루프 밖에서 실행
+                await asyncio.to_thread(self._on_success, route, plan, response)
+            else:
+                self._on_success(route, plan, response)
+            return response
+
+        raise last_error
+
+    def _hedge_delay(self, policy: HedgePolicy) -> float:
+        observed = self.latency.percentile(policy.name, policy.percentile, min_samples=policy.min_samples)
+        delay = observed if observed is not None else policy.initial_delay_seconds
+        return max(policy.min_delay_seconds, delay)
+
+    @staticmethod
+    def _hedge_route(routes: Sequence[ModelRoute]) -> Optional[ModelRoute]:
+        primary = routes[0].model if routes else None
+        for route in routes[1:]:
+            if route.model and route.model != primary:
+                return route
+        return None
+
+    def invoke_hedged(
+        self,
+        routes: Sequence[ModelRoute],
+        contents: Any,
+        *,
+        policy: HedgePolicy,
+        parse: Callable[[Any], T],
+    ) -> T:
+        """스레드 모드 헤지 호출. primary/헤지를 모두 executor에서 실행하고 먼저 도착한 유효 응답(parse 성공)을 반환합니다.
+
+        헤지 대기 시간과 지연 기록은 primary 호출이 실제로 시작된 시점부터 잽니다 (executor 대기 시간 제외).
+        동기 SDK 호출은 중단할 수 없으므로 패자 호출은 결과만 버려집니다.
+        """
+        hedge_route = self._hedge_route(routes)
+        if not policy.enabled or hedge_route is None:
+            return parse(self.invoke(routes, contents))
+
+        started_at: List[float] = []
+        call_started = threading.Event()
+
+        def _primary() -> T:
+            started_at.append(time.monotonic())
+            call_started.set()
+            return parse(self.invoke(routes, contents))
+
+        primary = self._hedge_executor.submit(_primary)
+        call_started.wait()
+        started = started_at[0]
+
+        remaining = self._hedge_delay(policy) - (time.monotonic() - started)
+        done, _ = futures.wait({primary}, timeout=max(0.0, remaining))
+        if done and primary.exception() is None:
+            self.latency.record(policy.name, time.monotonic() - started)
+            return primary.result()
+        if done:
+            # 헤지 발사 전에 primary가 실패하면 그대로 전달
+            raise primary.exception()
+
+        GEMINI_HEDGE_FIRED.labels(name=policy.name, model=hedge_route.model).inc()
+        logger.info(f"[GeminiInvoker] ▶ 헤지 요청 발사 | name={policy.name} | model={hedge_route.model}")
+        hedge = self._hedge_executor.submit(lambda: parse(self.invoke([hedge_route], contents)))
+
+        pending = {primary, hedge}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for fut in done:
+                error = fut.exception()
+                if error is not None:
+                    if fut is primary or first_error is None:
+                        first_error = error
+                    continue
+                if fut is hedge:
+                    winner = GEMINI_HEDGE_WON if primary in pending else GEMINI_HEDGE_RESCUED
+                    winner.labels(name=policy.name, model=hedge_route.model).inc()
+                # hedge가 이긴 경우 primary 지연은 관측 하한값으로 기록
+                self.latency.record(policy.name, time.monotonic() - started)
+                for other in pending:
+                    other.cancel()
+                return fut.result()
+
+        raise first_error
+
+    async def invoke_hedged_async(
+        self,
+        routes: Sequence[ModelRoute],
+        contents: Any,
+        *,
+        policy: HedgePolicy,
+        parse: Callable[[Any], T],
+    ) -> T:
+        """asyncio 모드 헤지 호출. 먼저 도착한 유효 응답(parse 성공)을 반환하고 패자 태스크는 취소합니다."""
+        hedge_route = self._hedge_route(routes)
+        if not policy.enabled or hedge_route is None:
+            return parse(await self.invoke_async(routes, contents))
+
+        async def _call(call_routes: Sequence[ModelRoute]) -> T:
+            return parse(await self.invoke_async(call_routes, contents))
+
+        started = time.monotonic()
+        primary = asyncio.create_task(_call(routes))
+        pending: set = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self._hedge_delay(policy))
+            if done:
+                result = primary.result()
+                self.latency.record(policy.name, time.monotonic() - started)
+                return result
+
+            GEMINI_HEDGE_FIRED.labels(name=policy.name, model=hedge_route.model).inc()
+            logger.info(f"[GeminiInvoker] ▶ 헤지 요청 발사 | name={policy.name} | model={hedge_route.model}")
+            hedge = asyncio.create_task(_call([hedge_route]))
+            pending.add(hedge)
+
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        if task is primary or first_error is None:
+                            first_error = error
+                        continue
+                    if task is hedge:
+                        winner = GEMINI_HEDGE_WON if primary in pending else GEMINI_HEDGE_RESCUED
+                        winner.labels(name=policy.name, model=hedge_route.model).inc()
+                    # hedge가 이긴 경우 primary 지연은 관측 하한값으로 기록
+                    self.latency.record(policy.name, time.monotonic() - started)
+                    return task.result()
+
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from prometheus_client import Counter
+
+from app.local_store import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+GEMINI_LOCAL_RATE_LIMIT = Counter(
+    "gemini_local_rate_limit_total",
+    "클라이언트 측 토큰 버킷 판정 결과 (acquired, throttled)",
+    ["model", "outcome"],
+)
+
+
+@dataclass(frozen=True)
+class ModelBudget:
+    rpm: float
+    tpm: float
+
+
+def parse_model_budgets(raw: str) -> Dict[str, ModelBudget]:
+    """'gemini-2.5-pro=150:2000000,gemini-3-flash-preview=1000:4000000' 형식의 RPM:TPM 예산을 파싱합니다."""
+    budgets: Dict[str, ModelBudget] = {}
+    for entry in (raw or "").split(","):
+        entry = entry.strip()
+        if not entry or "=" not in entry:
+            continue
+        model, _, limits = entry.partition("=")
+        rpm, _, tpm = limits.partition(":")
+        try:
+            budgets[model.strip()] = ModelBudget(rpm=float(rpm), tpm=float(tpm or 0))
+        except ValueError:
+            logger.warning(f"[GeminiRateLimiter] ▶ 잘못된 예산 설정을 무시합니다. | entry={entry}")
+    return budgets
+
+
+class GeminiRateLimiter:
+    """모델별 RPM/TPM 토큰 버킷. 상태를 로컬 SQLite에 두어 같은 호스트의 uvicorn 워커들이 예산을 공유합니다.
+
+    예산이 설정되지 않은 모델은 제한하지 않습니다. tpm=0이면 토큰 예산은 검사하지 않습니다.
+    """
+
+    def __init__(self, *, path: str, budgets: Dict[str, ModelBudget]):
+        self.budgets = budgets
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path) if budgets else None
+        if self._conn is not None:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS gemini_rate_buckets (
+                    model TEXT PRIMARY KEY,
+                    requests REAL NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _refill(self, budget: ModelBudget, row: Optional[tuple], now: float) -> tuple[float, float]:
+        if row is None:
+            return budget.rpm, budget.tpm
+        requests, tokens, updated_at = row
+        elapsed = max(0.0, now - updated_at)
+        requests = min(budget.rpm, requests + elapsed * budget.rpm / 60.0)
+        tokens = min(budget.tpm, tokens + elapsed * budget.tpm / 60.0)
+        return requests, tokens
+
+    def try_acquire(self, model: str, tokens: int) -> float:
+        """예산이 있으면 차감 후 0을, 없으면 다음 여유가 생길 때까지의 대기 시간(초)을 반환합니다."""
+        budget = self.budgets.get(model)
+        if budget is None or self._conn is None:
+            return 0.0
+
+        # TPM보다 큰 단일 요청도 버킷이 가득 찼을 때는 통과시킴
+        needed_tokens = min(float(tokens), budget.tpm) if budget.tpm > 0 else 0.0
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT requests, tokens, updated_at FROM gemini_rate_buckets WHERE model = ?",
+                    (model,),
+                ).fetchone()
+                requests, bucket_tokens = self._refill(budget, row, now)
+
+                acquired = requests >= 1.0 and bucket_tokens >= needed_tokens
+                if acquired:
+                    requests -= 1.0
+                    bucket_tokens -= needed_tokens
+                    wait = 0.0
+                else:
+                    wait_requests = (1.0 - requests) * 60.0 / budget.rpm if requests < 1.0 else 0.0
+                    wait_tokens = (
+                        (needed_tokens - bucket_tokens) * 60.0 / budget.tpm
+                        if budget.tpm > 0 and bucket_tokens < needed_tokens
+                        else 0.0
+                    )
+                    wait = max(wait_requests, wait_tokens, 0.01)
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO gemini_rate_buckets (model, requests, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                    (model, requests, bucket_tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.warning(f"[GeminiRateLimiter] ▶ 버킷 갱신 실패, 제한 없이 진행합니다. | model={model} | error={e}")
+                return 0.0
+
+        GEMINI_LOCAL_RATE_LIMIT.labels(model=model, outcome="acquired" if acquired else "throttled").inc()
+        return wait
+
+    def settle(self, model: str, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """응답의 실제 사용 토큰(usage_metadata)으로 추정치와의 차이를 보정합니다."""
+        budget = self.budgets.get(model)
+        if budget is None or self._conn is None or budget.tpm <= 0 or actual_tokens is None:
+            return
+
+        delta = float(actual_tokens) - float(min(estimated_tokens, budget.tpm))
+        if delta == 0:
+            return
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE gemini_rate_buckets SET tokens = MIN(?, tokens - ?) WHERE model = ?",
+                    (budget.tpm, delta, model),
+                )
+            except Exception as e:
+                logger.warning(f"[GeminiRateLimiter] ▶ 토큰 사용량 보정 실패 | model={model} | error={e}")
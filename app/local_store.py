@@ -0,0 +1,15 @@
+import sqlite3
+from pathlib import Path
+
+
+def connect_sqlite(path: str, *, busy_timeout_ms: int = 2000) -> sqlite3.Connection:
+    """uvicorn 워커 간 공유용 로컬 SQLite 연결을 엽니다 (WAL, autocommit, 스레드 공유 허용).
+
+    호출자는 자체 Lock으로 연결 사용을 직렬화해야 합니다.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+    return conn
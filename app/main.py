@@ -11,6 +11,7 @@ from app.briefing.router import router as briefing_router
 from app.container import container
 from app.exception import BusinessException
 from app.meta.router import router as meta_router
+from app.recipe.router import router as recipe_router
 from app.scene.router import router as scene_router
 from app.step.router import router as step_router
 from app.verify.router import router as verify_router
@@ -46,8 +47,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"🔧 asyncio default thread pool 설정 완료 | max_workers={max_workers}")
     # 의존성 주입 컨테이너 설정
     container.wire(modules=[__name__])
+    file_janitor = container.gemini_file_janitor()
+    file_janitor.start()
     yield
     # Shutdown
+    await file_janitor.stop()
+    await container.verify_client().aclose()
+    await container.youtube_client().aclose()
     executor.shutdown(wait=False, cancel_futures=False)
     logger.info("🔄 Recipe Summarizer API 종료 중...")
 
@@ -72,3 +78,4 @@ app.include_router(step_router)
 app.include_router(scene_router)
 app.include_router(briefing_router)
 app.include_router(verify_router)
+app.include_router(recipe_router)
@@ -1,47 +1,104 @@
 import html
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 
-import requests
+from app.comment_store import CommentSnapshot, CommentStore
+from app.enum import InvokeMode
+from app.youtube import YouTubeClient
 
 
 class MetaClient:
-    def __init__(self, api_key: str, timeout: float = 20.0):
+    def __init__(
+        self,
+        youtube: YouTubeClient,
+        comment_store: CommentStore,
+        invoke_mode: str = InvokeMode.THREAD,
+    ):
         self.logger = logging.getLogger(__name__)
-        self.api_key = api_key
-        self.timeout = timeout
+        self.youtube = youtube
+        self.comment_store = comment_store
+        # thread: requests 세션 + asyncio.to_thread / async: httpx 네이티브 호출 (*_async 메서드)
+        self.invoke_mode = InvokeMode(invoke_mode)
 
     def get_video_description(self, video_id: str) -> str:
-        url = "https://www.googleapis.com/youtube/v3/videos"
-        params = {
-            "part": "snippet",
-            "id": video_id,
-            "key": self.api_key
-        }
         try:
-            resp = requests.get(url, params=params, timeout=self.timeout)
-            resp.raise_for_status()
-            data = resp.json()
-            return data["items"][0]["snippet"]["description"]
-            
+            return self.youtube.get_video_snippet(video_id)["description"]
+
         except Exception as e:
             self.logger.exception(f"동영상 설명란 조회 중 오류 발생: {e}")
             return ""
 
+    async def get_video_description_async(self, video_id: str) -> str:
+        try:
+            return (await self.youtube.get_video_snippet_async(video_id))["description"]
+
+        except Exception as e:
+            self.logger.exception(f"동영상 설명란 조회 중 오류 발생: {e}")
+            return ""
+
+    def get_video_snippet(self, video_id: str) -> Dict[str, Any]:
+        """제목/설명/태그/categoryId 등 영상 snippet을 반환합니다. 실패 시 빈 dict를 반환합니다."""
+        try:
+            return self.youtube.get_video_snippet(video_id)
+        except Exception as e:
+            self.logger.exception(f"동영상 snippet 조회 중 오류 발생: {e}")
+            return {}
+
+    async def get_video_snippet_async(self, video_id: str) -> Dict[str, Any]:
+        try:
+            return await self.youtube.get_video_snippet_async(video_id)
+        except Exception as e:
+            self.logger.exception(f"동영상 snippet 조회 중 오류 발생: {e}")
+            return {}
+
     def __get_channel_id(self, video_id: str) -> str | None:
         try:
-            r = requests.get(
-                "https://www.googleapis.com/youtube/v3/videos",
-                params={"part": "snippet", "id": video_id, "key": self.api_key},
-                timeout=self.timeout,
-            )
-            r.raise_for_status()
-            items = r.json().get("items", [])
-            return items[0]["snippet"]["channelId"] if items else None
+            return self.youtube.get_video_snippet(video_id).get("channelId")
         except Exception as e:
             self.logger.exception(f"channelId 조회 중 오류: {e}")
             return None
 
+    async def __get_channel_id_async(self, video_id: str) -> str | None:
+        try:
+            return (await self.youtube.get_video_snippet_async(video_id)).get("channelId")
+        except Exception as e:
+            self.logger.exception(f"channelId 조회 중 오류: {e}")
+            return None
+
+    def __owner_texts_from_store(self, video_id: str, ch_id: str) -> Optional[List[str]]:
+        """저장소가 이미 영상의 댓글을 모두 가지고 있으면 거기서 주인 댓글을 찾습니다 (네트워크 호출 없음).
+
+        일부만 수집된 최신순 스냅샷에는 고정 댓글이 빠져 있을 수 있으므로 None을 반환해 relevance 스캔을 쓰게 합니다.
+        """
+        try:
+            snapshot: Optional[CommentSnapshot] = self.comment_store.peek(video_id)
+        except Exception as e:
+            self.logger.warning(f"댓글 저장소 조회 실패, 직접 스캔으로 대체: {e}")
+            return None
+        if snapshot is None or not snapshot.exhausted:
+            return None
+        stored = [
+            html.unescape((c.text_original or c.text).strip())
+            for c in snapshot.comments
+            if c.author_channel_id == ch_id
+        ]
+        return [text for text in stored if text]
+
+    @staticmethod
+    def __collect_owner_texts(data: Dict[str, Any], ch_id: str, seen_ids: set[str], comments: List[str]) -> None:
+        for item in data.get("items", []):
+            top = item["snippet"]["topLevelComment"]
+            sn = top["snippet"]
+            author_ch = (sn.get("authorChannelId") or {}).get("value")
+            if author_ch == ch_id:
+                cid = top["id"]
+                if cid in seen_ids:
+                    continue
+                seen_ids.add(cid)
+                text = html.unescape((sn.get("textDisplay") or sn.get("textOriginal") or "").strip())
+                if text:
+                    comments.append(text)
+
     def get_channel_owner_top_level_comments(
         self,
         video_id: str,
@@ -52,15 +109,49 @@ class MetaClient:
         if not ch_id:
             return []
 
-        url = "https://www.googleapis.com/youtube/v3/commentThreads"
-        params = {
-            "part": "snippet",
-            "videoId": video_id,
-            "textFormat": "plainText",
-            "maxResults": 100,
-            "order": order,
-            "key": self.api_key,
-        }
+        # 브리핑이 이미 모든 댓글을 수집해 둔 경우에만 저장소 사용 (이 조회를 위해 저장소를 채우지 않음)
+        stored = self.__owner_texts_from_store(video_id, ch_id)
+        if stored is not None:
+            return stored
+
+        comments: List[str] = []
+        seen_ids: set[str] = set()
+        page_token = None
+
+        try:
+            for _ in range(max(1, scan_pages)):
+                data = self.youtube.get_comment_threads_page(
+                    video_id,
+                    order=order,
+                    max_results=100,
+                    page_token=page_token,
+                    text_format="plainText",
+                )
+                self.__collect_owner_texts(data, ch_id, seen_ids, comments)
+
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    break
+
+        except Exception as e:
+            self.logger.exception(f"채널 주인 댓글 수집 중 오류: {e}")
+            return []
+
+        return comments
+
+    async def get_channel_owner_top_level_comments_async(
+        self,
+        video_id: str,
+        order: str = "relevance",
+        scan_pages: int = 6,
+    ) -> List[str]:
+        ch_id = await self.__get_channel_id_async(video_id)
+        if not ch_id:
+            return []
+
+        stored = self.__owner_texts_from_store(video_id, ch_id)
+        if stored is not None:
+            return stored
 
         comments: List[str] = []
         seen_ids: set[str] = set()
@@ -68,24 +159,14 @@ class MetaClient:
 
         try:
             for _ in range(max(1, scan_pages)):
-                if page_token:
-                    params["pageToken"] = page_token
-                resp = requests.get(url, params=params, timeout=self.timeout)
-                resp.raise_for_status()
-                data = resp.json()
-
-                for item in data.get("items", []):
-                    top = item["snippet"]["topLevelComment"]
-                    sn = top["snippet"]
-                    author_ch = (sn.get("authorChannelId") or {}).get("value")
-                    if author_ch == ch_id:
-                        cid = top["id"]
-                        if cid in seen_ids:
-                            continue
-                        seen_ids.add(cid)
-                        text = html.unescape((sn.get("textDisplay") or sn.get("textOriginal") or "").strip())
-                        if text:
-                            comments.append(text)
+                data = await self.youtube.get_comment_threads_page_async(
+                    video_id,
+                    order=order,
+                    max_results=100,
+                    page_token=page_token,
+                    text_format="plainText",
+                )
+                self.__collect_owner_texts(data, ch_id, seen_ids, comments)
 
                 page_token = data.get("nextPageToken")
                 if not page_token:
@@ -95,4 +176,4 @@ class MetaClient:
             self.logger.exception(f"채널 주인 댓글 수집 중 오류: {e}")
             return []
 
-        return comments
\ No newline at end of file
+        return comments
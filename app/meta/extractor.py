@@ -3,14 +3,16 @@ import logging
 from pathlib import Path
 from typing import Any, Iterable, List, Optional
 
-from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.gemini_invoker import GeminiInvoker, HedgePolicy, ModelRoute
 from app.gemini_safety import relaxed_safety_settings
+from app.result_cache import ResultCache, fingerprint
 from app.meta.exception import MetaErrorCode, MetaException
 from app.meta.schema import Ingredient, MetaResponse
+from app.video_session import VideoSessionManager
 
 
 class MetaExtractor:
@@ -22,7 +24,7 @@ class MetaExtractor:
     def __init__(
         self,
         *,
-        client: genai.Client,
+        invoker: GeminiInvoker,
         model: str,
         fallback_model: str = "gemini-3.0-flash",
         secondary_fallback_model: str = "gemini-3-flash-preview",
@@ -30,12 +32,20 @@ class MetaExtractor:
         extract_ingredient_tool_path: Path,
         video_extract_prompt_path: Optional[Path] = None,
         video_extract_tool_path: Optional[Path] = None,
+        invoke_mode: str = InvokeMode.THREAD,
+        hedge_policy: Optional[HedgePolicy] = None,
+        result_cache: Optional[ResultCache] = None,
+        video_session: Optional[VideoSessionManager] = None,
     ):
         self.logger = logging.getLogger(__name__)
-        self.client = client
+        self.invoker = invoker
+        self.invoke_mode = InvokeMode(invoke_mode)
         self.model = model
         self.fallback_model = fallback_model
         self.secondary_fallback_model = secondary_fallback_model
+        self.hedge_policy = hedge_policy or HedgePolicy(name="meta_video")
+        self.result_cache = result_cache
+        self.video_session = video_session
 
         # ----- 프롬프트 / 툴 스펙 로드 -----
         self.extract_ingredient_prompt = extract_ingredient_prompt_path.read_text(
@@ -59,13 +69,19 @@ class MetaExtractor:
 
         self.video_extract_prompt = video_extract_prompt_path.read_text(encoding="utf-8")
         video_extract_tool_spec = json.loads(video_extract_tool_path.read_text(encoding="utf-8"))
+        self.video_prompt_version = fingerprint(
+            self.system_instruction,
+            self.video_extract_prompt,
+            video_extract_tool_spec,
+        )
         self.video_meta_tool = self._build_tool_from_spec(video_extract_tool_spec)
         self.video_meta_conf = self._build_conf(
             tool=self.video_meta_tool,
             allowed_fn=self.VIDEO_META_FN,
             media_resolution=types.MediaResolution.MEDIA_RESOLUTION_LOW,
         )
-
+        if self.video_session is not None:
+            self.video_session.register_tool(self.model, self.VIDEO_META_FN, self.video_meta_tool)
 
     @staticmethod
     def _build_tool_from_spec(tool_list: list) -> types.Tool:
@@ -166,27 +182,23 @@ class MetaExtractor:
         return {}
 
     @staticmethod
-    def _is_rate_limit_error(err: Exception) -> bool:
-        status_code = getattr(err, "status_code", None)
-        if status_code == 429:
-            return True
-
-        code = getattr(err, "code", None)
-        if code == 429:
-            return True
-
-        message = str(err).lower()
-        return (
-            "429" in message
-            or "too many requests" in message
-            or "rate limit" in message
-            or "resource_exhausted" in message
+    def _build_thinking_conf(conf: types.GenerateContentConfig) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            system_instruction=conf.system_instruction,
+            temperature=0.0,
+            safety_settings=conf.safety_settings,
+            thinking_config=types.ThinkingConfig(thinkingLevel="HIGH"),
+            media_resolution=conf.media_resolution,
+            tools=conf.tools,
+            tool_config=conf.tool_config,
         )
 
-    @staticmethod
-    def _is_server_error(err: Exception) -> bool:
-        code = getattr(err, "code", None)
-        return code is not None and 500 <= code < 600
+    def _build_routes(self, conf: types.GenerateContentConfig) -> List[ModelRoute]:
+        return [
+            ModelRoute(self.model, conf),
+            ModelRoute(self.fallback_model, conf),
+            ModelRoute(self.secondary_fallback_model, self._build_thinking_conf(conf)),
+        ]
 
     def _invoke_generate_content(
         self,
@@ -196,56 +208,24 @@ class MetaExtractor:
         err_code: MetaErrorCode,
     ):
         try:
-            return self.client.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=conf,
-            )
+            return self.invoker.invoke(self._build_routes(conf), contents)
         except (genai_errors.ClientError, genai_errors.ServerError) as e:
-            should_fallback = (
-                self.fallback_model
-                and self.fallback_model != self.model
-                and (self._is_rate_limit_error(e) or self._is_server_error(e))
-            )
-            if should_fallback:
-                self.logger.warning(
-                    f"Primary Gemini model unavailable. fallback model={self.fallback_model}"
-                )
-                try:
-                    return self.client.models.generate_content(
-                        model=self.fallback_model,
-                        contents=contents,
-                        config=conf,
-                    )
-                except (genai_errors.ClientError, genai_errors.ServerError) as fallback_error:
-                    if not (self._is_rate_limit_error(fallback_error) or self._is_server_error(fallback_error)):
-                        self.logger.exception("Gemini fallback model invoke failed")
-                        raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from fallback_error
-                    self.logger.warning(
-                        f"Fallback model also unavailable. secondary fallback={self.secondary_fallback_model}"
-                    )
-                    try:
-                        thinking_conf = types.GenerateContentConfig(
-                            system_instruction=conf.system_instruction,
-                            temperature=0.0,
-                            safety_settings=conf.safety_settings,
-                            thinking_config=types.ThinkingConfig(thinkingLevel="HIGH"),
-                            media_resolution=conf.media_resolution,
-                            tools=conf.tools,
-                            tool_config=conf.tool_config,
-                        )
-                        return self.client.models.generate_content(
-                            model=self.secondary_fallback_model,
-                            contents=contents,
-                            config=thinking_conf,
-                        )
-                    except Exception as secondary_error:
-                        self.logger.exception("Gemini secondary fallback model invoke failed")
-                        raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from secondary_error
-                except Exception as fallback_error:
-                    self.logger.exception("Unexpected error during Gemini fallback call")
-                    raise MetaException(err_code) from fallback_error
+            self.logger.exception("Gemini API invoke failed")
+            raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from e
+        except Exception as e:
+            self.logger.exception("Unexpected error during Gemini call")
+            raise MetaException(err_code) from e
 
+    async def _invoke_generate_content_async(
+        self,
+        *,
+        contents: Any,
+        conf: types.GenerateContentConfig,
+        err_code: MetaErrorCode,
+    ):
+        try:
+            return await self.invoker.invoke_async(self._build_routes(conf), contents)
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
             self.logger.exception("Gemini API invoke failed")
             raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from e
         except Exception as e:
@@ -261,52 +241,75 @@ class MetaExtractor:
         )
 
 
-    def extract_ingredients_from_description(
+    def _build_ingredients_prompt(
         self,
         description: str,
         channel_owner_top_level_comments: List[str],
-        language: LanguageType
-    ) -> List[Ingredient]:
-        prompt = self._render_prompt(
+        language: LanguageType,
+    ) -> str:
+        return self._render_prompt(
             self.extract_ingredient_prompt,
             description=description,
             channel_owner_top_level_comments="\n".join(channel_owner_top_level_comments),
             language=language
         )
 
+    def _parse_ingredients_response(self, response) -> List[Ingredient]:
+        calls = self._iter_function_calls(response)
+        args = self._find_call_args(calls, self.INGREDIENTS_FN)
+
+        arr = args.get("ingredients") or []
+        out: List[Ingredient] = []
+
+        for ing in arr:
+            name = (ing.get("name") or "").strip()
+            if not name:
+                continue
+            amount = self._safe_float(ing.get("amount"), 0.0)
+            unit = ing.get("unit") or ""
+            out.append(Ingredient(name=name, amount=amount, unit=unit))
+
+        return out
+
+    def extract_ingredients_from_description(
+        self,
+        description: str,
+        channel_owner_top_level_comments: List[str],
+        language: LanguageType
+    ) -> List[Ingredient]:
+        prompt = self._build_ingredients_prompt(description, channel_owner_top_level_comments, language)
+
         try:
             response = self._generate_content(
                 prompt=prompt,
                 conf=self.ingredients_conf,
                 err_code=MetaErrorCode.META_INGREDIENTS_EXTRACT_FAILED,
             )
+            return self._parse_ingredients_response(response)
 
-            calls = self._iter_function_calls(response)
-            args = self._find_call_args(calls, self.INGREDIENTS_FN)
-
-            arr = args.get("ingredients") or []
-            out: List[Ingredient] = []
+        except MetaException:
+            return []
 
-            for ing in arr:
-                name = (ing.get("name") or "").strip()
-                if not name:
-                    continue
-                amount = self._safe_float(ing.get("amount"), 0.0)
-                unit = ing.get("unit") or ""
-                out.append(Ingredient(name=name, amount=amount, unit=unit))
+    async def extract_ingredients_from_description_async(
+        self,
+        description: str,
+        channel_owner_top_level_comments: List[str],
+        language: LanguageType
+    ) -> List[Ingredient]:
+        prompt = self._build_ingredients_prompt(description, channel_owner_top_level_comments, language)
 
-            return out
+        try:
+            response = await self._invoke_generate_content_async(
+                contents=prompt,
+                conf=self.ingredients_conf,
+                err_code=MetaErrorCode.META_INGREDIENTS_EXTRACT_FAILED,
+            )
+            return self._parse_ingredients_response(response)
 
         except MetaException:
             return []
 
-    def extract_video(
-        self,
-        file_uri: str,
-        mime_type: str,
-        language: LanguageType,
-        original_title: str,
-    ) -> MetaResponse:
+    def _build_video_prompt(self, language: LanguageType, original_title: str) -> str:
         if not self.video_extract_prompt or not self.video_meta_conf:
             raise MetaException(MetaErrorCode.META_EXTRACT_FAILED, "Video extraction not configured")
 
@@ -315,26 +318,25 @@ class MetaExtractor:
         else:
             tag_options = self.TAGS_EN
 
-        prompt = self._render_prompt(
+        return self._render_prompt(
             self.video_extract_prompt,
             language=language.value,
             tag_options=tag_options,
             original_title=original_title,
         )
 
-        response = self._invoke_generate_content(
-            contents=[
-                types.Content(
-                    parts=[
-                        types.Part.from_uri(file_uri=file_uri, mime_type=mime_type),
-                        types.Part.from_text(text=prompt),
-                    ]
-                )
-            ],
-            conf=self.video_meta_conf,
-            err_code=MetaErrorCode.META_EXTRACT_FAILED,
-        )
+    @staticmethod
+    def _build_video_contents(file_uri: str, mime_type: str, prompt: str) -> list:
+        return [
+            types.Content(
+                parts=[
+                    types.Part.from_uri(file_uri=file_uri, mime_type=mime_type),
+                    types.Part.from_text(text=prompt),
+                ]
+            )
+        ]
 
+    def _parse_video_response(self, response) -> MetaResponse:
         calls = self._iter_function_calls(response)
         args = self._find_call_args(calls, self.VIDEO_META_FN)
         if not args:
@@ -371,3 +373,125 @@ class MetaExtractor:
             servings=servings,
             cook_time=cook_time,
         )
+
+    def _video_cache_key(
+        self,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+    ) -> str:
+        return ResultCache.make_key(
+            "meta",
+            file_uri=file_uri,
+            mime_type=mime_type,
+            language=language.value,
+            original_title=original_title,
+            model=self.model,
+            prompt_version=self.video_prompt_version,
+        )
+
+    def _get_cached(self, cache_key: str) -> Optional[MetaResponse]:
+        if self.result_cache is None:
+            return None
+        cached = self.result_cache.get(cache_key)
+        return MetaResponse(**cached) if cached is not None else None
+
+    def _set_cached(self, cache_key: str, meta: MetaResponse) -> None:
+        if self.result_cache is not None:
+            self.result_cache.set(cache_key, meta.model_dump())
+
+    def extract_video(
+        self,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+    ) -> MetaResponse:
+        cache_key = self._video_cache_key(file_uri, mime_type, language, original_title)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_video_prompt(language, original_title)
+        if self.video_session is not None:
+            meta = self.video_session.invoke(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=ModelRoute(self.model, self.video_meta_conf),
+                function_name=self.VIDEO_META_FN,
+                prompt=prompt,
+                parse=self._parse_video_response,
+            )
+            if meta is not None:
+                self._set_cached(cache_key, meta)
+                return meta
+
+        contents = self._build_video_contents(file_uri, mime_type, prompt)
+        try:
+            meta = self.invoker.invoke_hedged(
+                self._build_routes(self.video_meta_conf),
+                contents,
+                policy=self.hedge_policy,
+                parse=self._parse_video_response,
+            )
+        except MetaException:
+            raise
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
+            self.logger.exception("Gemini API invoke failed")
+            raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from e
+        except Exception as e:
+            self.logger.exception("Unexpected error during Gemini call")
+            raise MetaException(MetaErrorCode.META_EXTRACT_FAILED) from e
+
+        self._set_cached(cache_key, meta)
+        return meta
+
+    async def extract_video_async(
+        self,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+    ) -> MetaResponse:
+        """extract_video의 asyncio 네이티브 버전 (client.aio 사용, 스레드 미점유)"""
+        cache_key = self._video_cache_key(file_uri, mime_type, language, original_title)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_video_prompt(language, original_title)
+        if self.video_session is not None:
+            meta = await self.video_session.invoke_async(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=ModelRoute(self.model, self.video_meta_conf),
+                function_name=self.VIDEO_META_FN,
+                prompt=prompt,
+                parse=self._parse_video_response,
+            )
+            if meta is not None:
+                self._set_cached(cache_key, meta)
+                return meta
+
+        contents = self._build_video_contents(file_uri, mime_type, prompt)
+        try:
+            meta = await self.invoker.invoke_hedged_async(
+                self._build_routes(self.video_meta_conf),
+                contents,
+                policy=self.hedge_policy,
+                parse=self._parse_video_response,
+            )
+        except MetaException:
+            raise
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
+            self.logger.exception("Gemini API invoke failed")
+            raise MetaException(MetaErrorCode.META_API_INVOKE_FAILED) from e
+        except Exception as e:
+            self.logger.exception("Unexpected error during Gemini call")
+            raise MetaException(MetaErrorCode.META_EXTRACT_FAILED) from e
+
+        self._set_cached(cache_key, meta)
+        return meta
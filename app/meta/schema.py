@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +19,7 @@ class MetaResponse(BaseModel):
     tags: List[str] = Field(description="태그(2~4개)")
     servings: int = Field(ge=1, description="몇 인분")
     cook_time: int = Field(..., description="요리 시간(분)")
+    timings: Dict[str, float] = Field(default_factory=dict, description="분기별 소요 시간(초)")
 
 
 class VideoMetaRequest(BaseModel):
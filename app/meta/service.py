@@ -1,18 +1,31 @@
 import asyncio
 import logging
+import time
+from typing import Awaitable, Dict, List, Optional, Tuple, TypeVar
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
 from app.meta.client import MetaClient
 from app.meta.exception import MetaErrorCode, MetaException
 from app.meta.extractor import MetaExtractor
-from app.meta.schema import MetaResponse
+from app.meta.schema import Ingredient, MetaResponse
+from app.result_cache import fingerprint
+from app.singleflight import SingleFlight
+
+T = TypeVar("T")
+U = TypeVar("U")
 
 
 class MetaService:
-    def __init__(self, client: MetaClient, extractor: MetaExtractor):
+    def __init__(
+        self,
+        client: MetaClient,
+        extractor: MetaExtractor,
+        singleflight: Optional[SingleFlight] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         self.client = client
         self.extractor = extractor
+        self.singleflight = singleflight
 
     async def extract_by_video(
         self,
@@ -22,33 +35,107 @@ class MetaService:
         language: LanguageType,
         original_title: str,
     ) -> MetaResponse:
+        if self.singleflight is None:
+            return await self._extract_by_video(video_id, file_uri, mime_type, language, original_title)
+        return await self.singleflight.do(
+            "meta",
+            fingerprint(video_id, file_uri, mime_type, language.value, original_title),
+            lambda: self._extract_by_video(video_id, file_uri, mime_type, language, original_title),
+        )
+
+    @staticmethod
+    async def _timed(branch: str, timings: Dict[str, float], awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[branch] = round(time.perf_counter() - started, 3)
+
+    @staticmethod
+    async def _both(first: Awaitable[T], second: Awaitable[U]) -> Tuple[T, U]:
+        """두 분기를 동시에 실행합니다. 한쪽이 실패하면 다른 분기를 취소하고 먼저 난 예외를 그대로 전파합니다."""
         try:
-            # 1. 영상 자체에서 메타데이터 추출 (보조 정보)
-            meta_from_video = await asyncio.to_thread(
-                self.extractor.extract_video,
+            async with asyncio.TaskGroup() as group:
+                first_task = group.create_task(first)
+                second_task = group.create_task(second)
+        except BaseExceptionGroup as errors:
+            raise errors.exceptions[0]
+        return first_task.result(), second_task.result()
+
+    async def _extract_from_video(
+        self,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+    ) -> MetaResponse:
+        """영상 자체에서 메타데이터 추출 (보조 정보)"""
+        if self.extractor.invoke_mode == InvokeMode.ASYNC:
+            return await self.extractor.extract_video_async(
                 file_uri,
                 mime_type,
                 language,
                 original_title,
             )
+        return await asyncio.to_thread(
+            self.extractor.extract_video,
+            file_uri,
+            mime_type,
+            language,
+            original_title,
+        )
 
-            # 2. 유튜브 영상 설명 가져오기
-            description = await asyncio.to_thread(
-                self.client.get_video_description, video_id
-            )
+    async def _extract_from_text(
+        self,
+        video_id: str,
+        language: LanguageType,
+        timings: Dict[str, float],
+    ) -> List[Ingredient]:
+        """설명란과 채널 소유자 댓글(대댓글 제외)에서 재료 리스트 추출 (주 정보)"""
+        if self.client.invoke_mode == InvokeMode.ASYNC:
+            description_call = self.client.get_video_description_async(video_id)
+            comments_call = self.client.get_channel_owner_top_level_comments_async(video_id)
+        else:
+            description_call = asyncio.to_thread(self.client.get_video_description, video_id)
+            comments_call = asyncio.to_thread(self.client.get_channel_owner_top_level_comments, video_id)
 
-            # 3. 유튜브 영상 채널 소유자 댓글(대댓글 제외) 가져오기
-            channel_owner_top_level_comments = await asyncio.to_thread(
-                self.client.get_channel_owner_top_level_comments, video_id
-            )
+        # 설명란과 댓글 수집은 서로 독립이므로 동시에 실행
+        description, channel_owner_top_level_comments = await self._both(
+            self._timed("description", timings, description_call),
+            self._timed("comments", timings, comments_call),
+        )
 
-            # 4. 설명란과 채널 소유자 댓글에서 재료 리스트 추출 (주 정보)
-            ingredients_from_text = await asyncio.to_thread(
-                self.extractor.extract_ingredients_from_description, 
-                description, 
+        if self.extractor.invoke_mode == InvokeMode.ASYNC:
+            extract_call = self.extractor.extract_ingredients_from_description_async(
+                description,
+                channel_owner_top_level_comments,
+                language
+            )
+        else:
+            extract_call = asyncio.to_thread(
+                self.extractor.extract_ingredients_from_description,
+                description,
                 channel_owner_top_level_comments,
                 language
             )
+        return await self._timed("ingredients", timings, extract_call)
+
+    async def _extract_by_video(
+        self,
+        video_id: str,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+    ) -> MetaResponse:
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            # 영상 분기와 설명란/댓글 → 재료 분기는 서로 독립이므로 동시에 실행 후 병합
+            meta_from_video, ingredients_from_text = await self._both(
+                self._timed("video", timings, self._extract_from_video(file_uri, mime_type, language, original_title)),
+                self._timed("text", timings, self._extract_from_text(video_id, language, timings)),
+            )
 
             final_ingredients = []
             if ingredients_from_text:
@@ -72,13 +159,17 @@ class MetaService:
                 # 설명란/댓글 정보가 없으면 영상 인식 결과만 사용
                 final_ingredients = meta_from_video.ingredients
 
+            timings["total"] = round(time.perf_counter() - started, 3)
+            self.logger.info(f"메타데이터 추출 완료 video_id={video_id} timings={timings}")
+
             return MetaResponse(
                 title=meta_from_video.title,
                 description=meta_from_video.description,
                 ingredients=final_ingredients,
                 tags=meta_from_video.tags,
                 servings=meta_from_video.servings,
-                cook_time=meta_from_video.cook_time
+                cook_time=meta_from_video.cook_time,
+                timings=timings,
             )
 
         except Exception as e:
@@ -0,0 +1,24 @@
+from enum import Enum
+
+from app.exception import RecipeSummaryException
+
+
+class RecipeErrorCode(Enum):
+    RECIPE_PIPELINE_FAILED = ("RECIPE_001", "레시피 생성 파이프라인 처리 중 오류가 발생했습니다.")
+
+    def __init__(self, code: str, message: str):
+        self._code = code
+        self._message = message
+
+    @property
+    def code(self) -> str:
+        return self._code
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+class RecipeException(RecipeSummaryException):
+    def __init__(self, code: Enum):
+        super().__init__(code)
+        self.code = code
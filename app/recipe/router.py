@@ -0,0 +1,54 @@
+import json
+from typing import Annotated
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from app.container import Container
+from app.enum import LanguageType
+from app.recipe.schema import RecipeResponse, VideoRecipeRequest
+from app.recipe.service import RecipeService
+
+router = APIRouter()
+
+
+def _resolve_language(x_country_code: str | None) -> LanguageType:
+    country = (x_country_code or "").strip().upper()
+    return LanguageType.KR if country == "KR" else LanguageType.EN
+
+
+@router.post("/recipes/video", response_model=RecipeResponse)
+@inject
+async def generate_recipe_by_video(
+    request: VideoRecipeRequest,
+    x_country_code: Annotated[str | None, Header(alias="X-Country-Code")] = None,
+    recipe_service: RecipeService = Depends(Provide[Container.recipe_service]),
+):
+    """verify → meta ‖ steps → scenes → cleanup을 한 번의 요청으로 수행합니다."""
+    return await recipe_service.run(
+        request.video_id,
+        request.original_title,
+        _resolve_language(x_country_code),
+    )
+
+
+@router.post("/recipes/video/stream")
+@inject
+async def stream_recipe_by_video(
+    request: VideoRecipeRequest,
+    x_country_code: Annotated[str | None, Header(alias="X-Country-Code")] = None,
+    recipe_service: RecipeService = Depends(Provide[Container.recipe_service]),
+):
+    """단계별 결과를 NDJSON(한 줄에 이벤트 하나)으로 스트리밍합니다."""
+    events = recipe_service.stream(
+        request.video_id,
+        request.original_title,
+        _resolve_language(x_country_code),
+    )
+
+    async def body():
+        async for event in events:
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import Dict, List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.meta.schema import MetaResponse
+from app.scene.schema import SceneOut
+from app.step.schema import StepDescription
+
+
+class VideoRecipeRequest(BaseModel):
+    """영상 기반 레시피 일괄 생성 요청 (verify → meta ‖ steps → scenes → cleanup)"""
+    video_id: str = Field(..., description="YouTube 영상 ID")
+    original_title: str = Field(description="원본 영상 제목(제목 생성 참고용)")
+
+
+class RecipeStepOut(BaseModel):
+    step_id: UUID = Field(..., description="step UUID (scenes의 step_id와 연결)")
+    subtitle: str = Field(..., description="조리단계 그룹 제목")
+    start: float = Field(..., ge=0, description="조리단계 그룹 시작 시간")
+    descriptions: List[StepDescription] = Field(..., description="조리단계 그룹별 설명 목록")
+
+
+class RecipeResponse(BaseModel):
+    file_uri: str = Field(..., description="Gemini File URI (이 요청의 보유분은 반납됨. 같은 파일을 쓰는 다른 요청이 없을 때만 삭제되며, 다른 요청이 쓰는 동안에는 유지될 수 있음)")
+    mime_type: str = Field(..., description="MIME Type")
+    meta: MetaResponse
+    steps: List[RecipeStepOut] = Field(..., description="조리단계 그룹 목록")
+    scenes: List[SceneOut] = Field(..., description="추출된 장면 목록")
+    timings: Dict[str, float] = Field(..., description="단계별 소요 시간(초)")
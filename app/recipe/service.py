@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, TypeVar
+from uuid import uuid4
+
+from app.enum import LanguageType
+from app.exception import BusinessException
+from app.meta.schema import MetaResponse
+from app.meta.service import MetaService
+from app.recipe.exception import RecipeErrorCode, RecipeException
+from app.recipe.schema import RecipeResponse, RecipeStepOut
+from app.scene.schema import SceneOut
+from app.scene.service import SceneService
+from app.step.service import StepService
+from app.verify.service import VerifyService
+
+T = TypeVar("T")
+
+Emit = Callable[[Dict[str, Any]], None]
+
+
+class RecipeService:
+    """verify → (meta ‖ steps → scenes) → cleanup 순서로 영상 레시피 생성을 한 번에 수행합니다.
+
+    meta와 steps는 file_uri만 필요하므로 동시에 실행하고, scenes는 steps가 끝나는 즉시 시작합니다.
+    """
+
+    def __init__(
+        self,
+        verify_service: VerifyService,
+        meta_service: MetaService,
+        step_service: StepService,
+        scene_service: SceneService,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.verify_service = verify_service
+        self.meta_service = meta_service
+        self.step_service = step_service
+        self.scene_service = scene_service
+
+    @staticmethod
+    async def _timed(stage: str, timings: Dict[str, float], awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round(time.perf_counter() - started, 3)
+
+    @staticmethod
+    async def _gather_or_cancel(*coros: Awaitable[Any]) -> List[Any]:
+        """하나라도 실패하면 나머지 분기를 취소하고 예외를 전파합니다."""
+        tasks = [asyncio.ensure_future(c) for c in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _meta_branch(
+        self,
+        video_id: str,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        original_title: str,
+        timings: Dict[str, float],
+        emit: Emit,
+    ) -> MetaResponse:
+        meta = await self._timed(
+            "meta",
+            timings,
+            self.meta_service.extract_by_video(video_id, file_uri, mime_type, language, original_title),
+        )
+        emit({"event": "meta", "elapsed": timings["meta"], "data": meta.model_dump(mode="json")})
+        return meta
+
+    async def _steps_branch(
+        self,
+        file_uri: str,
+        mime_type: str,
+        language: LanguageType,
+        timings: Dict[str, float],
+        emit: Emit,
+    ) -> Tuple[List[RecipeStepOut], List[SceneOut]]:
+        step_groups = await self._timed(
+            "steps",
+            timings,
+            self.step_service.generate_by_video(file_uri, mime_type, language),
+        )
+        steps = [RecipeStepOut(step_id=uuid4(), **s.model_dump()) for s in step_groups]
+        emit({
+            "event": "steps",
+            "elapsed": timings["steps"],
+            "data": [s.model_dump(mode="json") for s in steps],
+        })
+
+        if not steps:
+            return steps, []
+
+        # step 번호(1-based) → step_id 매핑 테이블 (/scenes/video와 동일)
+        step_number_to_id = {i + 1: s.step_id for i, s in enumerate(steps)}
+        steps_dicts = [s.model_dump(exclude={"step_id"}) for s in steps]
+        raw_scenes = await self._timed(
+            "scenes",
+            timings,
+            self.scene_service.generate_scenes(file_uri, mime_type, steps_dicts, language),
+        )
+        scenes = self.scene_service.assemble(raw_scenes, step_number_to_id)
+        emit({
+            "event": "scenes",
+            "elapsed": timings["scenes"],
+            "data": [s.model_dump(mode="json") for s in scenes],
+        })
+        return steps, scenes
+
+    async def _execute(
+        self,
+        video_id: str,
+        original_title: str,
+        language: LanguageType,
+        emit: Emit,
+    ) -> RecipeResponse:
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        verified = await self._timed("verify", timings, self.verify_service.verify_recipe(video_id))
+        file_uri = verified["file_uri"]
+        mime_type = verified["mime_type"]
+        emit({"event": "verify", "elapsed": timings["verify"], "data": verified})
+
+        try:
+            meta, (steps, scenes) = await self._gather_or_cancel(
+                self._meta_branch(video_id, file_uri, mime_type, language, original_title, timings, emit),
+                self._steps_branch(file_uri, mime_type, language, timings, emit),
+            )
+        finally:
+            # 요청이 취소되더라도 이 요청의 보유분은 반납 (같은 파일을 쓰는 다른 요청이 없을 때만 실제 삭제)
+            await asyncio.shield(
+                self._timed("cleanup", timings, self.verify_service.release_file(file_uri))
+            )
+
+        timings["total"] = round(time.perf_counter() - started, 3)
+        self.logger.info(
+            f"[RecipeService] ▶ 레시피 파이프라인 완료 | video_id={video_id} | timings={json.dumps(timings)}"
+        )
+        return RecipeResponse(
+            file_uri=file_uri,
+            mime_type=mime_type,
+            meta=meta,
+            steps=steps,
+            scenes=scenes,
+            timings=timings,
+        )
+
+    async def run(self, video_id: str, original_title: str, language: LanguageType) -> RecipeResponse:
+        try:
+            return await self._execute(video_id, original_title, language, lambda event: None)
+        except BusinessException:
+            raise
+        except Exception as e:
+            self.logger.error(f"[RecipeService] ▶ 레시피 파이프라인 실패 | video_id={video_id} | error={e}")
+            raise RecipeException(RecipeErrorCode.RECIPE_PIPELINE_FAILED)
+
+    async def stream(
+        self,
+        video_id: str,
+        original_title: str,
+        language: LanguageType,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """단계가 끝날 때마다 이벤트를 내보내고, 마지막에 done 또는 error 이벤트를 내보냅니다."""
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> None:
+            try:
+                result = await self._execute(video_id, original_title, language, queue.put_nowait)
+                queue.put_nowait({"event": "done", "timings": result.timings})
+            except BusinessException as e:
+                queue.put_nowait({"event": "error", **e.to_dict()})
+            except Exception as e:
+                self.logger.error(f"[RecipeService] ▶ 레시피 파이프라인 실패 | video_id={video_id} | error={e}")
+                queue.put_nowait({"event": "error", **RecipeException(RecipeErrorCode.RECIPE_PIPELINE_FAILED).to_dict()})
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(produce())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            # 클라이언트 연결이 끊기면 남은 단계를 취소 (cleanup은 _execute에서 보장)
+            if not task.done():
+                task.cancel()
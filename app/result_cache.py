@@ -0,0 +1,90 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+RESULT_CACHE_REQUESTS = Counter(
+    "result_cache_requests_total",
+    "생성 결과 캐시 조회 결과 (hit, miss)",
+    ["namespace", "outcome"],
+)
+RESULT_CACHE_EVICTIONS = Counter(
+    "result_cache_evictions_total",
+    "생성 결과 캐시 제거 횟수 (reason=size, expired)",
+    ["reason"],
+)
+RESULT_CACHE_BYTES = Gauge(
+    "result_cache_bytes",
+    "생성 결과 캐시가 점유한 바이트 수",
+)
+
+
+def fingerprint(*parts: Any) -> str:
+    """프롬프트/툴 스펙 등 캐시 키 구성 요소의 짧은 해시"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, ensure_ascii=False, sort_keys=True, default=str)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """바이트 용량 제한이 있는 프로세스 로컬 LRU + TTL 캐시.
+
+    값은 직렬화된 JSON 문자열로 저장하므로 호출자가 꺼낸 결과를 수정해도 캐시에 영향을 주지 않습니다.
+    """
+
+    def __init__(self, *, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 3600.0):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def make_key(namespace: str, **parts: Any) -> str:
+        return f"{namespace}:{fingerprint(parts)}"
+
+    def _remove(self, key: str, reason: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+        RESULT_CACHE_EVICTIONS.labels(reason=reason).inc()
+
+    def get(self, key: str) -> Optional[Any]:
+        namespace = key.split(":", 1)[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key, "expired")
+                RESULT_CACHE_BYTES.set(self._bytes)
+                entry = None
+            if entry is None:
+                RESULT_CACHE_REQUESTS.labels(namespace=namespace, outcome="miss").inc()
+                return None
+            self._entries.move_to_end(key)
+            payload = entry[1]
+
+        RESULT_CACHE_REQUESTS.labels(namespace=namespace, outcome="hit").inc()
+        return json.loads(payload)
+
+    def set(self, key: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                _, old = self._entries.pop(key)
+                self._bytes -= len(old)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest, "size")
+            RESULT_CACHE_BYTES.set(self._bytes)
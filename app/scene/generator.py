@@ -2,15 +2,17 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.gemini_invoker import GeminiInvoker, ModelRoute
 from app.gemini_safety import relaxed_safety_settings
+from app.result_cache import ResultCache, fingerprint
 from app.scene.exception import SceneErrorCode, SceneException
+from app.video_session import VideoSessionManager
 
 
 class SceneGenerator:
@@ -20,20 +22,27 @@ class SceneGenerator:
     def __init__(
         self,
         *,
-        client: genai.Client,
+        invoker: GeminiInvoker,
         model: str,
         fallback_model: str = "gemini-3.0-flash",
         video_scene_tool_path: Path,
         video_scene_user_prompt_path: Path,
+        invoke_mode: str = InvokeMode.THREAD,
+        result_cache: Optional[ResultCache] = None,
+        video_session: Optional[VideoSessionManager] = None,
     ):
         self.logger = logging.getLogger(__name__)
-        self.client = client
+        self.invoker = invoker
+        self.invoke_mode = InvokeMode(invoke_mode)
+        self.result_cache = result_cache
+        self.video_session = video_session
         self.model = model
         self.fallback_model = fallback_model
 
         self.video_scene_user_prompt = video_scene_user_prompt_path.read_text(encoding="utf-8")
         video_scene_tool_spec = json.loads(video_scene_tool_path.read_text(encoding="utf-8"))
         self.video_scene_tool = self._build_tool_from_spec(video_scene_tool_spec)
+        self.prompt_version = fingerprint(self.video_scene_user_prompt, video_scene_tool_spec)
 
         self.video_scene_conf = types.GenerateContentConfig(
             temperature=0.0,
@@ -51,6 +60,13 @@ class SceneGenerator:
             ),
         )
 
+        self.video_scene_routes = [
+            ModelRoute(self.model, self.video_scene_conf),
+            ModelRoute(self.fallback_model, self.video_scene_conf),
+        ]
+        if self.video_session is not None:
+            self.video_session.register_tool(self.model, self.ALLOWED_FUNCTION_NAME, self.video_scene_tool)
+
     @staticmethod
     def _build_tool_from_spec(tool_list: list) -> types.Tool:
         if not tool_list:
@@ -78,36 +94,6 @@ class SceneGenerator:
             out = out.replace(f"{{{{ {k} }}}}", v)
         return out
 
-    @staticmethod
-    def _is_rate_limit_error(err: Exception) -> bool:
-        status_code = getattr(err, "status_code", None)
-        if status_code == 429:
-            return True
-
-        code = getattr(err, "code", None)
-        if code == 429:
-            return True
-
-        message = str(err).lower()
-        return (
-            "429" in message
-            or "too many requests" in message
-            or "rate limit" in message
-            or "resource_exhausted" in message
-        )
-
-    @staticmethod
-    def _is_server_error(err: Exception) -> bool:
-        code = getattr(err, "code", None)
-        return code is not None and 500 <= code < 600
-
-    def _generate_content(self, *, model: str, contents, config: types.GenerateContentConfig):
-        return self.client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=config,
-        )
-
     def _extract_function_args(self, response) -> dict:
         calls = getattr(response, "function_calls", None) or []
 
@@ -166,23 +152,20 @@ class SceneGenerator:
             })
         return json.dumps(formatted, ensure_ascii=False, indent=2)
 
-    def generate_scenes(
-        self,
-        file_uri: str,
-        mime_type: str,
-        steps: List[Dict[str, Any]],
-        language: LanguageType,
-    ) -> List[Dict[str, Any]]:
+    def _build_video_prompt(self, steps: List[Dict[str, Any]], language: LanguageType) -> str:
         if not self.video_scene_user_prompt or not self.video_scene_conf:
             raise SceneException(SceneErrorCode.SCENE_GENERATE_FAILED)
 
         steps_json = self._build_steps_json(steps)
-        user_prompt = self._render_prompt(
+        return self._render_prompt(
             self.video_scene_user_prompt,
             language=language.value,
             steps_json=steps_json,
         )
-        contents = [
+
+    @staticmethod
+    def _build_video_contents(file_uri: str, mime_type: str, user_prompt: str) -> list:
+        return [
             types.Content(
                 parts=[
                     types.Part.from_uri(file_uri=file_uri, mime_type=mime_type),
@@ -191,33 +174,112 @@ class SceneGenerator:
             )
         ]
 
+    def _parse_video_response(self, response) -> List[Dict[str, Any]]:
+        return self._validate_scenes(self._extract_function_args(response))
+
+    def _cache_key(
+        self,
+        file_uri: str,
+        mime_type: str,
+        steps: List[Dict[str, Any]],
+        language: LanguageType,
+    ) -> str:
+        return ResultCache.make_key(
+            "scenes",
+            file_uri=file_uri,
+            mime_type=mime_type,
+            language=language.value,
+            model=self.model,
+            prompt_version=self.prompt_version,
+            steps=steps,
+        )
+
+    def _get_cached(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        if self.result_cache is None:
+            return None
+        return self.result_cache.get(cache_key)
+
+    def _set_cached(self, cache_key: str, scenes: List[Dict[str, Any]]) -> None:
+        if self.result_cache is not None:
+            self.result_cache.set(cache_key, scenes)
+
+    def generate_scenes(
+        self,
+        file_uri: str,
+        mime_type: str,
+        steps: List[Dict[str, Any]],
+        language: LanguageType,
+    ) -> List[Dict[str, Any]]:
+        cache_key = self._cache_key(file_uri, mime_type, steps, language)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        user_prompt = self._build_video_prompt(steps, language)
+        if self.video_session is not None:
+            scenes = self.video_session.invoke(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=self.video_scene_routes[0],
+                function_name=self.ALLOWED_FUNCTION_NAME,
+                prompt=user_prompt,
+                parse=self._parse_video_response,
+            )
+            if scenes is not None:
+                self._set_cached(cache_key, scenes)
+                return scenes
+
+        contents = self._build_video_contents(file_uri, mime_type, user_prompt)
+
         try:
-            try:
-                response = self._generate_content(
-                    model=self.model,
-                    contents=contents,
-                    config=self.video_scene_conf,
-                )
-            except (genai_errors.ClientError, genai_errors.ServerError) as e:
-                should_fallback = (
-                    self.fallback_model
-                    and self.fallback_model != self.model
-                    and (self._is_rate_limit_error(e) or self._is_server_error(e))
-                )
-                if not should_fallback:
-                    raise
+            response = self.invoker.invoke(self.video_scene_routes, contents)
+            scenes = self._parse_video_response(response)
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
+            self.logger.exception("Gemini API 호출 중 오류가 발생했습니다.")
+            raise SceneException(SceneErrorCode.SCENE_GENERATE_FAILED) from e
+        except SceneException:
+            raise
+        except Exception as e:
+            self.logger.exception("장면 생성 중 예기치 못한 오류가 발생했습니다.")
+            raise SceneException(SceneErrorCode.SCENE_GENERATE_FAILED) from e
 
-                self.logger.warning(
-                    f"Primary Gemini model unavailable. fallback model={self.fallback_model}"
-                )
-                response = self._generate_content(
-                    model=self.fallback_model,
-                    contents=contents,
-                    config=self.video_scene_conf,
-                )
+        self._set_cached(cache_key, scenes)
+        return scenes
 
-            scene_args = self._extract_function_args(response)
-            return self._validate_scenes(scene_args)
+    async def generate_scenes_async(
+        self,
+        file_uri: str,
+        mime_type: str,
+        steps: List[Dict[str, Any]],
+        language: LanguageType,
+    ) -> List[Dict[str, Any]]:
+        """generate_scenes의 asyncio 네이티브 버전 (client.aio 사용, 스레드 미점유)"""
+        cache_key = self._cache_key(file_uri, mime_type, steps, language)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        user_prompt = self._build_video_prompt(steps, language)
+        if self.video_session is not None:
+            scenes = await self.video_session.invoke_async(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=self.video_scene_routes[0],
+                function_name=self.ALLOWED_FUNCTION_NAME,
+                prompt=user_prompt,
+                parse=self._parse_video_response,
+            )
+            if scenes is not None:
+                self._set_cached(cache_key, scenes)
+                return scenes
+
+        contents = self._build_video_contents(file_uri, mime_type, user_prompt)
+
+        try:
+            response = await self.invoker.invoke_async(self.video_scene_routes, contents)
+            scenes = self._parse_video_response(response)
         except (genai_errors.ClientError, genai_errors.ServerError) as e:
             self.logger.exception("Gemini API 호출 중 오류가 발생했습니다.")
             raise SceneException(SceneErrorCode.SCENE_GENERATE_FAILED) from e
@@ -226,3 +288,6 @@ class SceneGenerator:
         except Exception as e:
             self.logger.exception("장면 생성 중 예기치 못한 오류가 발생했습니다.")
             raise SceneException(SceneErrorCode.SCENE_GENERATE_FAILED) from e
+
+        self._set_cached(cache_key, scenes)
+        return scenes
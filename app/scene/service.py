@@ -1,18 +1,21 @@
 import asyncio
 import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.result_cache import fingerprint
 from app.scene.generator import SceneGenerator
 from app.scene.schema import SceneOut
+from app.singleflight import SingleFlight
 
 
 class SceneService:
-    def __init__(self, generator: SceneGenerator):
+    def __init__(self, generator: SceneGenerator, singleflight: Optional[SingleFlight] = None):
         self.logger = logging.getLogger(__name__)
         self.generator = generator
+        self.singleflight = singleflight
 
     async def generate_scenes(
         self,
@@ -21,14 +24,37 @@ class SceneService:
         steps: List[Dict[str, Any]],
         language: LanguageType,
     ) -> List[Dict[str, Any]]:
-        scenes: List[Dict[str, Any]] = await asyncio.to_thread(
-            self.generator.generate_scenes,
-            file_uri,
-            mime_type,
-            steps,
-            language,
+        if self.singleflight is None:
+            return await self._generate_scenes(file_uri, mime_type, steps, language)
+        return await self.singleflight.do(
+            "scenes",
+            fingerprint(file_uri, mime_type, steps, language.value),
+            lambda: self._generate_scenes(file_uri, mime_type, steps, language),
         )
 
+    async def _generate_scenes(
+        self,
+        file_uri: str,
+        mime_type: str,
+        steps: List[Dict[str, Any]],
+        language: LanguageType,
+    ) -> List[Dict[str, Any]]:
+        if self.generator.invoke_mode == InvokeMode.ASYNC:
+            scenes: List[Dict[str, Any]] = await self.generator.generate_scenes_async(
+                file_uri,
+                mime_type,
+                steps,
+                language,
+            )
+        else:
+            scenes = await asyncio.to_thread(
+                self.generator.generate_scenes,
+                file_uri,
+                mime_type,
+                steps,
+                language,
+            )
+
         self.logger.info(
             f"{len(scenes)}개의 장면 생성 완료. Preview(Top 3): "
             f"{json.dumps(scenes[:3], ensure_ascii=False)}"
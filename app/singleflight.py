@@ -0,0 +1,54 @@
+import asyncio
+import copy
+import logging
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total",
+    "동일 요청 병합 결과 (role=leader: 실제 실행, follower: 진행 중인 결과를 공유)",
+    ["namespace", "role"],
+)
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 하나의 실행으로 병합합니다 (워커 프로세스 단위).
+
+    - 첫 요청(leader)이 작업을 태스크로 시작하고, 이후 요청(follower)은 같은 태스크의 결과를 기다립니다.
+    - 작업은 태스크로 분리되어 있어 leader 요청이 취소되어도 follower는 결과를 받습니다.
+    - 예외도 모든 대기자에게 그대로 전파되며, 완료된 키는 즉시 제거되어 결과를 캐시하지 않습니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, namespace: str, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        flight_key = f"{namespace}:{key}"
+        task = self._inflight.get(flight_key)
+        if task is not None:
+            SINGLEFLIGHT_CALLS.labels(namespace=namespace, role="follower").inc()
+            logger.info(f"[SingleFlight] ▶ 진행 중인 요청에 합류 | key={flight_key}")
+            result = await asyncio.shield(task)
+            # 호출자별로 결과를 수정해도 서로 영향을 주지 않도록 복사본을 반환
+            return copy.deepcopy(result)
+
+        SINGLEFLIGHT_CALLS.labels(namespace=namespace, role="leader").inc()
+        task = asyncio.ensure_future(fn())
+        self._inflight[flight_key] = task
+        task.add_done_callback(lambda _: self._forget(flight_key, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        # 모든 대기자가 취소된 경우 예외가 회수되지 않았다는 경고를 막음
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
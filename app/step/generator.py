@@ -2,16 +2,18 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Any, List
+from typing import Any, List, Optional
 
-from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.gemini_invoker import GeminiInvoker, HedgePolicy, ModelRoute
 from app.gemini_safety import relaxed_safety_settings
+from app.result_cache import ResultCache, fingerprint
 from app.step.exception import StepErrorCode, StepException
 from app.step.schema import StepGroup
+from app.video_session import VideoSessionManager
 
 
 class StepGenerator:
@@ -21,22 +23,31 @@ class StepGenerator:
     def __init__(
         self,
         *,
-        client: genai.Client,
+        invoker: GeminiInvoker,
         model: str,
         fallback_model: str = "gemini-3.0-flash",
         secondary_fallback_model: str = "gemini-3-flash-preview",
         video_step_tool_path: Path,
         video_summarize_user_prompt_path: Path,
+        invoke_mode: str = InvokeMode.THREAD,
+        hedge_policy: Optional[HedgePolicy] = None,
+        result_cache: Optional[ResultCache] = None,
+        video_session: Optional[VideoSessionManager] = None,
     ):
         self.logger = logging.getLogger(__name__)
-        self.client = client
+        self.invoker = invoker
+        self.invoke_mode = InvokeMode(invoke_mode)
         self.model = model
         self.fallback_model = fallback_model
         self.secondary_fallback_model = secondary_fallback_model
+        self.hedge_policy = hedge_policy or HedgePolicy(name="step_video")
+        self.result_cache = result_cache
+        self.video_session = video_session
 
         self.video_summarize_user_prompt = video_summarize_user_prompt_path.read_text(encoding="utf-8")
         video_step_tool_spec = json.loads(video_step_tool_path.read_text(encoding="utf-8"))
         self.video_step_tool = self._build_tool_from_spec(video_step_tool_spec)
+        self.prompt_version = fingerprint(self.video_summarize_user_prompt, video_step_tool_spec)
 
         self.video_step_conf = types.GenerateContentConfig(
             temperature=0.0,
@@ -65,6 +76,14 @@ class StepGenerator:
             ),
         )
 
+        self.video_step_routes = [
+            ModelRoute(self.model, self.video_step_conf),
+            ModelRoute(self.fallback_model, self.video_step_conf),
+            ModelRoute(self.secondary_fallback_model, self.video_step_conf_thinking),
+        ]
+        if self.video_session is not None:
+            self.video_session.register_tool(self.model, self.VIDEO_ALLOWED_FUNCTION_NAME, self.video_step_tool)
+
     @staticmethod
     def _build_tool_from_spec(tool_list: list) -> types.Tool:
         if not tool_list:
@@ -92,36 +111,6 @@ class StepGenerator:
             out = out.replace(f"{{{{ {k} }}}}", v)
         return out
 
-    @staticmethod
-    def _is_rate_limit_error(err: Exception) -> bool:
-        status_code = getattr(err, "status_code", None)
-        if status_code == 429:
-            return True
-
-        code = getattr(err, "code", None)
-        if code == 429:
-            return True
-
-        message = str(err).lower()
-        return (
-            "429" in message
-            or "too many requests" in message
-            or "rate limit" in message
-            or "resource_exhausted" in message
-        )
-
-    @staticmethod
-    def _is_server_error(err: Exception) -> bool:
-        code = getattr(err, "code", None)
-        return code is not None and 500 <= code < 600
-
-    def _generate_content(self, *, model: str, contents, config: types.GenerateContentConfig):
-        return self.client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=config,
-        )
-
     def _extract_emit_steps_args(self, response, allowed_function_name: str) -> dict:
         calls = getattr(response, "function_calls", None) or []
 
@@ -208,15 +197,17 @@ class StepGenerator:
             self.logger.exception("Gemini API 응답 형식이 올바르지 않습니다.")
             raise StepException(StepErrorCode.STEP_GENERATE_FAILED) from e
 
-    def summarize_video(self, file_uri: str, mime_type: str, language: LanguageType) -> List[StepGroup]:
+    def _build_video_prompt(self, language: LanguageType) -> str:
         if not self.video_summarize_user_prompt or not self.video_step_conf:
              raise StepException(StepErrorCode.STEP_GENERATE_FAILED, "Video summarization is not configured.")
 
-        user_prompt = self._render_prompt(
+        return self._render_prompt(
             self.video_summarize_user_prompt,
             language=language.value,
         )
-        contents = [
+
+    def _build_video_contents(self, file_uri: str, mime_type: str, user_prompt: str) -> list:
+        return [
             types.Content(
                 parts=[
                     types.Part.from_uri(file_uri=file_uri, mime_type=mime_type),
@@ -225,46 +216,106 @@ class StepGenerator:
             )
         ]
 
+    def _parse_video_response(self, response) -> List[StepGroup]:
+        step_args = self._extract_emit_steps_args(response, self.VIDEO_ALLOWED_FUNCTION_NAME)
+        normalized_step_args = self._normalize_step_args(step_args)
+        return self._parse_steps(normalized_step_args)
+
+    def _cache_key(self, file_uri: str, mime_type: str, language: LanguageType) -> str:
+        return ResultCache.make_key(
+            "steps",
+            file_uri=file_uri,
+            mime_type=mime_type,
+            language=language.value,
+            model=self.model,
+            prompt_version=self.prompt_version,
+        )
+
+    def _get_cached(self, cache_key: str) -> Optional[List[StepGroup]]:
+        if self.result_cache is None:
+            return None
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+        return [StepGroup(**s) for s in cached]
+
+    def _set_cached(self, cache_key: str, steps: List[StepGroup]) -> None:
+        if self.result_cache is not None:
+            self.result_cache.set(cache_key, [s.model_dump() for s in steps])
+
+    def summarize_video(self, file_uri: str, mime_type: str, language: LanguageType) -> List[StepGroup]:
+        cache_key = self._cache_key(file_uri, mime_type, language)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        user_prompt = self._build_video_prompt(language)
+        if self.video_session is not None:
+            steps = self.video_session.invoke(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=self.video_step_routes[0],
+                function_name=self.VIDEO_ALLOWED_FUNCTION_NAME,
+                prompt=user_prompt,
+                parse=self._parse_video_response,
+            )
+            if steps is not None:
+                self._set_cached(cache_key, steps)
+                return steps
+
+        contents = self._build_video_contents(file_uri, mime_type, user_prompt)
+
         try:
-            try:
-                response = self._generate_content(
-                    model=self.model,
-                    contents=contents,
-                    config=self.video_step_conf,
-                )
-            except (genai_errors.ClientError, genai_errors.ServerError) as e:
-                should_fallback = (
-                    self.fallback_model
-                    and self.fallback_model != self.model
-                    and (self._is_rate_limit_error(e) or self._is_server_error(e))
-                )
-                if not should_fallback:
-                    raise
+            steps = self.invoker.invoke_hedged(
+                self.video_step_routes,
+                contents,
+                policy=self.hedge_policy,
+                parse=self._parse_video_response,
+            )
+        except (genai_errors.ClientError, genai_errors.ServerError) as e:
+            self.logger.exception("Gemini API 호출 중 오류가 발생했습니다.")
+            raise StepException(StepErrorCode.STEP_GENERATE_FAILED) from e
+        except StepException:
+            raise
+        except Exception as e:
+            self.logger.exception("단계 생성 중 예기치 못한 오류가 발생했습니다.")
+            raise StepException(StepErrorCode.STEP_GENERATE_FAILED) from e
 
-                self.logger.warning(
-                    f"Primary Gemini model unavailable. fallback model={self.fallback_model}"
-                )
-                try:
-                    response = self._generate_content(
-                        model=self.fallback_model,
-                        contents=contents,
-                        config=self.video_step_conf,
-                    )
-                except (genai_errors.ClientError, genai_errors.ServerError) as e2:
-                    if not (self._is_rate_limit_error(e2) or self._is_server_error(e2)):
-                        raise
-                    self.logger.warning(
-                        f"Fallback model also unavailable. secondary fallback={self.secondary_fallback_model}"
-                    )
-                    response = self._generate_content(
-                        model=self.secondary_fallback_model,
-                        contents=contents,
-                        config=self.video_step_conf_thinking,
-                    )
+        self._set_cached(cache_key, steps)
+        return steps
+
+    async def summarize_video_async(self, file_uri: str, mime_type: str, language: LanguageType) -> List[StepGroup]:
+        """summarize_video의 asyncio 네이티브 버전 (client.aio 사용, 스레드 미점유)"""
+        cache_key = self._cache_key(file_uri, mime_type, language)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        user_prompt = self._build_video_prompt(language)
+        if self.video_session is not None:
+            steps = await self.video_session.invoke_async(
+                self.invoker,
+                file_uri=file_uri,
+                mime_type=mime_type,
+                route=self.video_step_routes[0],
+                function_name=self.VIDEO_ALLOWED_FUNCTION_NAME,
+                prompt=user_prompt,
+                parse=self._parse_video_response,
+            )
+            if steps is not None:
+                self._set_cached(cache_key, steps)
+                return steps
+
+        contents = self._build_video_contents(file_uri, mime_type, user_prompt)
 
-            step_args = self._extract_emit_steps_args(response, self.VIDEO_ALLOWED_FUNCTION_NAME)
-            normalized_step_args = self._normalize_step_args(step_args)
-            return self._parse_steps(normalized_step_args)
+        try:
+            steps = await self.invoker.invoke_hedged_async(
+                self.video_step_routes,
+                contents,
+                policy=self.hedge_policy,
+                parse=self._parse_video_response,
+            )
         except (genai_errors.ClientError, genai_errors.ServerError) as e:
             self.logger.exception("Gemini API 호출 중 오류가 발생했습니다.")
             raise StepException(StepErrorCode.STEP_GENERATE_FAILED) from e
@@ -273,3 +324,6 @@ class StepGenerator:
         except Exception as e:
             self.logger.exception("단계 생성 중 예기치 못한 오류가 발생했습니다.")
             raise StepException(StepErrorCode.STEP_GENERATE_FAILED) from e
+
+        self._set_cached(cache_key, steps)
+        return steps
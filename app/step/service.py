@@ -1,26 +1,41 @@
 import asyncio
 import json
 import logging
-from typing import List
+from typing import List, Optional
 
-from app.enum import LanguageType
+from app.enum import InvokeMode, LanguageType
+from app.singleflight import SingleFlight
+from app.result_cache import fingerprint
 from app.step.generator import StepGenerator
 from app.step.schema import StepGroup
 
 
 class StepService:
-    def __init__(self, generator: StepGenerator):
+    def __init__(self, generator: StepGenerator, singleflight: Optional[SingleFlight] = None):
         self.logger = logging.getLogger(__name__)
         self.generator = generator
+        self.singleflight = singleflight
 
     async def generate_by_video(self, file_uri: str, mime_type: str, language: LanguageType) -> List[StepGroup]:
-        steps: List[StepGroup] = await asyncio.to_thread(
-            self.generator.summarize_video,
-            file_uri,
-            mime_type,
-            language,
+        if self.singleflight is None:
+            return await self._generate_by_video(file_uri, mime_type, language)
+        return await self.singleflight.do(
+            "steps",
+            fingerprint(file_uri, mime_type, language.value),
+            lambda: self._generate_by_video(file_uri, mime_type, language),
         )
 
+    async def _generate_by_video(self, file_uri: str, mime_type: str, language: LanguageType) -> List[StepGroup]:
+        if self.generator.invoke_mode == InvokeMode.ASYNC:
+            steps: List[StepGroup] = await self.generator.summarize_video_async(file_uri, mime_type, language)
+        else:
+            steps = await asyncio.to_thread(
+                self.generator.summarize_video,
+                file_uri,
+                mime_type,
+                language,
+            )
+
         preview_steps = [s.model_dump() for s in steps[:3]]
         self.logger.info(f"{len(steps)}개의 스텝 생성 완료 (Video). Preview(Top 3): {json.dumps(preview_steps, ensure_ascii=False)}")
 
@@ -0,0 +1,32 @@
+from typing import Any
+
+from google.genai import types
+
+# MEDIA_RESOLUTION_LOW 기준 영상 1건의 대략적인 입력 토큰 (약 100 tokens/s * 5분)
+DEFAULT_VIDEO_TOKENS = 30_000
+
+
+def estimate_text_tokens(text: str) -> int:
+    """문자 수 기반의 보수적인 토큰 추정치 (한글은 글자당 토큰 비중이 높아 chars/3 사용)"""
+    if not text:
+        return 0
+    return max(1, len(text) // 3)
+
+
+def estimate_tokens(contents: Any, *, video_tokens: int = DEFAULT_VIDEO_TOKENS) -> int:
+    """generate_content에 넘기는 contents의 입력 토큰을 요청 전에 대략 추정합니다."""
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return estimate_text_tokens(contents)
+    if isinstance(contents, (list, tuple)):
+        return sum(estimate_tokens(item, video_tokens=video_tokens) for item in contents)
+    if isinstance(contents, types.Content):
+        return sum(estimate_tokens(part, video_tokens=video_tokens) for part in contents.parts or [])
+    if isinstance(contents, types.Part):
+        if contents.text:
+            return estimate_text_tokens(contents.text)
+        if contents.file_data is not None:
+            return video_tokens
+        return 0
+    return 0
@@ -4,15 +4,54 @@ import logging
 import os
 import random
 import time
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 
-import requests
+import httpx
+from prometheus_client import Counter, Gauge
 
 from app.verify.exception import VerifyException, VerifyErrorCode
 
 logger = logging.getLogger(__name__)
 
+UPLOADER_REQUESTS = Counter(
+    "uploader_requests_total",
+    "업로드 서비스 호출 결과 (success, retryable, client_error)",
+    ["url", "outcome"],
+)
+UPLOADER_EJECTIONS = Counter(
+    "uploader_ejections_total",
+    "연속 실패로 일시 제외된 업로드 서비스 URL 횟수",
+    ["url"],
+)
+UPLOADER_OUTSTANDING = Gauge(
+    "uploader_outstanding_requests",
+    "업로드 서비스 URL별 진행 중인 요청 수",
+    ["url"],
+)
+
+
+class _RetryableUploadError(Exception):
+    pass
+
+
+@dataclass
+class _UpstreamStats:
+    """업로드 서비스 URL별 상태 (지연 EWMA, 오류율 EWMA, 진행 중 요청 수, 제외 기한)"""
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+
 class VerifyClient:
+    # EWMA 가중치 / 연속 실패 시 제외 기준
+    EWMA_ALPHA = 0.3
+    EJECT_AFTER_FAILURES = 3
+    EJECT_SECONDS = 30.0
+    MAX_POOL_CONNECTIONS = 64
+
     def __init__(
         self,
         upload_service_urls: List[str],
@@ -20,6 +59,136 @@ class VerifyClient:
     ):
         self.upload_service_urls = [url.strip() for url in upload_service_urls if url and url.strip()]
         self.request_timeout_seconds = request_timeout_seconds
+        self._stats: Dict[str, _UpstreamStats] = {url: _UpstreamStats() for url in self.upload_service_urls}
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        # 이벤트 루프에 묶이므로 첫 요청 시점에 생성하고 이후 연결 풀을 재사용
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.request_timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.MAX_POOL_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_POOL_CONNECTIONS,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _score(self, url: str) -> float:
+        stats = self._stats[url]
+        # 관측값이 없는 URL은 평균 수준으로 취급해 한 번은 시도되도록 함
+        known = [s.latency_ewma for s in self._stats.values() if s.latency_ewma is not None]
+        latency = stats.latency_ewma if stats.latency_ewma is not None else (sum(known) / len(known) if known else 1.0)
+        return latency * (stats.outstanding + 1) * (1.0 + 4.0 * stats.error_ewma)
+
+    def _pick_url(self, exclude: Optional[str] = None) -> str:
+        """제외(ejected)되지 않은 URL 중 두 개를 무작위로 골라 점수가 낮은 쪽을 선택합니다 (power of two choices)."""
+        now = time.monotonic()
+        candidates = [u for u in self.upload_service_urls if u != exclude and self._stats[u].ejected_until <= now]
+        if not candidates:
+            # 모두 제외 상태면 제외 기한이 가장 먼저 끝나는 URL을 사용
+            others = [u for u in self.upload_service_urls if u != exclude] or self.upload_service_urls
+            return min(others, key=lambda u: self._stats[u].ejected_until)
+        if len(candidates) == 1:
+            return candidates[0]
+        a, b = random.sample(candidates, 2)
+        return a if self._score(a) <= self._score(b) else b
+
+    def _record(self, url: str, elapsed: float, failed: bool) -> None:
+        stats = self._stats[url]
+        alpha = self.EWMA_ALPHA
+        stats.error_ewma = (1 - alpha) * stats.error_ewma + alpha * (1.0 if failed else 0.0)
+        if failed:
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.EJECT_AFTER_FAILURES:
+                stats.ejected_until = time.monotonic() + self.EJECT_SECONDS
+                stats.consecutive_failures = 0
+                UPLOADER_EJECTIONS.labels(url=url).inc()
+                logger.warning(f"[VerifyClient] ▶ 연속 실패로 업로드 URL 일시 제외 | URL={url} | seconds={self.EJECT_SECONDS}")
+            return
+        stats.consecutive_failures = 0
+        stats.latency_ewma = elapsed if stats.latency_ewma is None else (1 - alpha) * stats.latency_ewma + alpha * elapsed
+
+    @staticmethod
+    async def _sleep_backoff(attempt: int, base_delay: float, max_delay: float) -> None:
+        delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+        jitter = random.uniform(0, delay * 0.1)
+        await asyncio.sleep(delay + jitter)
+
+    @staticmethod
+    def _parse_upload_response(video_id: str, data: Any) -> Dict[str, Any]:
+        # 일부 서비스는 proxy 호환 포맷(statusCode/body)을 반환할 수 있으므로 호환 처리
+        if isinstance(data, dict) and "statusCode" in data:
+            status_code = data.get("statusCode")
+            if isinstance(status_code, int) and status_code >= 500:
+                raise _RetryableUploadError(f"upload_status={status_code}")
+            if isinstance(status_code, int) and status_code >= 400:
+                body = data.get("body", {})
+                if isinstance(body, str):
+                    try:
+                        body = json.loads(body)
+                    except json.JSONDecodeError:
+                        pass
+                error_msg = body.get("error", "알 수 없는 업로드 서비스 오류")
+                raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 서비스 클라이언트 오류: {error_msg}")
+
+            if "body" in data:
+                body = data["body"]
+                if isinstance(body, str):
+                    try:
+                        body = json.loads(body)
+                    except Exception:
+                        pass
+                if isinstance(body, dict) and "file_uri" in body:
+                    return body
+
+        if isinstance(data, dict) and "file_uri" in data:
+            return data
+
+        logger.error(f"[VerifyClient] ▶ 예상치 못한 업로드 응답 형식 | video_id={video_id} | response={data}")
+        raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR, "업로드 응답 형식 오류 (file_uri 없음)")
+
+    async def _post(self, url: str, video_id: str, payload_json: str) -> Dict[str, Any]:
+        stats = self._stats[url]
+        stats.outstanding += 1
+        UPLOADER_OUTSTANDING.labels(url=url).set(stats.outstanding)
+        started = time.monotonic()
+        failed = True
+        try:
+            res = await self._get_http().post(
+                url,
+                content=payload_json,
+                headers={"Content-Type": "application/json"},
+            )
+            logger.info(f"[VerifyClient] ▶ 업로드 응답 수신 | status={res.status_code} | body={res.text[:1000]}")
+
+            if res.status_code >= 500:
+                raise _RetryableUploadError(f"status={res.status_code}")
+            if res.status_code >= 400:
+                UPLOADER_REQUESTS.labels(url=url, outcome="client_error").inc()
+                logger.error(f"[VerifyClient] ▶ 비재시도 HTTP 오류 | status={res.status_code}")
+                raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 HTTP 오류: status={res.status_code}")
+
+            result = self._parse_upload_response(video_id, res.json())
+            failed = False
+            UPLOADER_REQUESTS.labels(url=url, outcome="success").inc()
+            return result
+        except (_RetryableUploadError, httpx.TransportError):
+            UPLOADER_REQUESTS.labels(url=url, outcome="retryable").inc()
+            raise
+        except (VerifyException, asyncio.CancelledError):
+            # 요청 자체의 문제(4xx)나 호출자 취소는 URL 상태에 반영하지 않음
+            failed = False
+            raise
+        finally:
+            stats.outstanding -= 1
+            UPLOADER_OUTSTANDING.labels(url=url).set(stats.outstanding)
+            self._record(url, time.monotonic() - started, failed)
 
     async def upload_video_to_gemini(self, video_id: str) -> Dict[str, Any]:
         """
@@ -30,98 +199,35 @@ class VerifyClient:
         if not self.upload_service_urls:
             raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR, "업로드 서비스 URL이 비어 있습니다.")
 
-        class _RetryableUploadError(Exception):
-            pass
-
-        def sleep_backoff(attempt: int, base_delay: float, max_delay: float) -> None:
-            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
-            jitter = random.uniform(0, delay * 0.1)
-            time.sleep(delay + jitter)
-
-        def call_sync():
-            payload_json = json.dumps({"video_id": video_id, "action": "upload"}, separators=(",", ":"))
-
-            max_attempts = int(os.getenv("VERIFY_UPLOAD_MAX_ATTEMPTS", "4"))
-            base_delay = float(os.getenv("VERIFY_UPLOAD_BACKOFF_BASE", "0.5"))
-            max_delay = float(os.getenv("VERIFY_UPLOAD_BACKOFF_MAX", "6.0"))
-
-            url = None
-
-            for attempt in range(1, max_attempts + 1):
-                try:
-                    if attempt > 1 and len(self.upload_service_urls) > 1 and url:
-                        candidates = [u for u in self.upload_service_urls if u != url]
-                        if candidates:
-                            url = random.choice(candidates)
-                        else:
-                            url = random.choice(self.upload_service_urls)
-                    else:
-                        url = random.choice(self.upload_service_urls)
-
-                    logger.info(f"[VerifyClient] ▶ 업로드 요청 시도 | URL={url} | video_id={video_id}")
-                    res = requests.post(
-                        url,
-                        data=payload_json,
-                        headers={"Content-Type": "application/json"},
-                        timeout=self.request_timeout_seconds,
-                    )
-
-                    logger.info(f"[VerifyClient] ▶ 업로드 응답 수신 | status={res.status_code} | body={res.text[:1000]}")
-
-                    if res.status_code >= 500:
-                        raise _RetryableUploadError(f"status={res.status_code}")
-
-                    res.raise_for_status()
-                    data = res.json()
-
-                    # 일부 서비스는 proxy 호환 포맷(statusCode/body)을 반환할 수 있으므로 호환 처리
-                    if isinstance(data, dict) and "statusCode" in data:
-                        status_code = data.get("statusCode")
-                        if isinstance(status_code, int) and status_code >= 500:
-                            raise _RetryableUploadError(f"upload_status={status_code}")
-                        if isinstance(status_code, int) and status_code >= 400:
-                            body = data.get("body", {})
-                            if isinstance(body, str):
-                                try:
-                                    body = json.loads(body)
-                                except json.JSONDecodeError:
-                                    pass
-                            error_msg = body.get("error", "알 수 없는 업로드 서비스 오류")
-                            raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 서비스 클라이언트 오류: {error_msg}")
-
-                        if "body" in data:
-                            body = data["body"]
-                            if isinstance(body, str):
-                                try:
-                                    body = json.loads(body)
-                                except Exception:
-                                    pass
-                            if isinstance(body, dict) and "file_uri" in body:
-                                return body
-
-                    if isinstance(data, dict) and "file_uri" in data:
-                        return data
-
-                    logger.error(f"[VerifyClient] ▶ 예상치 못한 업로드 응답 형식 | video_id={video_id} | response={data}")
-                    raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR, "업로드 응답 형식 오류 (file_uri 없음)")
-
-                except _RetryableUploadError as e:
-                    logger.warning(f"[VerifyClient] ▶ 5xx 응답 감지 (재시도) | attempt={attempt}/{max_attempts} | err={e}")
-                    if attempt == max_attempts:
-                        raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR, f"업로드 호출 재시도 실패: {e}")
-                    sleep_backoff(attempt, base_delay, max_delay)
-                except requests.RequestException as e:
-                    status = getattr(e.response, "status_code", None)
-                    if status is not None and status < 500:
-                        logger.error(f"[VerifyClient] ▶ 비재시도 HTTP 오류 | status={status} | err={e}")
-                        raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 HTTP 오류: {e}")
-                    logger.warning(f"[VerifyClient] ▶ 요청 오류 (재시도) | attempt={attempt}/{max_attempts} | err={e}")
-                    if attempt == max_attempts:
-                        raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 호출 요청 실패: {e}")
-                    sleep_backoff(attempt, base_delay, max_delay)
-                except Exception as e:
-                    logger.error(f"[VerifyClient] ▶ 업로드 호출 중 예상치 못한 오류 | video_id={video_id} | error={e}")
-                    raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 호출 중 예상치 못한 오류: {e}")
-
-            raise VerifyException(VerifyErrorCode.VERIFY_FAILED, "업로드 호출 실패 (최대 재시도 횟수 초과)")
-        return await asyncio.to_thread(call_sync)
+        payload_json = json.dumps({"video_id": video_id, "action": "upload"}, separators=(",", ":"))
+
+        max_attempts = int(os.getenv("VERIFY_UPLOAD_MAX_ATTEMPTS", "4"))
+        base_delay = float(os.getenv("VERIFY_UPLOAD_BACKOFF_BASE", "0.5"))
+        max_delay = float(os.getenv("VERIFY_UPLOAD_BACKOFF_MAX", "6.0"))
+
+        url = None
+
+        for attempt in range(1, max_attempts + 1):
+            # 재시도 시에는 직전에 실패한 URL을 제외
+            url = self._pick_url(exclude=url if attempt > 1 else None)
+            try:
+                logger.info(f"[VerifyClient] ▶ 업로드 요청 시도 | URL={url} | video_id={video_id}")
+                return await self._post(url, video_id, payload_json)
+
+            except _RetryableUploadError as e:
+                logger.warning(f"[VerifyClient] ▶ 5xx 응답 감지 (재시도) | attempt={attempt}/{max_attempts} | err={e}")
+                if attempt == max_attempts:
+                    raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR, f"업로드 호출 재시도 실패: {e}")
+                await self._sleep_backoff(attempt, base_delay, max_delay)
+            except httpx.TransportError as e:
+                logger.warning(f"[VerifyClient] ▶ 요청 오류 (재시도) | attempt={attempt}/{max_attempts} | err={e}")
+                if attempt == max_attempts:
+                    raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 호출 요청 실패: {e}")
+                await self._sleep_backoff(attempt, base_delay, max_delay)
+            except VerifyException:
+                raise
+            except Exception as e:
+                logger.error(f"[VerifyClient] ▶ 업로드 호출 중 예상치 못한 오류 | video_id={video_id} | error={e}")
+                raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"업로드 호출 중 예상치 못한 오류: {e}")
+
+        raise VerifyException(VerifyErrorCode.VERIFY_FAILED, "업로드 호출 실패 (최대 재시도 횟수 초과)")
@@ -0,0 +1,247 @@
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+
+from google import genai
+from google.genai import errors as genai_errors
+from prometheus_client import Counter, Gauge
+
+from app.gemini_invoker import is_rate_limit_error, parse_retry_after
+from app.local_store import connect_sqlite
+from app.verify.file_registry import UploadedFileRegistry
+from app.video_session import VideoSessionManager
+
+GEMINI_FILE_DELETE_QUEUE_DEPTH = Gauge(
+    "gemini_file_delete_queue_depth",
+    "삭제 대기 중인 Gemini 파일 수",
+)
+GEMINI_FILE_DELETIONS = Counter(
+    "gemini_file_deletions_total",
+    "Gemini 파일 삭제 결과 (source=request, sweep / outcome=deleted, missing, failed)",
+    ["source", "outcome"],
+)
+GEMINI_ORPHAN_FILES_RECLAIMED = Counter(
+    "gemini_orphan_files_reclaimed_total",
+    "정리 요청 없이 남아 있다가 주기적 스윕으로 삭제된 Gemini 파일 수",
+)
+
+
+class GeminiFileJanitor:
+    """Gemini 파일 삭제를 백그라운드로 처리하고, 정리 요청이 오지 않은 오래된 파일을 주기적으로 회수합니다.
+
+    - enqueue()는 즉시 반환하며, 워커가 최대 batch_size개씩 동시에 삭제합니다.
+      실패한 삭제는 배치 안에서 기다리지 않고 재시도 시각(not-before)을 붙여 다시 큐에 넣습니다.
+    - 스윕은 이 서비스가 업로드해 track()으로 기록한 파일 중 max_age_seconds보다 오래되었고
+      레지스트리/영상 세션이 참조하지 않는 파일만 삭제합니다 (같은 API 키의 다른 파일은 건드리지 않음).
+      여러 워커 중 하나만 스윕하도록 로컬 SQLite 임대(lease)를 사용합니다.
+    """
+
+    MAX_DELETE_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        *,
+        client: genai.Client,
+        file_registry: UploadedFileRegistry,
+        path: str,
+        video_session: Optional[VideoSessionManager] = None,
+        max_age_seconds: float = 6 * 3600,
+        sweep_interval_seconds: float = 600.0,
+        batch_size: int = 8,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.file_registry = file_registry
+        self.video_session = video_session
+        self.max_age_seconds = max_age_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.batch_size = batch_size
+
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._conn = connect_sqlite(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS janitor_leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS janitor_uploads (
+                name TEXT PRIMARY KEY,
+                uri TEXT NOT NULL,
+                uploaded_at REAL NOT NULL
+            )
+            """
+        )
+        self._lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        # 재시도 대기 중인 삭제 (not_before(monotonic), file_name, source, attempt)
+        self._delayed: List[Tuple[float, str, str, int]] = []
+        self._queued: Set[str] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    # ----- 업로드 기록 -----
+
+    def track(self, file_name: str, file_uri: str) -> None:
+        """이 서비스가 업로드한 파일을 기록합니다 (스윕 대상은 기록된 파일로 한정)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO janitor_uploads (name, uri, uploaded_at) VALUES (?, ?, ?)",
+                (file_name, file_uri, time.time()),
+            )
+
+    def _untrack(self, file_name: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM janitor_uploads WHERE name = ?", (file_name,))
+
+    # ----- 삭제 큐 -----
+
+    def enqueue(self, file_name: str, *, source: str = "request", attempt: int = 1, delay_seconds: float = 0.0) -> None:
+        """삭제를 예약하고 즉시 반환합니다. 이미 대기 중인 파일은 무시합니다."""
+        if file_name in self._queued:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._queued.add(file_name)
+        if delay_seconds > 0:
+            heapq.heappush(self._delayed, (time.monotonic() + delay_seconds, file_name, source, attempt))
+        else:
+            self._queue.put_nowait((file_name, source, attempt))
+        self._set_depth()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+
+    def _set_depth(self) -> None:
+        GEMINI_FILE_DELETE_QUEUE_DEPTH.set(self._queue.qsize() + len(self._delayed))
+
+    def _promote_due(self) -> None:
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, file_name, source, attempt = heapq.heappop(self._delayed)
+            self._queue.put_nowait((file_name, source, attempt))
+
+    async def _drain(self) -> None:
+        while self._queue is not None:
+            self._promote_due()
+            if self._queue.empty():
+                if not self._delayed:
+                    return
+                # 다음 재시도 시각까지 대기 (진행 중인 배치는 없음)
+                await asyncio.sleep(max(0.0, self._delayed[0][0] - time.monotonic()))
+                continue
+            batch = []
+            while not self._queue.empty() and len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+            self._set_depth()
+            await asyncio.gather(*(self._delete(*item) for item in batch))
+
+    async def _delete(self, file_name: str, source: str, attempt: int) -> None:
+        self._queued.discard(file_name)
+        try:
+            await self.client.aio.files.delete(name=file_name)
+            outcome = "deleted"
+            self.logger.info(f"[GeminiFileJanitor] ▶ 파일 삭제 성공 | file_name={file_name} | source={source}")
+        except genai_errors.ClientError as e:
+            if getattr(e, "code", None) in (403, 404):
+                # 이미 삭제되었거나 만료된 파일
+                outcome = "missing"
+            else:
+                outcome = "failed"
+                # 429(RESOURCE_EXHAUSTED)/408은 재시도, 그 밖의 4xx는 스윕에 맡김
+                self._delete_failed(file_name, source, attempt, e, retry=is_rate_limit_error(e) or getattr(e, "code", None) == 408)
+        except Exception as e:
+            outcome = "failed"
+            self._delete_failed(file_name, source, attempt, e, retry=True)
+
+        if outcome != "failed":
+            await asyncio.to_thread(self._untrack, file_name)
+        GEMINI_FILE_DELETIONS.labels(source=source, outcome=outcome).inc()
+        if source == "sweep" and outcome == "deleted":
+            GEMINI_ORPHAN_FILES_RECLAIMED.inc()
+
+    def _delete_failed(self, file_name: str, source: str, attempt: int, error: Exception, *, retry: bool) -> None:
+        self.logger.warning(f"[GeminiFileJanitor] ▶ 파일 삭제 실패 | file_name={file_name} | attempt={attempt} | error={error}")
+        if retry and attempt < self.MAX_DELETE_ATTEMPTS:
+            # 같은 배치의 다른 삭제를 막지 않도록 대기 없이 재시도 시각을 붙여 다시 예약
+            delay = max(float(2 ** attempt), parse_retry_after(error) or 0.0)
+            self.enqueue(file_name, source=source, attempt=attempt + 1, delay_seconds=delay)
+
+    # ----- 주기적 스윕 -----
+
+    def _try_lease(self, name: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute("SELECT owner, expires_at FROM janitor_leases WHERE name = ?", (name,)).fetchone()
+                acquired = row is None or row[0] == self._owner or row[1] <= now
+                if acquired:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO janitor_leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                        (name, self._owner, now + ttl_seconds),
+                    )
+                self._conn.execute("COMMIT")
+                return acquired
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self.logger.warning(f"[GeminiFileJanitor] ▶ 스윕 임대 확인 실패 | error={e}")
+                return False
+
+    def _stale_uploads(self) -> List[Tuple[str, str]]:
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, uri FROM janitor_uploads WHERE uploaded_at <= ?",
+                (cutoff,),
+            ).fetchall()
+
+    def _is_referenced(self, file_name: str, file_uri: str) -> bool:
+        if self.file_registry.is_referenced(file_name):
+            return True
+        return self.video_session is not None and self.video_session.has_session(file_uri)
+
+    async def sweep(self) -> int:
+        """이 서비스가 업로드한 파일 중 오래된 미참조 파일을 삭제 큐에 넣고, 넣은 개수를 반환합니다."""
+        reclaimed = 0
+        for file_name, file_uri in await asyncio.to_thread(self._stale_uploads):
+            if await asyncio.to_thread(self._is_referenced, file_name, file_uri):
+                continue
+            self.enqueue(file_name, source="sweep")
+            reclaimed += 1
+
+        if reclaimed:
+            self.logger.info(f"[GeminiFileJanitor] ▶ 오래된 파일 회수 예약 | count={reclaimed}")
+        return reclaimed
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            if not await asyncio.to_thread(self._try_lease, "gemini_file_sweep", self.sweep_interval_seconds * 1.5):
+                continue
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.logger.warning(f"[GeminiFileJanitor] ▶ 파일 스윕 실패 | error={e}")
+
+    def start(self) -> None:
+        if self.sweep_interval_seconds > 0 and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        # 종료 전에 이미 예약된 삭제는 최대한 처리
+        if self._worker is not None and not self._worker.done():
+            await asyncio.wait({self._worker}, timeout=5.0)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from google import genai
+from prometheus_client import Counter, Histogram
+
+from app.verify.exception import VerifyErrorCode, VerifyException
+
+GEMINI_FILE_STATUS_CALLS = Counter(
+    "gemini_file_status_calls_total",
+    "Gemini 파일 상태 조회 호출 수 (method=get, list)",
+    ["method"],
+)
+GEMINI_FILE_ACTIVATION_SECONDS = Histogram(
+    "gemini_file_activation_seconds",
+    "업로드 후 파일이 ACTIVE가 될 때까지 걸린 시간",
+    buckets=(0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60, 120, 300),
+)
+
+
+@dataclass
+class _PendingFile:
+    name: str
+    future: asyncio.Future
+    started_at: float
+    deadline: float
+    next_poll_at: float
+    delay: float
+    size_bytes: Optional[int] = None
+    polls: int = 0
+
+
+@dataclass
+class _ActivationModel:
+    """파일 크기(MB)당 활성화 시간과 전체 평균 활성화 시간의 EWMA"""
+    alpha: float = 0.2
+    seconds_per_mb: Optional[float] = None
+    seconds: Optional[float] = None
+
+    def observe(self, elapsed: float, size_bytes: Optional[int]) -> None:
+        self.seconds = elapsed if self.seconds is None else (1 - self.alpha) * self.seconds + self.alpha * elapsed
+        if size_bytes:
+            rate = elapsed / max(size_bytes / (1024 * 1024), 1.0)
+            self.seconds_per_mb = (
+                rate if self.seconds_per_mb is None else (1 - self.alpha) * self.seconds_per_mb + self.alpha * rate
+            )
+
+    def expect(self, size_bytes: Optional[int]) -> Optional[float]:
+        if size_bytes and self.seconds_per_mb is not None:
+            return self.seconds_per_mb * max(size_bytes / (1024 * 1024), 1.0)
+        return self.seconds
+
+
+class FileActivationPoller:
+    """업로드된 Gemini 파일이 ACTIVE가 될 때까지 기다리는 프로세스 공용 폴러.
+
+    - 파일마다 약 200ms에서 시작해 점점 늘어나는 간격으로 조회하며, 학습된 예상 활성화 시간이 있으면 첫 조회를 그 시점 근처로 미룹니다.
+    - 동시에 확인할 파일이 batch_threshold개 이상이면 files.get 대신 files.list 한 번으로 상태를 확인합니다.
+    - 같은 파일을 기다리는 요청들은 하나의 future를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: genai.Client,
+        initial_delay_seconds: float = 0.2,
+        max_delay_seconds: float = 4.0,
+        backoff: float = 1.6,
+        timeout_seconds: float = 300.0,
+        batch_threshold: int = 4,
+        list_page_size: int = 100,
+        max_list_pages: int = 5,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.initial_delay_seconds = initial_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.backoff = backoff
+        self.timeout_seconds = timeout_seconds
+        self.batch_threshold = batch_threshold
+        self.list_page_size = list_page_size
+        self.max_list_pages = max_list_pages
+
+        self._model = _ActivationModel()
+        self._pending: Dict[str, _PendingFile] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def expected_activation_seconds(self, size_bytes: Optional[int] = None) -> Optional[float]:
+        return self._model.expect(size_bytes)
+
+    def _first_delay(self, size_bytes: Optional[int]) -> float:
+        expected = self._model.expect(size_bytes)
+        if expected is None:
+            return self.initial_delay_seconds
+        # 예상 시간보다 조금 이르게 첫 조회 후 짧은 간격으로 추적
+        return max(self.initial_delay_seconds, expected * 0.8)
+
+    async def wait_active(self, file_name: str, size_bytes: Optional[int] = None) -> Any:
+        """파일이 ACTIVE가 되면 File 객체를 반환합니다. FAILED 또는 시간 초과 시 VerifyException을 발생시킵니다."""
+        pending = self._pending.get(file_name)
+        if pending is None:
+            now = time.monotonic()
+            pending = _PendingFile(
+                name=file_name,
+                future=asyncio.get_running_loop().create_future(),
+                started_at=now,
+                deadline=now + self.timeout_seconds,
+                next_poll_at=now + self._first_delay(size_bytes),
+                delay=self.initial_delay_seconds,
+                size_bytes=size_bytes,
+            )
+            self._pending[file_name] = pending
+            self.logger.info(f"[FileActivationPoller] ▶ 파일 처리 대기 시작 | file_name={file_name} | pending={len(self._pending)}")
+            self._ensure_running()
+
+        return await asyncio.shield(pending.future)
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            now = time.monotonic()
+            next_at = min(p.next_poll_at for p in self._pending.values())
+            if next_at > now:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=next_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = [p for p in self._pending.values() if p.next_poll_at <= now]
+            try:
+                if len(due) >= self.batch_threshold:
+                    states = await self._list_states({p.name for p in due})
+                else:
+                    states = await self._get_states(due)
+            except Exception as e:
+                self.logger.warning(f"[FileActivationPoller] ▶ 파일 상태 확인 중 오류 (재시도) | error={e}")
+                states = {}
+
+            now = time.monotonic()
+            for p in due:
+                self._apply(p, states.get(p.name), now)
+
+    async def _get_states(self, due: List[_PendingFile]) -> Dict[str, Any]:
+        GEMINI_FILE_STATUS_CALLS.labels(method="get").inc(len(due))
+        results = await asyncio.gather(
+            *(self.client.aio.files.get(name=p.name) for p in due),
+            return_exceptions=True,
+        )
+        states: Dict[str, Any] = {}
+        for p, result in zip(due, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"[FileActivationPoller] ▶ 파일 상태 확인 중 오류 (재시도) | file_name={p.name} | error={result}")
+                continue
+            states[p.name] = result
+        return states
+
+    async def _list_states(self, names: set) -> Dict[str, Any]:
+        """files.list를 최신순으로 훑어 대기 중인 파일 상태를 한 번에 확인합니다."""
+        states: Dict[str, Any] = {}
+        pager = await self.client.aio.files.list(config={"page_size": self.list_page_size})
+        seen = 0
+        async for file_obj in pager:
+            # 페이지 단위로 호출이 발생하므로 페이지 크기마다 한 번 집계
+            if seen % self.list_page_size == 0:
+                GEMINI_FILE_STATUS_CALLS.labels(method="list").inc()
+            seen += 1
+            if file_obj.name in names:
+                states[file_obj.name] = file_obj
+                if len(states) == len(names):
+                    break
+            if seen >= self.list_page_size * self.max_list_pages:
+                break
+        return states
+
+    def _apply(self, p: _PendingFile, file_obj: Any, now: float) -> None:
+        p.polls += 1
+        if p.future.done():
+            self._pending.pop(p.name, None)
+            return
+
+        state = getattr(getattr(file_obj, "state", None), "name", None)
+        if p.size_bytes is None and file_obj is not None:
+            p.size_bytes = getattr(file_obj, "size_bytes", None)
+
+        if state == "ACTIVE":
+            elapsed = now - p.started_at
+            self._model.observe(elapsed, p.size_bytes)
+            GEMINI_FILE_ACTIVATION_SECONDS.observe(elapsed)
+            self.logger.info(
+                f"[FileActivationPoller] ▶ 파일 처리 완료 (ACTIVE) | file_name={p.name} | elapsed={elapsed:.2f}s | polls={p.polls}"
+            )
+            self._pending.pop(p.name, None)
+            p.future.set_result(file_obj)
+            return
+
+        if state == "FAILED":
+            self.logger.error(f"[FileActivationPoller] ▶ 파일 처리 실패 (FAILED) | file_name={p.name}")
+            self._pending.pop(p.name, None)
+            p.future.set_exception(VerifyException(VerifyErrorCode.VERIFY_FAILED))
+            return
+
+        if now >= p.deadline:
+            self.logger.error(f"[FileActivationPoller] ▶ 파일 처리 시간 초과 | file_name={p.name}")
+            self._pending.pop(p.name, None)
+            p.future.set_exception(VerifyException(VerifyErrorCode.VERIFY_FAILED))
+            return
+
+        p.next_poll_at = now + p.delay
+        p.delay = min(self.max_delay_seconds, p.delay * self.backoff)
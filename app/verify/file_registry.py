@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import Counter
+
+from app.local_store import connect_sqlite
+
+UPLOADED_FILE_REGISTRY = Counter(
+    "uploaded_file_registry_total",
+    "업로드 파일 재사용 조회 결과 (hit, miss)",
+    ["outcome"],
+)
+
+
+@dataclass(frozen=True)
+class UploadedFile:
+    file_uri: str
+    file_name: str
+    mime_type: str
+    expires_at: float
+
+
+class UploadedFileRegistry:
+    """검증을 통과한 video_id → 업로드된 Gemini 파일 매핑.
+
+    - 로컬 SQLite에 기록해 같은 호스트의 uvicorn 워커들이 공유하며, 메모리 사본은 짧은 주기로만 신뢰합니다.
+    - Gemini 파일은 48시간 뒤 만료되므로 만료 시각에서 여유 시간(safety_margin)을 뺀 시점까지만 재사용합니다.
+    - 같은 파일을 여러 요청이 동시에 사용하므로 보유자 수(holders)를 세고, 마지막 보유자가 반납할 때만 삭제 대상이 됩니다.
+      반납되지 않은 항목은 만료 후 janitor의 고아 파일 정리로 회수됩니다.
+    """
+
+    GEMINI_FILE_TTL_SECONDS = 48 * 3600
+    MEMORY_REVALIDATE_SECONDS = 2.0
+
+    def __init__(self, *, path: str, safety_margin_seconds: float = 3600.0):
+        self.logger = logging.getLogger(__name__)
+        self.safety_margin_seconds = safety_margin_seconds
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Tuple[float, UploadedFile]] = {}
+        self._conn = connect_sqlite(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploaded_files (
+                video_id TEXT PRIMARY KEY,
+                file_uri TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                mime_type TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_uploaded_files_uri ON uploaded_files (file_uri)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(uploaded_files)")}
+        if "holders" not in columns:
+            self._conn.execute("ALTER TABLE uploaded_files ADD COLUMN holders INTEGER NOT NULL DEFAULT 0")
+
+    def get(self, video_id: str) -> Optional[UploadedFile]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(video_id)
+            if cached is not None and time.monotonic() - cached[0] < self.MEMORY_REVALIDATE_SECONDS:
+                entry: Optional[UploadedFile] = cached[1]
+            else:
+                row = self._conn.execute(
+                    "SELECT file_uri, file_name, mime_type, expires_at FROM uploaded_files WHERE video_id = ?",
+                    (video_id,),
+                ).fetchone()
+                entry = UploadedFile(*row) if row is not None else None
+                if entry is not None:
+                    self._memory[video_id] = (time.monotonic(), entry)
+                else:
+                    self._memory.pop(video_id, None)
+
+            if entry is not None and entry.expires_at <= now:
+                self._delete_locked("video_id", video_id)
+                entry = None
+
+        UPLOADED_FILE_REGISTRY.labels(outcome="hit" if entry is not None else "miss").inc()
+        return entry
+
+    def put(
+        self,
+        video_id: str,
+        *,
+        file_uri: str,
+        file_name: str,
+        mime_type: str,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.GEMINI_FILE_TTL_SECONDS
+        entry = UploadedFile(file_uri, file_name, mime_type, expires_at - self.safety_margin_seconds)
+        with self._lock:
+            # 보유자는 acquire()로만 늘어남 (같은 video_id의 이전 파일은 보유자와 함께 대체됨)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded_files (video_id, file_uri, file_name, mime_type, expires_at, holders) VALUES (?, ?, ?, ?, ?, 0)",
+                (video_id, entry.file_uri, entry.file_name, entry.mime_type, entry.expires_at),
+            )
+            self._memory[video_id] = (time.monotonic(), entry)
+        self.logger.info(f"[UploadedFileRegistry] ▶ 업로드 파일 등록 | video_id={video_id} | file_uri={file_uri}")
+
+    def is_referenced(self, file_name: str) -> bool:
+        """만료되지 않은 등록 항목이 해당 파일을 가리키는지 확인합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM uploaded_files WHERE file_name = ? AND expires_at > ? LIMIT 1",
+                (file_name, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def acquire(self, file_uri: str) -> bool:
+        """등록된 유효한 파일의 보유자 수를 1 늘립니다. 이미 정리(삭제 예약)된 파일이면 False를 반환합니다."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE uploaded_files SET holders = holders + 1 WHERE file_uri = ? AND expires_at > ?",
+                (file_uri, time.time()),
+            )
+        return cursor.rowcount > 0
+
+    def release(self, file_uri: str) -> bool:
+        """보유자 수를 1 줄이고, 남은 보유자가 없으면 항목을 지우고 True를 반환합니다 (호출자가 파일 삭제를 예약).
+
+        등록되지 않았거나 이미 반납이 끝난 파일이면 False를 반환합니다 (이 서비스가 보유하지 않은 파일은 삭제하지 않음).
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT holders FROM uploaded_files WHERE file_uri = ?",
+                    (file_uri,),
+                ).fetchone()
+                if row is None:
+                    last = False
+                elif row[0] > 1:
+                    self._conn.execute(
+                        "UPDATE uploaded_files SET holders = holders - 1 WHERE file_uri = ?",
+                        (file_uri,),
+                    )
+                    last = False
+                else:
+                    self._delete_locked("file_uri", file_uri)
+                    last = True
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return last
+
+    def _delete_locked(self, column: str, value: str) -> None:
+        self._conn.execute(f"DELETE FROM uploaded_files WHERE {column} = ?", (value,))
+        if column == "video_id":
+            self._memory.pop(value, None)
+            return
+        for video_id, (_, entry) in list(self._memory.items()):
+            if entry.file_uri == value:
+                del self._memory[video_id]
@@ -1,27 +1,60 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from google import genai
-from google.genai import errors as genai_errors
 from google.genai import types
+from prometheus_client import Counter
 
+from app.enum import InvokeMode
+from app.gemini_invoker import GeminiInvoker, ModelRoute
 from app.gemini_safety import relaxed_safety_settings
 from app.verify.exception import VerifyException, VerifyErrorCode
 
 logger = logging.getLogger(__name__)
 
+VERIFY_CLIP_DECISIONS = Counter(
+    "verify_clip_decisions_total",
+    "구간(클립) 검증 결과 (accepted: 구간 결과 사용, escalated: 전체 영상으로 재검증)",
+    ["outcome"],
+)
+VERIFY_CASCADE_DECISIONS = Counter(
+    "verify_cascade_decisions_total",
+    "검증 최종 판정 (tier=lite: 경량 모델 결과 사용, strong: 상위 모델 재검증 결과 사용)",
+    ["tier", "is_recipe"],
+)
+VERIFY_CASCADE_ESCALATIONS = Counter(
+    "verify_cascade_escalations_total",
+    "상위 모델 재검증 횟수 (reason=low_confidence, contradiction)",
+    ["reason"],
+)
+
 class VerifyGenerator:
     def __init__(
         self,
-        client: genai.Client,
+        invoker: GeminiInvoker,
         model: str,
         verify_user_prompt_path: Path,
         verify_tool_path: Path,
         fallback_model: str = "gemini-3.0-flash",
+        invoke_mode: str = InvokeMode.THREAD,
+        clip_enabled: bool = False,
+        clip_head_seconds: int = 60,
+        clip_window_seconds: int = 20,
+        clip_sample_count: int = 2,
+        clip_escalation_confidence: float = 0.8,
+        cascade_model: str = "",
+        cascade_confidence: float = 0.7,
     ):
-        self.client = client
+        self.invoker = invoker
+        self.cascade_model = cascade_model
+        self.cascade_confidence = cascade_confidence
+        self.clip_enabled = clip_enabled
+        self.clip_head_seconds = clip_head_seconds
+        self.clip_window_seconds = clip_window_seconds
+        self.clip_sample_count = clip_sample_count
+        self.clip_escalation_confidence = clip_escalation_confidence
+        self.invoke_mode = InvokeMode(invoke_mode)
         self.model = model
         self.fallback_model = fallback_model
         self.verify_user_prompt_path = verify_user_prompt_path
@@ -37,98 +70,234 @@ class VerifyGenerator:
             logger.error(f"[VerifyGenerator] 리소스 로딩 실패: {e}")
             raise RuntimeError(f"Failed to load verify resources: {e}")
 
-    def generate(self, file_uri: str, mime_type: str = "video/mp4") -> Dict[str, Any]:
-        try:
-            # Part 객체 생성
-            part_text = types.Part.from_text(text=self.prompt_text)
-            part_video = types.Part.from_uri(file_uri=file_uri, mime_type=mime_type)
-            
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[part_video, part_text]
-                )
-            ]
+    def _build_contents(self, file_uri: str, mime_type: str) -> list:
+        # Part 객체 생성
+        part_text = types.Part.from_text(text=self.prompt_text)
+        part_video = types.Part.from_uri(file_uri=file_uri, mime_type=mime_type)
 
-            logger.info(f"[VerifyGenerator] ▶ Gemini API 호출 시도 (Tool Calling) | model={self.model}")
-            config = types.GenerateContentConfig(
-                media_resolution=types.MediaResolution.MEDIA_RESOLUTION_LOW,
-                safety_settings=relaxed_safety_settings(),
-                tools=[types.Tool(
-                    function_declarations=[
-                        types.FunctionDeclaration(
-                            name=self.tool_def["name"],
-                            description=self.tool_def["description"],
-                            parameters=self.tool_def["parameters"]
-                        )
-                    ]
-                )],
-                tool_config=types.ToolConfig(
-                    function_calling_config=types.FunctionCallingConfig(
-                        mode="ANY", # 반드시 툴을 호출하도록 강제
-                        allowed_function_names=[self.tool_def["name"]]
+        return [
+            types.Content(
+                role="user",
+                parts=[part_video, part_text]
+            )
+        ]
+
+    def _build_config(self) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            media_resolution=types.MediaResolution.MEDIA_RESOLUTION_LOW,
+            safety_settings=relaxed_safety_settings(),
+            tools=[types.Tool(
+                function_declarations=[
+                    types.FunctionDeclaration(
+                        name=self.tool_def["name"],
+                        description=self.tool_def["description"],
+                        parameters=self.tool_def["parameters"]
                     )
+                ]
+            )],
+            tool_config=types.ToolConfig(
+                function_calling_config=types.FunctionCallingConfig(
+                    mode="ANY", # 반드시 툴을 호출하도록 강제
+                    allowed_function_names=[self.tool_def["name"]]
                 )
             )
-            
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=contents,
-                    config=config,
-                )
-            except (genai_errors.ClientError, genai_errors.ServerError) as e:
-                status_code = getattr(e, "status_code", None)
-                code = getattr(e, "code", None)
-                message = str(e).lower()
-                is_rate_limit = (
-                    status_code == 429
-                    or code == 429
-                    or "429" in message
-                    or "too many requests" in message
-                    or "rate limit" in message
-                    or "resource_exhausted" in message
-                )
-                is_server_error = code is not None and 500 <= code < 600
-                should_fallback = (
-                    self.fallback_model
-                    and self.fallback_model != self.model
-                    and (is_rate_limit or is_server_error)
-                )
+        )
 
-                if not should_fallback:
-                    raise
+    def _build_routes(self, config: types.GenerateContentConfig) -> list:
+        return [
+            ModelRoute(self.model, config),
+            ModelRoute(self.fallback_model, config),
+        ]
 
-                logger.warning(
-                    f"[VerifyGenerator] ▶ Primary model rate-limited. fallback model={self.fallback_model}"
-                )
-                response = self.client.models.generate_content(
-                    model=self.fallback_model,
-                    contents=contents,
-                    config=config,
-                )
+    def _build_cascade_routes(self, config: types.GenerateContentConfig) -> list:
+        return [ModelRoute(self.cascade_model, config)]
+
+    @staticmethod
+    def _parse_response(response) -> Dict[str, Any]:
+        # Tool Call 응답 파싱
+        function_call = None
+        if response.candidates and response.candidates[0].content.parts:
+            for part in response.candidates[0].content.parts:
+                if part.function_call:
+                    function_call = part.function_call
+                    break
+
+        if not function_call:
+            block_reason = None
+            if getattr(response, "prompt_feedback", None):
+                block_reason = getattr(response.prompt_feedback, "block_reason", None)
+            logger.error(
+                f"[VerifyGenerator] ▶ Gemini가 툴을 호출하지 않음 | block_reason={block_reason} | response={response}"
+            )
+            raise VerifyException(
+                VerifyErrorCode.VERIFY_NO_TOOL_CALL,
+                {"block_reason": str(block_reason) if block_reason else None},
+            )
+
+        return function_call.args
+
+    def _clip_windows(self, duration_seconds: Optional[float]) -> Optional[List[Tuple[int, int]]]:
+        """검증에 사용할 (start, end) 구간 목록. 클립 검증이 의미 없거나 영상 길이를 모르면 None(전체 영상 검증)을 반환합니다."""
+        if not self.clip_enabled:
+            return None
+        # 길이를 모르면 앞부분만으로는 뒤쪽 조리 구간을 확인할 수 없으므로 전체 영상으로 검증
+        if duration_seconds is None:
+            return None
+        head = self.clip_head_seconds
+
+        duration = int(duration_seconds)
+        clipped = head + self.clip_window_seconds * self.clip_sample_count
+        if duration <= clipped * 1.5:
+            return None
+
+        windows = [(0, head)]
+        # 앞부분 이후 구간을 균등하게 나눠 각 구간 중앙에서 샘플링
+        span = duration - head
+        for i in range(self.clip_sample_count):
+            center = head + span * (i + 1) / (self.clip_sample_count + 1)
+            start = int(center - self.clip_window_seconds / 2)
+            windows.append((start, start + self.clip_window_seconds))
+        return windows
+
+    def _build_clip_contents(self, file_uri: str, mime_type: str, windows: List[Tuple[int, int]]) -> list:
+        parts = [
+            types.Part(
+                file_data=types.FileData(file_uri=file_uri, mime_type=mime_type),
+                video_metadata=types.VideoMetadata(start_offset=f"{start}s", end_offset=f"{end}s"),
+            )
+            for start, end in windows
+        ]
+        note = (
+            "\n\n참고: 전체 영상이 아니라 일부 구간만 제공됩니다 "
+            f"({', '.join(f'{a}s~{b}s' for a, b in windows)}). "
+            "제공된 구간만으로 판단하기 어려우면 신뢰도를 낮게 주세요."
+        )
+        parts.append(types.Part.from_text(text=self.prompt_text + note))
+        return [types.Content(role="user", parts=parts)]
+
+    @staticmethod
+    def _confidence(args: Dict[str, Any]) -> float:
+        try:
+            return float(args.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _accept_clip_result(self, args: Dict[str, Any], windows: List[Tuple[int, int]]) -> bool:
+        confidence = self._confidence(args)
+        accepted = confidence >= self.clip_escalation_confidence
+        VERIFY_CLIP_DECISIONS.labels(outcome="accepted" if accepted else "escalated").inc()
+        logger.info(
+            f"[VerifyGenerator] ▶ 구간 검증 결과 | windows={windows} | is_recipe={args.get('is_recipe')} "
+            f"| confidence={confidence} | escalate={not accepted}"
+        )
+        return accepted
+
+    def _cascade_reason(self, args: Dict[str, Any], earlier: List[Dict[str, Any]]) -> Optional[str]:
+        """상위 모델에 다시 물어야 하는 이유를 반환합니다 (없으면 None)."""
+        if not self.cascade_model:
+            return None
+        is_recipe = args.get("is_recipe")
+        if not isinstance(is_recipe, bool):
+            return "contradiction"
+        # 구간 검증과 전체 영상 검증의 결론이 다른 경우
+        if any(prev.get("is_recipe") is not is_recipe for prev in earlier):
+            return "contradiction"
+        if self._confidence(args) < self.cascade_confidence:
+            return "low_confidence"
+        return None
 
-            # Tool Call 응답 파싱
-            function_call = None
-            if response.candidates and response.candidates[0].content.parts:
-                for part in response.candidates[0].content.parts:
-                    if part.function_call:
-                        function_call = part.function_call
-                        break
-            
-            if not function_call:
-                block_reason = None
-                if getattr(response, "prompt_feedback", None):
-                    block_reason = getattr(response.prompt_feedback, "block_reason", None)
-                logger.error(
-                    f"[VerifyGenerator] ▶ Gemini가 툴을 호출하지 않음 | block_reason={block_reason} | response={response}"
+    def _finish(self, args: Dict[str, Any], tier: str) -> Dict[str, Any]:
+        VERIFY_CASCADE_DECISIONS.labels(tier=tier, is_recipe=str(bool(args.get("is_recipe"))).lower()).inc()
+        return args
+
+    def generate(
+        self,
+        file_uri: str,
+        mime_type: str = "video/mp4",
+        duration_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        try:
+            config = self._build_config()
+            routes = self._build_routes(config)
+            earlier: List[Dict[str, Any]] = []
+
+            windows = self._clip_windows(duration_seconds)
+            if windows:
+                logger.info(f"[VerifyGenerator] ▶ Gemini API 호출 시도 (구간 검증) | model={self.model}")
+                args = self._parse_response(
+                    self.invoker.invoke(routes, self._build_clip_contents(file_uri, mime_type, windows))
                 )
-                raise VerifyException(
-                    VerifyErrorCode.VERIFY_NO_TOOL_CALL,
-                    {"block_reason": str(block_reason) if block_reason else None},
+                if self._accept_clip_result(args, windows):
+                    return self._finish(args, "lite")
+                earlier.append(args)
+
+            contents = self._build_contents(file_uri, mime_type)
+
+            logger.info(f"[VerifyGenerator] ▶ Gemini API 호출 시도 (Tool Calling) | model={self.model}")
+            response = self.invoker.invoke(routes, contents)
+            args = self._parse_response(response)
+
+            reason = self._cascade_reason(args, earlier)
+            if reason is None:
+                return self._finish(args, "lite")
+
+            VERIFY_CASCADE_ESCALATIONS.labels(reason=reason).inc()
+            logger.info(f"[VerifyGenerator] ▶ 상위 모델로 재검증 | model={self.cascade_model} | reason={reason} | lite={args}")
+            try:
+                strong = self._parse_response(self.invoker.invoke(self._build_cascade_routes(config), contents))
+            except Exception as e:
+                logger.warning(f"[VerifyGenerator] ▶ 상위 모델 재검증 실패, 1차 결과 사용 | error={e}")
+                return self._finish(args, "lite")
+            return self._finish(strong, "strong")
+
+        except VerifyException:
+            raise
+        except Exception as e:
+            logger.error(f"[VerifyGenerator] ▶ Gemini API 호출 중 오류 발생 | error={e}")
+            raise VerifyException(VerifyErrorCode.VERIFY_FAILED, f"Gemini API 호출 실패: {e}")
+
+    async def generate_async(
+        self,
+        file_uri: str,
+        mime_type: str = "video/mp4",
+        duration_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """generate의 asyncio 네이티브 버전 (client.aio 사용, 스레드 미점유)"""
+        try:
+            config = self._build_config()
+            routes = self._build_routes(config)
+            earlier: List[Dict[str, Any]] = []
+
+            windows = self._clip_windows(duration_seconds)
+            if windows:
+                logger.info(f"[VerifyGenerator] ▶ Gemini API 호출 시도 (구간 검증, async) | model={self.model}")
+                args = self._parse_response(
+                    await self.invoker.invoke_async(routes, self._build_clip_contents(file_uri, mime_type, windows))
                 )
+                if self._accept_clip_result(args, windows):
+                    return self._finish(args, "lite")
+                earlier.append(args)
+
+            contents = self._build_contents(file_uri, mime_type)
+
+            logger.info(f"[VerifyGenerator] ▶ Gemini API 호출 시도 (Tool Calling, async) | model={self.model}")
+            response = await self.invoker.invoke_async(routes, contents)
+            args = self._parse_response(response)
 
-            return function_call.args
+            reason = self._cascade_reason(args, earlier)
+            if reason is None:
+                return self._finish(args, "lite")
+
+            VERIFY_CASCADE_ESCALATIONS.labels(reason=reason).inc()
+            logger.info(f"[VerifyGenerator] ▶ 상위 모델로 재검증 | model={self.cascade_model} | reason={reason} | lite={args}")
+            try:
+                strong = self._parse_response(
+                    await self.invoker.invoke_async(self._build_cascade_routes(config), contents)
+                )
+            except Exception as e:
+                logger.warning(f"[VerifyGenerator] ▶ 상위 모델 재검증 실패, 1차 결과 사용 | error={e}")
+                return self._finish(args, "lite")
+            return self._finish(strong, "strong")
 
         except VerifyException:
             raise
@@ -0,0 +1,120 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+from prometheus_client import Counter
+
+VERIFY_PRECHECK_DECISIONS = Counter(
+    "verify_precheck_decisions_total",
+    "메타데이터 사전 검증 판정 (recipe: 검증 호출 생략, not_recipe: 업로드 생략, ambiguous: 전체 검증)",
+    ["verdict"],
+)
+
+
+class PrecheckVerdict(str, Enum):
+    RECIPE = "recipe"
+    NOT_RECIPE = "not_recipe"
+    AMBIGUOUS = "ambiguous"
+
+
+@dataclass
+class PrecheckResult:
+    verdict: PrecheckVerdict
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+
+# (패턴, 가중치) - 제목/태그에서 매칭되면 가중치 1.5배
+_POSITIVE_PATTERNS: List[Tuple[str, float]] = [
+    (r"레시피|recipe", 3.0),
+    (r"만드는\s*(법|방법)|만들기|how to (make|cook)|homemade|집밥", 2.0),
+    (r"요리|cooking|cook\b|쿠킹|베이킹|baking|반찬|밑반찬", 1.5),
+    (r"재료|ingredients?", 1.5),
+    (r"\d+\s*(큰술|작은술|스푼|컵|tbsp|tsp|cups?|ml|g)\b", 1.0),
+]
+# 음식 이름과 겹치지 않도록 단어 경계/문맥이 있는 표현만 사용 (예: "롤"은 계란롤, "match"는 matcha, "경기"는 경기도와 겹침)
+_NEGATIVE_PATTERNS: List[Tuple[str, float]] = [
+    (r"\bm/?v\b|\bmusic video\b|뮤직\s*비디오|\bofficial (audio|video)\b|\blyrics?\b|가사\s*(영상|포함)", 3.0),
+    (r"\bgameplay\b|게임\s*플레이|\bwalkthrough\b|공략|리그\s*오브\s*레전드|\bleague of legends\b|배틀그라운드|\b배그\b", 3.0),
+    (r"하이라이트|\bhighlights?\b|경기\s*(결과|중계|하이라이트)|\bfull match\b|\bmatch (highlights?|recap)\b", 2.0),
+    (r"먹방|\bmukbang\b|\beating show\b|맛집\s*탐방|\bvlog\b|브이로그", 1.5),
+    (r"\bnews\b|뉴스|shorts? 모음|\bcompilation\b", 1.0),
+]
+# YouTube categoryId: 26 Howto & Style, 22 People & Blogs, 24 Entertainment, 10 Music, 17 Sports, 20 Gaming, 25 News & Politics
+_CATEGORY_WEIGHTS: Dict[str, float] = {
+    "26": 1.0,
+    "10": -3.0,
+    "17": -2.0,
+    "20": -3.0,
+    "25": -2.0,
+}
+# 키워드만으로는 거절하지 않고, 이 카테고리가 함께 확인될 때만 not_recipe로 판정
+_NON_FOOD_CATEGORIES = frozenset({"10", "17", "20", "25"})
+
+
+class MetadataPrecheck:
+    """업로드 전에 YouTube 메타데이터(제목/설명/태그/카테고리)만으로 레시피 여부를 판정하는 로컬 키워드 규칙.
+
+    확실한 경우에만 recipe/not_recipe를 반환하고, 나머지는 ambiguous로 두어 영상 기반 검증을 수행합니다.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        recipe_threshold: float = 6.0,
+        not_recipe_threshold: float = -3.0,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+        self.recipe_threshold = recipe_threshold
+        self.not_recipe_threshold = not_recipe_threshold
+        self._positive = [(re.compile(p, re.IGNORECASE), w) for p, w in _POSITIVE_PATTERNS]
+        self._negative = [(re.compile(p, re.IGNORECASE), w) for p, w in _NEGATIVE_PATTERNS]
+
+    @staticmethod
+    def _match(patterns, headline: str, description: str, reasons: List[str], label: str) -> float:
+        score = 0.0
+        for pattern, weight in patterns:
+            if pattern.search(headline):
+                score += weight * 1.5
+                reasons.append(f"{label}:{pattern.pattern}@title")
+            elif pattern.search(description):
+                score += weight
+                reasons.append(f"{label}:{pattern.pattern}@description")
+        return score
+
+    def classify(self, snippet: Dict[str, Any]) -> PrecheckResult:
+        if not snippet:
+            VERIFY_PRECHECK_DECISIONS.labels(verdict=PrecheckVerdict.AMBIGUOUS.value).inc()
+            return PrecheckResult(PrecheckVerdict.AMBIGUOUS, 0.0, ["no_metadata"])
+
+        headline = " ".join([snippet.get("title") or ""] + list(snippet.get("tags") or []))
+        description = snippet.get("description") or ""
+        reasons: List[str] = []
+
+        positive = self._match(self._positive, headline, description, reasons, "+")
+        negative = self._match(self._negative, headline, description, reasons, "-")
+        category = str(snippet.get("categoryId") or "")
+        category_weight = _CATEGORY_WEIGHTS.get(category, 0.0)
+        if category_weight:
+            reasons.append(f"category:{category}")
+        score = positive - negative + category_weight
+
+        if score >= self.recipe_threshold and negative == 0:
+            verdict = PrecheckVerdict.RECIPE
+        elif (
+            score <= self.not_recipe_threshold
+            and positive == 0
+            and negative > 0
+            and category in _NON_FOOD_CATEGORIES
+        ):
+            # 레시피 신호가 하나라도 있거나, 음악/스포츠/게임/뉴스 카테고리와 키워드가 함께 확인되지 않으면 거절하지 않음
+            verdict = PrecheckVerdict.NOT_RECIPE
+        else:
+            verdict = PrecheckVerdict.AMBIGUOUS
+
+        VERIFY_PRECHECK_DECISIONS.labels(verdict=verdict.value).inc()
+        return PrecheckResult(verdict, score, reasons)
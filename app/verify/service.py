@@ -1,12 +1,20 @@
 import logging
 import asyncio
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
 from google import genai
 
+from app.enum import InvokeMode
+from app.meta.client import MetaClient
+from app.singleflight import SingleFlight
+from app.video_session import VideoSessionManager
 from app.verify.client import VerifyClient
+from app.verify.file_janitor import GeminiFileJanitor
+from app.verify.file_poller import FileActivationPoller
+from app.verify.file_registry import UploadedFileRegistry
 from app.verify.generator import VerifyGenerator
+from app.verify.precheck import MetadataPrecheck, PrecheckResult, PrecheckVerdict
 from app.verify.exception import VerifyException, VerifyErrorCode
 
 logger = logging.getLogger(__name__)
@@ -17,17 +25,64 @@ class VerifyService:
         client: VerifyClient,
         generator: VerifyGenerator,
         genai_client: genai.Client,
+        file_poller: FileActivationPoller,
+        file_registry: UploadedFileRegistry,
+        file_janitor: GeminiFileJanitor,
+        video_session: Optional[VideoSessionManager] = None,
+        singleflight: Optional[SingleFlight] = None,
+        metadata_client: Optional[MetaClient] = None,
+        precheck: Optional[MetadataPrecheck] = None,
     ):
         self.client = client
         self.generator = generator
         self.genai_client = genai_client
+        self.file_poller = file_poller
+        self.file_registry = file_registry
+        self.file_janitor = file_janitor
+        self.video_session = video_session
+        self.singleflight = singleflight
+        self.metadata_client = metadata_client
+        self.precheck = precheck
         self.logger = logging.getLogger(__name__)
 
+    # 공유 파일이 반납(삭제 예약)된 직후에 합류한 경우 다시 업로드하는 횟수
+    ACQUIRE_ATTEMPTS = 2
+
     async def verify_recipe(self, video_id: str) -> Dict[str, Any]:
+        """같은 video_id의 동시 검증 요청은 업로드/검증을 한 번만 수행하고 결과를 공유합니다.
+
+        반환된 file_uri는 호출자마다 보유자로 등록되며, 사용이 끝나면 delete_file_by_url로 반납해야 합니다.
+        """
+        for _ in range(self.ACQUIRE_ATTEMPTS):
+            if self.singleflight is None:
+                result = await self._verify_recipe(video_id)
+            else:
+                result = await self.singleflight.do("verify", video_id, lambda: self._verify_recipe(video_id))
+            if await asyncio.to_thread(self.file_registry.acquire, result["file_uri"]):
+                return result
+            self.logger.info(f"[VerifyService] ▶ 공유 파일이 이미 반납되어 다시 검증합니다 | video_id={video_id}")
+        raise VerifyException(VerifyErrorCode.VERIFY_FAILED)
+
+    async def _verify_recipe(self, video_id: str) -> Dict[str, Any]:
         """
         1) VerifyClient를 통해 비디오를 Gemini에 업로드합니다.
         2) 업로드된 비디오(file_uri)를 사용하여 Gemini API로 레시피 여부를 검증합니다.
         """
+        # 0. 이미 검증되어 아직 유효한 업로드 파일이 있으면 재사용
+        uploaded = await asyncio.to_thread(self.file_registry.get, video_id)
+        if uploaded is not None:
+            self.logger.info(f"[VerifyService] ▶ 업로드 파일 재사용 | video_id={video_id} | file_uri={uploaded.file_uri}")
+            return {
+                "file_uri": uploaded.file_uri,
+                "mime_type": uploaded.mime_type
+            }
+
+        # 0.5 메타데이터 사전 검증 - 확실히 레시피가 아니면 업로드 없이 거절
+        precheck = await self._run_precheck(video_id)
+        if precheck is not None and precheck.verdict == PrecheckVerdict.NOT_RECIPE:
+            self.logger.info(f"[VerifyService] ▶ 메타데이터 사전 검증으로 거절 (업로드 생략) | video_id={video_id} | score={precheck.score} | reasons={precheck.reasons}")
+            raise VerifyException(VerifyErrorCode.VERIFY_NOT_RECIPE)
+
         try:
             # 1. 비디오 업로드 (Cloud Run 업로드 서비스 호출)
             self.logger.info(f"[VerifyService] ▶ 비디오 업로드 시작 | video_id={video_id}")
@@ -46,16 +101,27 @@ class VerifyService:
                 raise VerifyException(VerifyErrorCode.VERIFY_UPLOAD_ERROR)
 
             self.logger.info(f"[VerifyService] ▶ 비디오 업로드 성공 | file_uri={file_uri}")
+            # 정리 요청이 오지 않아도 janitor 스윕이 회수할 수 있도록 이 서비스의 업로드로 기록
+            await asyncio.to_thread(
+                self.file_janitor.track, file_name or self._file_name_from_uri(file_uri) or file_uri, file_uri
+            )
 
             # 1.5 파일 상태 대기 (ACTIVE 될 때까지)
+            file_obj = None
             if file_name:
-                await self._wait_for_file_active(file_name)
+                file_obj = await self._wait_for_file_active(file_name, upload_result.get("size_bytes"))
             else:
                 self.logger.warning(f"[VerifyService] ▶ file_name이 없어 상태 확인을 건너뜁니다. | video_id={video_id}")
 
-            # 2. Gemini API로 레시피 검증 (VerifyGenerator 사용)
+            # 2. Gemini API로 레시피 검증 (VerifyGenerator 사용, 사전 검증에서 확실한 레시피면 생략)
+            duration_seconds = self._video_duration_seconds(file_obj)
             try:
-                args = await asyncio.to_thread(self.generator.generate, file_uri, mime_type)
+                if precheck is not None and precheck.verdict == PrecheckVerdict.RECIPE:
+                    args = {"is_recipe": True, "confidence": 1.0, "reason": f"metadata precheck (score={precheck.score})"}
+                elif self.generator.invoke_mode == InvokeMode.ASYNC:
+                    args = await self.generator.generate_async(file_uri, mime_type, duration_seconds)
+                else:
+                    args = await asyncio.to_thread(self.generator.generate, file_uri, mime_type, duration_seconds)
             except Exception as e:
                 self.logger.error(f"[VerifyService] ▶ Gemini 검증 실패 | video_id={video_id} | error={e}")
                 raise VerifyException(VerifyErrorCode.VERIFY_FAILED)
@@ -68,10 +134,21 @@ class VerifyService:
             self.logger.info(f"[VerifyService] ▶ 검증 결과 | is_recipe={is_recipe} | confidence={confidence} | reason={reason} | file_uri={file_uri}")
 
             if not is_recipe:
-                # 레시피가 아님
-                await self.delete_file_by_url(file_uri)
+                # 레시피가 아님 (등록 전이므로 다른 보유자가 없음)
+                await self._schedule_delete(file_uri)
                 raise VerifyException(VerifyErrorCode.VERIFY_NOT_RECIPE)
 
+            # 보유자 수 관리를 위해 항상 등록 (file_name이 없으면 URI에서 추출)
+            expiration = getattr(file_obj, "expiration_time", None)
+            await asyncio.to_thread(
+                self.file_registry.put,
+                video_id,
+                file_uri=file_uri,
+                file_name=file_name or self._file_name_from_uri(file_uri) or file_uri,
+                mime_type=mime_type,
+                expires_at=expiration.timestamp() if expiration is not None else None,
+            )
+
             return {
                 "file_uri": file_uri,
                 "mime_type": mime_type
@@ -83,50 +160,76 @@ class VerifyService:
             self.logger.error(f"[VerifyService] ▶ 레시피 검증 중 예상치 못한 오류 발생 | video_id={video_id} | error={e}")
             raise VerifyException(VerifyErrorCode.VERIFY_FAILED)
 
-    async def _wait_for_file_active(self, file_name: str):
-        """파일이 ACTIVE 상태가 될 때까지 대기합니다."""
-        self.logger.info(f"[VerifyService] ▶ 파일 처리 대기 시작 | file_name={file_name}")
-        
-        for _ in range(150): # 최대 150번 시도 (약 5분)
-            try:
-                # google.genai 라이브러리의 동기 호출을 별도 스레드에서 실행하여 이벤트 루프 차단 방지
-                file_obj = await asyncio.to_thread(self.genai_client.files.get, name=file_name)
-                
-                if file_obj.state.name == "ACTIVE":
-                    self.logger.info(f"[VerifyService] ▶ 파일 처리 완료 (ACTIVE) | file_name={file_name}")
-                    return
-                
-                if file_obj.state.name == "FAILED":
-                    raise VerifyException(VerifyErrorCode.VERIFY_FAILED) # 파일 처리 실패
-
-                self.logger.info(f"[VerifyService] ▶ 파일 처리 중... ({file_obj.state.name}) | file_name={file_name}")
-                await asyncio.sleep(2)
-
-            except Exception as e:
-                self.logger.warning(f"[VerifyService] ▶ 파일 상태 확인 중 오류 (재시도) | error={e}")
-                await asyncio.sleep(2)
-        
-        self.logger.error(f"[VerifyService] ▶ 파일 처리 시간 초과 | file_name={file_name}")
-        raise VerifyException(VerifyErrorCode.VERIFY_FAILED) # 시간 초과
+    async def _run_precheck(self, video_id: str) -> Optional[PrecheckResult]:
+        """YouTube 메타데이터만으로 레시피 여부를 판정합니다. 설정되지 않았거나 실패하면 None을 반환합니다."""
+        if self.precheck is None or not self.precheck.enabled or self.metadata_client is None:
+            return None
+        try:
+            if self.metadata_client.invoke_mode == InvokeMode.ASYNC:
+                snippet = await self.metadata_client.get_video_snippet_async(video_id)
+            else:
+                snippet = await asyncio.to_thread(self.metadata_client.get_video_snippet, video_id)
+            result = self.precheck.classify(snippet)
+        except Exception as e:
+            self.logger.warning(f"[VerifyService] ▶ 메타데이터 사전 검증 실패 (전체 검증으로 진행) | video_id={video_id} | error={e}")
+            return None
+        self.logger.info(f"[VerifyService] ▶ 메타데이터 사전 검증 | video_id={video_id} | verdict={result.verdict.value} | score={result.score}")
+        return result
+
+    @staticmethod
+    def _video_duration_seconds(file_obj: Any) -> Optional[float]:
+        """File.video_metadata의 videoDuration("123.4s")을 초 단위로 변환합니다."""
+        metadata = getattr(file_obj, "video_metadata", None)
+        if not isinstance(metadata, dict):
+            return None
+        raw = metadata.get("videoDuration") or metadata.get("video_duration")
+        if not raw:
+            return None
+        try:
+            return float(str(raw).rstrip("s"))
+        except ValueError:
+            return None
+
+    async def _wait_for_file_active(self, file_name: str, size_bytes: Optional[int] = None):
+        """파일이 ACTIVE 상태가 될 때까지 대기합니다 (공용 폴러 사용)."""
+        return await self.file_poller.wait_active(file_name, size_bytes)
+
+    @staticmethod
+    def _file_name_from_uri(file_uri: str) -> Optional[str]:
+        # URI 예시: https://generativelanguage.googleapis.com/v1beta/files/abc123xyz
+        # 경로의 마지막 부분이 file_name (files/abc123xyz)
+        path_parts = urlparse(file_uri).path.split('/')
+        if "files" not in path_parts:
+            return None
+        return "/".join(path_parts[path_parts.index("files"):])
 
     async def delete_file_by_url(self, file_uri: str):
-        """Gemini File URI를 파싱하여 파일을 삭제합니다."""
+        """/cleanup 요청용. 다른 요청이 같은 파일을 사용 중일 수 있으므로 release_file과 같이 반납으로 처리합니다."""
+        await self.release_file(file_uri)
+
+    async def release_file(self, file_uri: str) -> None:
+        """verify_recipe로 받은 파일을 반납합니다. 마지막 보유자일 때만 파일 삭제를 예약합니다 (백그라운드 삭제 큐, 즉시 반환)."""
         try:
-            # URI 예시: https://generativelanguage.googleapis.com/v1beta/files/abc123xyz
-            # 경로의 마지막 부분이 file_name (files/abc123xyz)
-            parsed_url = urlparse(file_uri)
-            path_parts = parsed_url.path.split('/')
-            
-            # "files" 키워드 이후의 경로를 추출
-            if "files" in path_parts:
-                idx = path_parts.index("files")
-                file_name = "/".join(path_parts[idx:])
-                
-                # 동기 삭제 호출을 별도 스레드에서 실행
-                await asyncio.to_thread(self.genai_client.files.delete, name=file_name)
-                self.logger.info(f"[VerifyService] ▶ 파일 삭제 성공 | file_name={file_name}")
+            last = await asyncio.to_thread(self.file_registry.release, file_uri)
+        except Exception as e:
+            self.logger.warning(f"[VerifyService] ▶ 파일 반납 실패 (만료 후 정리됨) | file_uri={file_uri} | error={e}")
+            return
+        if not last:
+            self.logger.info(f"[VerifyService] ▶ 다른 요청이 사용 중이거나 등록되지 않은 파일이라 삭제하지 않습니다 | file_uri={file_uri}")
+            return
+        await self._schedule_delete(file_uri)
+
+    async def _schedule_delete(self, file_uri: str) -> None:
+        if self.video_session is not None:
+            await self.video_session.close(file_uri)
+
+        try:
+            file_name = self._file_name_from_uri(file_uri)
+            if file_name:
+                self.file_janitor.enqueue(file_name)
+                self.logger.info(f"[VerifyService] ▶ 파일 삭제 예약 | file_name={file_name}")
             else:
                 self.logger.warning(f"[VerifyService] ▶ 유효하지 않은 Gemini File URI 형식입니다. | file_uri={file_uri}")
-                
+
         except Exception as e:
-            self.logger.warning(f"[VerifyService] ▶ 파일 삭제 실패 (무시 가능) | file_uri={file_uri} | error={e}")
+            self.logger.warning(f"[VerifyService] ▶ 파일 삭제 예약 실패 (무시 가능) | file_uri={file_uri} | error={e}")
@@ -0,0 +1,346 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+from prometheus_client import Counter
+
+from app.gemini_invoker import GeminiInvoker, ModelRoute
+from app.local_store import connect_sqlite
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+VIDEO_SESSION_EVENTS = Counter(
+    "video_session_events_total",
+    "영상 세션(Gemini cached content) 이벤트 (created, reused, create_failed, used, fallback, closed)",
+    ["model", "event"],
+)
+
+
+@dataclass
+class _SessionEntry:
+    cache_name: str
+    functions: frozenset
+    expires_at: float
+
+
+def low_resolution_video_part(file_uri: str, mime_type: str) -> types.Part:
+    """cached content에는 요청 단위 media_resolution이 적용되지 않으므로 Part 단위 해상도를 지정합니다.
+
+    Part 단위 해상도를 지원하지 않는 SDK 버전에서는 기본 Part를 그대로 사용합니다.
+    """
+    part = types.Part.from_uri(file_uri=file_uri, mime_type=mime_type)
+    resolution_cls = getattr(types, "PartMediaResolution", None)
+    level_enum = getattr(types, "PartMediaResolutionLevel", None)
+    if resolution_cls is not None and level_enum is not None and "media_resolution" in types.Part.model_fields:
+        part.media_resolution = resolution_cls(level=level_enum.MEDIA_RESOLUTION_LOW)
+    return part
+
+
+class VideoSessionManager:
+    """file_uri 하나에 대해 Gemini cached content를 만들어 같은 모델을 쓰는 meta/steps/scenes 호출이 영상 토큰을 공유하게 합니다.
+
+    - cached content를 쓰는 요청에는 tools/tool_config/system_instruction을 지정할 수 없으므로,
+      같은 모델을 쓰는 generator들이 등록한 툴을 모두 캐시에 포함시키고 프롬프트로 호출할 함수를 지정합니다.
+    - 세션 목록은 로컬 SQLite에 기록해 다른 uvicorn 워커도 같은 캐시를 재사용합니다.
+    - /cleanup(파일 삭제) 시 close()로 해당 file_uri의 캐시를 모두 삭제하며, 그 외에는 TTL로 만료됩니다.
+      만료된 항목은 새 세션을 기록할 때 메모리/SQLite에서 함께 정리합니다.
+    """
+
+    SYSTEM_INSTRUCTION = "You must call the provided function only. Do not output any free-form text.\n"
+    # cached content가 더 이상 쓸 수 없음을 뜻하는 API 오류 코드
+    CACHE_UNUSABLE_CODES = (400, 403, 404)
+
+    def __init__(
+        self,
+        *,
+        client: genai.Client,
+        path: str,
+        enabled: bool = False,
+        ttl_seconds: int = 900,
+    ):
+        self.client = client
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._tools: Dict[str, Dict[str, types.Tool]] = {}
+        self._entries: Dict[Tuple[str, str], _SessionEntry] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._async_key_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._conn = connect_sqlite(path) if enabled else None
+        if self._conn is not None:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS video_sessions (
+                    file_uri TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    cache_name TEXT NOT NULL,
+                    functions TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (file_uri, model)
+                )
+                """
+            )
+
+    def register_tool(self, model: str, function_name: str, tool: types.Tool) -> None:
+        """generator 초기화 시 자신이 쓰는 모델과 툴을 등록합니다."""
+        with self._lock:
+            self._tools.setdefault(model, {})[function_name] = tool
+
+    # ----- 세션 조회/기록 -----
+
+    def _lookup(self, key: Tuple[str, str], function_name: str) -> Optional[_SessionEntry]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT cache_name, functions, expires_at FROM video_sessions WHERE file_uri = ? AND model = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    entry = _SessionEntry(row[0], frozenset(filter(None, row[1].split(","))), row[2])
+                    self._entries[key] = entry
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                self._entries.pop(key, None)
+                return None
+            if entry.cache_name and function_name not in entry.functions:
+                return None
+            return entry
+
+    def _prune_locked(self, now: float) -> None:
+        for key in [k for k, e in self._entries.items() if e.expires_at <= now]:
+            del self._entries[key]
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM video_sessions WHERE expires_at <= ?", (now,))
+
+    def _store(self, key: Tuple[str, str], entry: _SessionEntry) -> _SessionEntry:
+        """다른 워커가 먼저 만든 유효한 세션이 있으면 그쪽을 반환합니다."""
+        with self._lock:
+            self._prune_locked(time.time())
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT cache_name, functions, expires_at FROM video_sessions WHERE file_uri = ? AND model = ?",
+                    key,
+                ).fetchone()
+                if row is not None and row[0] and row[2] > time.time() and entry.functions <= frozenset(row[1].split(",")):
+                    existing = _SessionEntry(row[0], frozenset(row[1].split(",")), row[2])
+                    self._entries[key] = existing
+                    return existing
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO video_sessions (file_uri, model, cache_name, functions, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key[0], key[1], entry.cache_name, ",".join(sorted(entry.functions)), entry.expires_at),
+                )
+            self._entries[key] = entry
+            return entry
+
+    def _pop_all(self, file_uri: str) -> List[str]:
+        with self._lock:
+            names = [e.cache_name for k, e in self._entries.items() if k[0] == file_uri and e.cache_name]
+            for k in [k for k in self._entries if k[0] == file_uri]:
+                self._entries.pop(k, None)
+            if self._conn is not None:
+                rows = self._conn.execute(
+                    "SELECT cache_name FROM video_sessions WHERE file_uri = ?",
+                    (file_uri,),
+                ).fetchall()
+                names.extend(r[0] for r in rows if r[0])
+                self._conn.execute("DELETE FROM video_sessions WHERE file_uri = ?", (file_uri,))
+        return sorted(set(names))
+
+    def has_session(self, file_uri: str) -> bool:
+        if self._conn is None:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM video_sessions WHERE file_uri = ? AND cache_name != '' AND expires_at > ? LIMIT 1",
+                (file_uri, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def invalidate(self, file_uri: str, model: str) -> None:
+        with self._lock:
+            self._entries.pop((file_uri, model), None)
+            if self._conn is not None:
+                self._conn.execute(
+                    "DELETE FROM video_sessions WHERE file_uri = ? AND model = ?",
+                    (file_uri, model),
+                )
+
+    # ----- 캐시 생성 -----
+
+    def _create_config(self, file_uri: str, mime_type: str, model: str) -> Tuple[types.CreateCachedContentConfig, frozenset]:
+        with self._lock:
+            tools = dict(self._tools.get(model) or {})
+        functions = frozenset(tools)
+        config = types.CreateCachedContentConfig(
+            display_name=f"video-session:{file_uri.rsplit('/', 1)[-1]}",
+            contents=[types.Content(role="user", parts=[low_resolution_video_part(file_uri, mime_type)])],
+            system_instruction=self.SYSTEM_INSTRUCTION,
+            tools=list(tools.values()),
+            tool_config=types.ToolConfig(
+                function_calling_config=types.FunctionCallingConfig(
+                    mode="ANY",
+                    allowed_function_names=sorted(functions),
+                )
+            ),
+            ttl=f"{int(self.ttl_seconds)}s",
+        )
+        return config, functions
+
+    def _created(self, key: Tuple[str, str], cached: Any, functions: frozenset) -> _SessionEntry:
+        # 만료 직전 사용을 피하기 위해 30초 여유를 둠
+        entry = _SessionEntry(cached.name, functions, time.time() + self.ttl_seconds - 30)
+        VIDEO_SESSION_EVENTS.labels(model=key[1], event="created").inc()
+        logger.info(f"[VideoSession] ▶ 영상 세션 생성 | file_uri={key[0]} | model={key[1]} | cache={cached.name}")
+        return self._store(key, entry)
+
+    def _create_failed(self, key: Tuple[str, str], err: Exception) -> None:
+        # 짧은 영상(최소 토큰 미달) 등으로 생성이 실패하면 TTL 동안 재시도하지 않음
+        VIDEO_SESSION_EVENTS.labels(model=key[1], event="create_failed").inc()
+        logger.warning(f"[VideoSession] ▶ 영상 세션 생성 실패 (일반 호출로 진행) | file_uri={key[0]} | model={key[1]} | error={err}")
+        self._store(key, _SessionEntry("", frozenset(), time.time() + self.ttl_seconds))
+
+    def _shared(self, model: str) -> bool:
+        # 캐시 생성/보관 비용이 있으므로 같은 모델을 쓰는 툴이 둘 이상일 때만 세션을 만듦
+        with self._lock:
+            return len(self._tools.get(model) or {}) >= 2
+
+    def acquire(self, file_uri: str, mime_type: str, model: str, function_name: str) -> Optional[str]:
+        if not self.enabled or not self._shared(model):
+            return None
+        key = (file_uri, model)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                entry = self._lookup(key, function_name)
+                if entry is not None:
+                    VIDEO_SESSION_EVENTS.labels(model=model, event="reused").inc()
+                    return entry.cache_name or None
+                config, functions = self._create_config(file_uri, mime_type, model)
+                try:
+                    cached = self.client.caches.create(model=model, config=config)
+                except Exception as e:
+                    self._create_failed(key, e)
+                    return None
+                return self._created(key, cached, functions).cache_name
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    async def acquire_async(self, file_uri: str, mime_type: str, model: str, function_name: str) -> Optional[str]:
+        if not self.enabled or not self._shared(model):
+            return None
+        key = (file_uri, model)
+        key_lock = self._async_key_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with key_lock:
+                # 세션 목록 조회/기록은 SQLite 접근이므로 이벤트 루프 밖에서 실행
+                entry = await asyncio.to_thread(self._lookup, key, function_name)
+                if entry is not None:
+                    VIDEO_SESSION_EVENTS.labels(model=model, event="reused").inc()
+                    return entry.cache_name or None
+                config, functions = self._create_config(file_uri, mime_type, model)
+                try:
+                    cached = await self.client.aio.caches.create(model=model, config=config)
+                except Exception as e:
+                    await asyncio.to_thread(self._create_failed, key, e)
+                    return None
+                return (await asyncio.to_thread(self._created, key, cached, functions)).cache_name
+        finally:
+            if not key_lock.locked():
+                self._async_key_locks.pop(key, None)
+
+    # ----- 세션을 통한 호출 -----
+
+    @staticmethod
+    def _cached_request(cache_name: str, route: ModelRoute, prompt: str) -> Tuple[list, ModelRoute]:
+        config = route.config.model_copy(
+            update={
+                "cached_content": cache_name,
+                "tools": None,
+                "tool_config": None,
+                "system_instruction": None,
+            }
+        )
+        contents = [types.Content(role="user", parts=[types.Part.from_text(text=prompt)])]
+        return contents, ModelRoute(route.model, config)
+
+    def _on_invoke_error(self, file_uri: str, route: ModelRoute, err: Exception) -> None:
+        VIDEO_SESSION_EVENTS.labels(model=route.model, event="fallback").inc()
+        logger.warning(f"[VideoSession] ▶ 세션 호출 실패, 일반 호출로 재시도 | model={route.model} | error={err}")
+        # 만료/삭제되었거나 접근할 수 없는 캐시일 때만 세션을 폐기
+        # (응답 파싱/검증 오류는 캐시와 무관하므로 다음 호출에서 같은 세션을 재사용)
+        if isinstance(err, genai_errors.ClientError) and getattr(err, "code", None) in self.CACHE_UNUSABLE_CODES:
+            self.invalidate(file_uri, route.model)
+
+    def invoke(
+        self,
+        invoker: GeminiInvoker,
+        *,
+        file_uri: str,
+        mime_type: str,
+        route: ModelRoute,
+        function_name: str,
+        prompt: str,
+        parse: Callable[[Any], T],
+    ) -> Optional[T]:
+        """세션이 있으면 cached content로 primary 모델을 호출하고, 불가능하거나 실패하면 None을 반환합니다."""
+        cache_name = self.acquire(file_uri, mime_type, route.model, function_name)
+        if not cache_name:
+            return None
+        contents, cached_route = self._cached_request(cache_name, route, prompt)
+        try:
+            result = parse(invoker.invoke([cached_route], contents))
+        except Exception as e:
+            self._on_invoke_error(file_uri, route, e)
+            return None
+        VIDEO_SESSION_EVENTS.labels(model=route.model, event="used").inc()
+        return result
+
+    async def invoke_async(
+        self,
+        invoker: GeminiInvoker,
+        *,
+        file_uri: str,
+        mime_type: str,
+        route: ModelRoute,
+        function_name: str,
+        prompt: str,
+        parse: Callable[[Any], T],
+    ) -> Optional[T]:
+        cache_name = await self.acquire_async(file_uri, mime_type, route.model, function_name)
+        if not cache_name:
+            return None
+        contents, cached_route = self._cached_request(cache_name, route, prompt)
+        try:
+            result = parse(await invoker.invoke_async([cached_route], contents))
+        except Exception as e:
+            await asyncio.to_thread(self._on_invoke_error, file_uri, route, e)
+            return None
+        VIDEO_SESSION_EVENTS.labels(model=route.model, event="used").inc()
+        return result
+
+    # ----- 정리 -----
+
+    async def close(self, file_uri: str) -> None:
+        """file_uri에 연결된 cached content를 모두 삭제합니다 (/cleanup 연동)."""
+        if not self.enabled:
+            return
+        for name in await asyncio.to_thread(self._pop_all, file_uri):
+            try:
+                await self.client.aio.caches.delete(name=name)
+                VIDEO_SESSION_EVENTS.labels(model="", event="closed").inc()
+                logger.info(f"[VideoSession] ▶ 영상 세션 삭제 | file_uri={file_uri} | cache={name}")
+            except Exception as e:
+                logger.warning(f"[VideoSession] ▶ 영상 세션 삭제 실패 (TTL로 만료됨) | cache={name} | error={e}")
@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+from prometheus_client import Counter
+from requests.adapters import HTTPAdapter
+
+YOUTUBE_REQUESTS = Counter(
+    "youtube_requests_total",
+    "YouTube Data API 조회 결과 (fresh, cache_hit, not_modified, error)",
+    ["endpoint", "outcome"],
+)
+YOUTUBE_QUOTA_UNITS = Counter(
+    "youtube_quota_units_total",
+    "YouTube Data API 쿼터 사용량 추정치 (엔드포인트별 단위 비용 합계)",
+    ["endpoint"],
+)
+
+
+@dataclass
+class _CacheEntry:
+    expires_at: float
+    etag: Optional[str]
+    data: Dict[str, Any]
+
+
+class YouTubeClient:
+    """YouTube Data API 공용 클라이언트.
+
+    - keep-alive 연결 풀을 공유하고, 응답을 TTL 동안 캐시합니다 (같은 요청 안의 중복 snippet 조회 제거).
+    - fields= 프로젝션과 gzip으로 필요한 키만 압축해서 받습니다.
+    - TTL이 지난 응답은 ETag(If-None-Match)로 재검증해 변경이 없으면 본문 없이 갱신합니다.
+    - 같은 키의 동시 조회는 하나만 실제로 호출하고 나머지는 그 결과를 사용합니다.
+    - *_async 메서드는 httpx.AsyncClient 연결 풀을 사용해 스레드 없이 동작하고, 취소 시 요청도 함께 중단됩니다.
+      캐시는 동기 경로와 공유합니다.
+    """
+
+    BASE_URL = "https://www.googleapis.com/youtube/v3"
+    # list 계열 메서드의 쿼터 비용 (https://developers.google.com/youtube/v3/determine_quota_cost)
+    QUOTA_COST = {"videos": 1, "commentThreads": 1, "channels": 1}
+    # partial response 프로젝션 - 실제로 사용하는 키만 받음
+    VIDEO_SNIPPET_FIELDS = "etag,items(snippet(title,description,tags,categoryId,channelId))"
+    COMMENT_THREAD_FIELDS = (
+        "etag,nextPageToken,"
+        "items(snippet(totalReplyCount,topLevelComment(id,snippet(textDisplay,textOriginal,authorChannelId,publishedAt,likeCount))))"
+    )
+    # Google API는 User-Agent에 "gzip"이 포함되어야 gzip 응답을 보냄
+    USER_AGENT = "ai-recipe-summary/1.0 (gzip)"
+
+    def __init__(
+        self,
+        *,
+        api_key: str,
+        timeout: float = 20.0,
+        snippet_ttl_seconds: float = 600.0,
+        comments_ttl_seconds: float = 120.0,
+        max_entries: int = 2048,
+        pool_size: int = 32,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.api_key = api_key
+        self.timeout = timeout
+        self.snippet_ttl_seconds = snippet_ttl_seconds
+        self.comments_ttl_seconds = comments_ttl_seconds
+        self.max_entries = max_entries
+
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip", "User-Agent": self.USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._cache: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+
+        self.pool_size = pool_size
+        self._http: Optional[httpx.AsyncClient] = None
+        self._async_key_locks: Dict[Tuple, asyncio.Lock] = {}
+
+    def _get_http(self) -> httpx.AsyncClient:
+        # 이벤트 루프에 묶이므로 첫 요청 시점에 생성하고 이후 연결 풀을 재사용
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                headers={"Accept-Encoding": "gzip", "User-Agent": self.USER_AGENT},
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: Dict[str, Any]) -> Tuple:
+        return (endpoint,) + tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    def _lookup(self, key: Tuple) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def _store(self, key: Tuple, entry: _CacheEntry) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def get(self, endpoint: str, params: Dict[str, Any], *, ttl_seconds: float) -> Dict[str, Any]:
+        """캐시/ETag를 적용해 {BASE_URL}/{endpoint}를 조회합니다. 실패 시 requests 예외를 그대로 전파합니다."""
+        key = self._cache_key(endpoint, params)
+        data = self._fresh(endpoint, key)
+        if data is not None:
+            return data
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # 대기하는 동안 다른 스레드가 갱신했을 수 있음
+            data = self._fresh(endpoint, key)
+            if data is not None:
+                return data
+            try:
+                return self._fetch(endpoint, params, key, self._lookup(key), ttl_seconds)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def _fresh(self, endpoint: str, key: Tuple) -> Optional[Dict[str, Any]]:
+        entry = self._lookup(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="cache_hit").inc()
+            return entry.data
+        return None
+
+    async def aget(self, endpoint: str, params: Dict[str, Any], *, ttl_seconds: float) -> Dict[str, Any]:
+        """get()의 asyncio 버전. 실패 시 httpx 예외를 그대로 전파합니다."""
+        key = self._cache_key(endpoint, params)
+        data = self._fresh(endpoint, key)
+        if data is not None:
+            return data
+
+        key_lock = self._async_key_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with key_lock:
+                # 대기하는 동안 다른 코루틴이 갱신했을 수 있음
+                data = self._fresh(endpoint, key)
+                if data is not None:
+                    return data
+                return await self._afetch(endpoint, params, key, self._lookup(key), ttl_seconds)
+        finally:
+            if not key_lock.locked():
+                self._async_key_locks.pop(key, None)
+
+    @staticmethod
+    def _conditional_headers(stale: Optional[_CacheEntry]) -> Dict[str, str]:
+        if stale is not None and stale.etag:
+            return {"If-None-Match": stale.etag}
+        return {}
+
+    def _complete(
+        self,
+        endpoint: str,
+        key: Tuple,
+        stale: Optional[_CacheEntry],
+        ttl_seconds: float,
+        resp: Any,
+    ) -> Dict[str, Any]:
+        """requests/httpx 응답 공통 처리 (304 재검증, 캐시 저장)"""
+        try:
+            if resp.status_code == 304 and stale is not None:
+                YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="not_modified").inc()
+                self._store(key, _CacheEntry(time.monotonic() + ttl_seconds, stale.etag, stale.data))
+                return stale.data
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="error").inc()
+            raise
+
+        YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="fresh").inc()
+        etag = resp.headers.get("ETag") or data.get("etag")
+        self._store(key, _CacheEntry(time.monotonic() + ttl_seconds, etag, data))
+        return data
+
+    async def _afetch(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        key: Tuple,
+        stale: Optional[_CacheEntry],
+        ttl_seconds: float,
+    ) -> Dict[str, Any]:
+        YOUTUBE_QUOTA_UNITS.labels(endpoint=endpoint).inc(self.QUOTA_COST.get(endpoint, 1))
+        try:
+            resp = await self._get_http().get(
+                f"/{endpoint}",
+                params={**params, "key": self.api_key},
+                headers=self._conditional_headers(stale),
+            )
+        except httpx.HTTPError:
+            YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="error").inc()
+            raise
+        return self._complete(endpoint, key, stale, ttl_seconds, resp)
+
+    def _fetch(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        key: Tuple,
+        stale: Optional[_CacheEntry],
+        ttl_seconds: float,
+    ) -> Dict[str, Any]:
+        YOUTUBE_QUOTA_UNITS.labels(endpoint=endpoint).inc(self.QUOTA_COST.get(endpoint, 1))
+        try:
+            resp = self.session.get(
+                f"{self.BASE_URL}/{endpoint}",
+                params={**params, "key": self.api_key},
+                headers=self._conditional_headers(stale),
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            YOUTUBE_REQUESTS.labels(endpoint=endpoint, outcome="error").inc()
+            raise
+        return self._complete(endpoint, key, stale, ttl_seconds, resp)
+
+    def _snippet_params(self, video_id: str) -> Dict[str, Any]:
+        return {"part": "snippet", "id": video_id, "fields": self.VIDEO_SNIPPET_FIELDS}
+
+    @staticmethod
+    def _first_snippet(data: Dict[str, Any]) -> Dict[str, Any]:
+        items = data.get("items") or []
+        if not items:
+            return {}
+        return items[0].get("snippet") or {}
+
+    def get_video_snippet(self, video_id: str) -> Dict[str, Any]:
+        """영상 snippet을 반환합니다. 영상이 없으면 빈 dict를 반환합니다."""
+        data = self.get("videos", self._snippet_params(video_id), ttl_seconds=self.snippet_ttl_seconds)
+        return self._first_snippet(data)
+
+    async def get_video_snippet_async(self, video_id: str) -> Dict[str, Any]:
+        data = await self.aget("videos", self._snippet_params(video_id), ttl_seconds=self.snippet_ttl_seconds)
+        return self._first_snippet(data)
+
+    def _comment_threads_params(
+        self,
+        video_id: str,
+        order: str,
+        max_results: int,
+        page_token: Optional[str],
+        text_format: Optional[str],
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "part": "snippet",
+            "videoId": video_id,
+            "order": order,
+            "maxResults": max_results,
+            "fields": self.COMMENT_THREAD_FIELDS,
+        }
+        if text_format:
+            params["textFormat"] = text_format
+        if page_token:
+            params["pageToken"] = page_token
+        return params
+
+    def get_comment_threads_page(
+        self,
+        video_id: str,
+        *,
+        order: str,
+        max_results: int = 100,
+        page_token: Optional[str] = None,
+        text_format: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """ttl_seconds=0이면 캐시된 페이지도 ETag로 재검증합니다."""
+        params = self._comment_threads_params(video_id, order, max_results, page_token, text_format)
+        ttl = self.comments_ttl_seconds if ttl_seconds is None else ttl_seconds
+        return self.get("commentThreads", params, ttl_seconds=ttl)
+
+    async def get_comment_threads_page_async(
+        self,
+        video_id: str,
+        *,
+        order: str,
+        max_results: int = 100,
+        page_token: Optional[str] = None,
+        text_format: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        params = self._comment_threads_params(video_id, order, max_results, page_token, text_format)
+        ttl = self.comments_ttl_seconds if ttl_seconds is None else ttl_seconds
+        return await self.aget("commentThreads", params, ttl_seconds=ttl)
@@ -0,0 +1,71 @@
+"""브리핑 생성 입력의 프롬프트 토큰/생성 지연을 비교합니다 (최신순 N개 / 로컬 필터 / 필터 + 유용성 선별).
+
+사용법: GOOGLE_API_KEY=... GOOGLE_AI_API_KEY=... python -m scripts.bench_briefing_filter <video_id> [runs]
+"""
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from app.briefing.service import BriefingService
+from app.container import container
+from app.enum import LanguageType
+from app.token_estimate import estimate_text_tokens
+
+
+def measure(comments: List[str], runs: int) -> Dict[str, float]:
+    generator = container.briefing_generator()
+    prompt = generator._build_prompt(comments, LanguageType.KR)
+
+    latencies = []
+    items = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        items = len(generator.generate(comments, LanguageType.KR))
+        latencies.append(time.perf_counter() - started)
+    return {
+        "comments": len(comments),
+        "prompt_tokens": estimate_text_tokens(prompt),
+        "p50": statistics.median(latencies),
+        "max": max(latencies),
+        "items": items,
+    }
+
+
+def summarize(label: str, result: Dict[str, float], filter_ms: float = 0.0) -> None:
+    print(
+        f"{label:>7} | comments={result['comments']} "
+        f"| prompt_tokens≈{result['prompt_tokens']} "
+        f"| filter={filter_ms:.1f}ms "
+        f"| generate p50={result['p50']:.2f}s max={result['max']:.2f}s "
+        f"| briefing_items={result['items']}"
+    )
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    video_id = sys.argv[1]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    limit = BriefingService.MAX_COMMENTS_FOR_GENERATION
+
+    records = container.briefing_client().get_video_comments(video_id)
+    raw = [c.text for c in records]
+    before = [text for text in raw if text.strip()][:limit]
+
+    started = time.perf_counter()
+    filtered = container.briefing_comment_filter().filter(raw)[:limit]
+    filter_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    ranked = container.briefing_service()._select_comments(records)
+    rank_ms = (time.perf_counter() - started) * 1000
+
+    summarize("before", measure(before, runs))
+    summarize("filter", measure(filtered, runs), filter_ms)
+    summarize("ranked", measure(ranked, runs), rank_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""commentThreads 조회의 전송 바이트/파싱 시간을 fields 프로젝션 + gzip 적용 전후로 비교합니다.
+
+사용법: GOOGLE_API_KEY=... python -m scripts.bench_youtube_comments <video_id> [pages]
+"""
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from app.youtube import YouTubeClient
+
+URL = f"{YouTubeClient.BASE_URL}/commentThreads"
+
+
+def fetch_page(session: requests.Session, params: Dict[str, str], headers: Dict[str, str]) -> Dict[str, float]:
+    resp = session.get(URL, params=params, headers=headers, stream=True, timeout=20)
+    resp.raise_for_status()
+    raw = resp.raw.read(decode_content=False)
+    wire_bytes = len(raw)
+    body = gzip.decompress(raw) if resp.headers.get("Content-Encoding") == "gzip" else raw
+
+    started = time.perf_counter()
+    data = json.loads(body)
+    parse_ms = (time.perf_counter() - started) * 1000
+    return {
+        "wire_bytes": wire_bytes,
+        "body_bytes": len(body),
+        "parse_ms": parse_ms,
+        "items": len(data.get("items", [])),
+        "next": data.get("nextPageToken"),
+    }
+
+
+def run(video_id: str, pages: int, *, optimized: bool) -> List[Dict[str, float]]:
+    params = {
+        "part": "snippet",
+        "videoId": video_id,
+        "order": "relevance",
+        "maxResults": "100",
+        "key": os.environ["GOOGLE_API_KEY"],
+    }
+    if optimized:
+        params["fields"] = YouTubeClient.COMMENT_THREAD_FIELDS
+        headers = {"Accept-Encoding": "gzip", "User-Agent": YouTubeClient.USER_AGENT}
+    else:
+        headers = {"Accept-Encoding": "identity"}
+
+    results = []
+    token: Optional[str] = None
+    with requests.Session() as session:
+        for _ in range(pages):
+            if token:
+                params["pageToken"] = token
+            page = fetch_page(session, params, headers)
+            results.append(page)
+            token = page["next"]
+            if not token:
+                break
+    return results
+
+
+def summarize(label: str, pages: List[Dict[str, float]]) -> None:
+    print(
+        f"{label:>9} | pages={len(pages)} "
+        f"| wire={statistics.mean(p['wire_bytes'] for p in pages) / 1024:.1f}KB/page "
+        f"| body={statistics.mean(p['body_bytes'] for p in pages) / 1024:.1f}KB/page "
+        f"| parse={statistics.mean(p['parse_ms'] for p in pages):.2f}ms/page"
+    )
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    video_id = sys.argv[1]
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    summarize("before", run(video_id, pages, optimized=False))
+    summarize("after", run(video_id, pages, optimized=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""메타데이터 사전 검증(MetadataPrecheck)의 회귀 확인. 음식 제목이 not_recipe로 거절되지 않는지 검사합니다.
+
+사용법: python -m scripts.check_verify_precheck
+"""
+import sys
+from typing import Any, Dict, List, Tuple
+
+from app.verify.precheck import MetadataPrecheck, PrecheckVerdict
+
+# (snippet, 허용되지 않는 판정)
+CASES: List[Tuple[Dict[str, Any], PrecheckVerdict]] = [
+    ({"title": "계란롤", "categoryId": "22"}, PrecheckVerdict.NOT_RECIPE),
+    ({"title": "캘리포니아롤", "categoryId": "24"}, PrecheckVerdict.NOT_RECIPE),
+    ({"title": "Matcha latte", "categoryId": "22"}, PrecheckVerdict.NOT_RECIPE),
+    ({"title": "경기도 토박이의 김치찌개", "categoryId": "22"}, PrecheckVerdict.NOT_RECIPE),
+    ({"title": "계란롤 vs 계란말이", "categoryId": "26"}, PrecheckVerdict.NOT_RECIPE),
+    # 카테고리가 함께 확인되지 않으면 키워드만으로 거절하지 않음
+    ({"title": "Official Music Video", "categoryId": "22"}, PrecheckVerdict.NOT_RECIPE),
+]
+# (snippet, 기대 판정)
+EXPECTED: List[Tuple[Dict[str, Any], PrecheckVerdict]] = [
+    ({"title": "NewJeans Official Music Video", "categoryId": "10"}, PrecheckVerdict.NOT_RECIPE),
+    ({"title": "League of Legends gameplay walkthrough", "categoryId": "20"}, PrecheckVerdict.NOT_RECIPE),
+]
+
+
+def main() -> None:
+    precheck = MetadataPrecheck(enabled=True)
+    failures = []
+    for snippet, forbidden in CASES:
+        result = precheck.classify(snippet)
+        if result.verdict == forbidden:
+            failures.append(f"{snippet['title']!r}: {result.verdict.value} (score={result.score}, reasons={result.reasons})")
+    for snippet, expected in EXPECTED:
+        result = precheck.classify(snippet)
+        if result.verdict != expected:
+            failures.append(f"{snippet['title']!r}: expected {expected.value}, got {result.verdict.value} ({result.reasons})")
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+    print(f"ok ({len(CASES) + len(EXPECTED)} cases)")
+
+
+if __name__ == "__main__":
+    main()